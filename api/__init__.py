@@ -0,0 +1,17 @@
+"""
+Local HTTP/JSON API for wall displays, tablets and arbiters' terminals.
+
+Run ``python -m api`` to serve the tournaments and clubs on the local network.
+"""
+
+from .ingest import Ingest
+from .resources import Folder, Resources
+from .server import ApiServer, serve
+
+__all__ = [
+    "ApiServer",
+    "Folder",
+    "Ingest",
+    "Resources",
+    "serve",
+]
@@ -0,0 +1,40 @@
+"""
+Serves tournaments and clubs as JSON over HTTP.
+
+Usage: python -m api [--host 127.0.0.1] [--port 8000]
+       [--tournaments data/tournaments] [--clubs data/clubs] [--metrics]
+"""
+
+import argparse
+from pathlib import Path
+
+from .server import serve
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Serve tournaments and clubs as JSON over HTTP."
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="address to listen on (0.0.0.0 for the whole local network)",
+    )
+    parser.add_argument("--port", type=int, default=8000, help="port to listen on")
+    parser.add_argument(
+        "--tournaments",
+        type=Path,
+        default=Path("data/tournaments"),
+        help="folder of tournament files",
+    )
+    parser.add_argument(
+        "--clubs", type=Path, default=Path("data/clubs"), help="folder of club files"
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="collect metrics and serve them at /metrics, in the Prometheus text format",
+    )
+    args = parser.parse_args()
+
+    serve(args.tournaments, args.clubs, args.host, args.port, args.metrics)
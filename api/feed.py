@@ -0,0 +1,314 @@
+"""
+Live feed of standings and pairings, pushed as Server-Sent Events.
+
+A subscriber to /tournaments/<id>/events first receives a `snapshot` event
+(the current round's boards and the standings), then small delta events:
+`results` with the boards whose result changed, and `pairings` with the boards
+of a new round. Both carry only the standings rows that changed.
+
+Changes are picked up from the tournament file, so results entered in any
+process are published; commands run in this process also notify the feed
+directly, through commands.events, so their changes go out immediately.
+"""
+
+import asyncio
+import json
+import time
+from typing import Optional
+
+from commands import events
+from models import Tournament
+
+from .resources import Resources, Unavailable, pairings, standings
+
+# Seconds between checks of the files of tournaments with subscribers.
+POLL = 0.25
+# Seconds between keep-alive comments on an idle stream.
+HEARTBEAT = 15.0
+# Events a subscriber may fall behind by before it is sent a new snapshot instead.
+BACKLOG = 64
+
+SNAPSHOT = "snapshot"
+
+# Prefix of event ids, so that an id from before a restart is never taken as current.
+EPOCH = f"{time.time_ns():x}"
+
+
+def view(tournament: Tournament) -> dict:
+    """
+    Takes what the feed publishes from a tournament.
+
+    Args:
+        tournament (Tournament): The tournament.
+
+    Returns:
+        dict: The current round number, its boards by number and the
+        standings rows by chess ID.
+    """
+    current = pairings(tournament)
+    return {
+        "round": current["round"],
+        "boards": {b["board"]: b for b in current["boards"]},
+        "standings": {row["chess_id"]: row for row in standings(tournament)},
+    }
+
+
+def delta(before: dict, after: dict) -> Optional[tuple[str, dict]]:
+    """
+    Computes the event that turns one view of a tournament into the next.
+
+    Args:
+        before (dict): The previous view.
+        after (dict): The current view.
+
+    Returns:
+        Optional[tuple[str, dict]]: The event's kind and data, or None if
+        nothing the feed publishes changed.
+    """
+    rows = [
+        row
+        for chess_id, row in after["standings"].items()
+        if before["standings"].get(chess_id) != row
+    ]
+    if after["round"] != before["round"]:
+        boards = list(after["boards"].values())
+        kind = events.PAIRINGS
+    else:
+        boards = [
+            board
+            for number, board in after["boards"].items()
+            if before["boards"].get(number) != board
+        ]
+        kind = events.RESULTS
+    if not boards and not rows:
+        return None
+    return kind, {"round": after["round"], "boards": boards, "standings": rows}
+
+
+def snapshot(current: dict) -> dict:
+    return {
+        "round": current["round"],
+        "boards": list(current["boards"].values()),
+        "standings": list(current["standings"].values()),
+    }
+
+
+def format_event(event_id: int, kind: str, data: dict) -> bytes:
+    """
+    Formats an event for the event stream.
+
+    Args:
+        event_id (int): The event's sequence number in its tournament.
+        kind (str): The event's name.
+        data (dict): Its JSON data.
+
+    Returns:
+        bytes: The event, ending with its blank line.
+    """
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return f"id: {EPOCH}.{event_id}\nevent: {kind}\ndata: {payload}\n\n".encode("utf-8")
+
+
+class Subscriber:
+    """
+    One client of a tournament's feed, with a bounded backlog.
+
+    Publishing never waits for a subscriber: when its backlog is full, the
+    backlog is dropped and it is sent a fresh snapshot instead.
+
+    Attributes:
+        queue (asyncio.Queue): Events waiting to be sent.
+        resync (bool): Whether the next event sent must be a snapshot.
+    """
+
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue = asyncio.Queue(BACKLOG)
+        self.resync = False
+
+    def offer(self, event: bytes) -> None:
+        """
+        Queues an event without waiting.
+
+        Args:
+            event (bytes): The formatted event.
+        """
+        if self.resync:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.resync = True
+            self.queue.put_nowait(b"")  # Wakes the sender up to send the snapshot.
+
+
+class Channel:
+    """
+    The feed of one tournament: its last published view and its subscribers.
+
+    Attributes:
+        stem (str): The tournament's id.
+        current (Optional[dict]): The last published view.
+        version: Version of the file the view was taken from.
+        event_id (int): Number of the last event published.
+        subscribers (set[Subscriber]): The connected clients.
+    """
+
+    def __init__(self, stem: str) -> None:
+        self.stem = stem
+        self.current: Optional[dict] = None
+        self.version = None
+        self.event_id = 0
+        self.subscribers: set[Subscriber] = set()
+
+    def update(self, tournament: Tournament, version) -> None:
+        """
+        Publishes the changes of a new version of the tournament.
+
+        Args:
+            tournament (Tournament): The tournament, as saved.
+            version: Version of its file.
+        """
+        if version == self.version:
+            return
+        self.version = version
+        after = view(tournament)
+        before, self.current = self.current, after
+        if before is None:
+            return
+        change = delta(before, after)
+        if change is None:
+            return
+        self.event_id += 1
+        event = format_event(self.event_id, *change)
+        for subscriber in self.subscribers:
+            subscriber.offer(event)
+
+
+class Feed:
+    """
+    Publishes the live standings and pairings of tournaments to their subscribers.
+
+    Attributes:
+        resources (Resources): Where tournaments are read from.
+        poll (float): Seconds between checks of subscribed tournaments' files.
+    """
+
+    def __init__(self, resources: Resources, poll: float = POLL) -> None:
+        """
+        Initialize the feed.
+
+        Args:
+            resources (Resources): Where tournaments are read from.
+            poll (float): Seconds between checks of subscribed tournaments' files.
+        """
+        self.resources = resources
+        self.poll = poll
+        self.channels: dict[str, Channel] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Starts watching files and listening to commands run in this process."""
+        self._loop = asyncio.get_running_loop()
+        self._task = self._loop.create_task(self._watch())
+        events.subscribe(self._on_command)
+
+    def stop(self) -> None:
+        """Stops watching and listening."""
+        events.unsubscribe(self._on_command)
+        if self._task is not None:
+            self._task.cancel()
+
+    def _on_command(self, tournament: Tournament, kind: str) -> None:
+        # Runs in the command's thread: only hand the check over to the loop.
+        if tournament.filepath is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(self.check, tournament.filepath.stem, True)
+
+    def check(self, stem: str, changed: bool = False) -> None:
+        """
+        Publishes a tournament's changes, if it has subscribers.
+
+        Args:
+            stem (str): The tournament's id.
+            changed (bool): Whether its file is known to have just changed.
+        """
+        channel = self.channels.get(stem)
+        if channel is None or not channel.subscribers:
+            return
+        if changed:
+            self.resources.tournaments.invalidate()
+        try:
+            tournament, version = self.resources.tournament(stem)
+        except Unavailable:
+            return
+        if tournament is not None:
+            channel.update(tournament, version)
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll)
+            for stem in list(self.channels):
+                self.check(stem)
+
+    async def stream(
+        self,
+        stem: str,
+        writer: asyncio.StreamWriter,
+        last_event_id: Optional[str] = None,
+    ) -> bool:
+        """
+        Streams a tournament's events to a client until it disconnects.
+
+        Args:
+            stem (str): The tournament's id.
+            writer (asyncio.StreamWriter): The client's connection.
+            last_event_id (Optional[str]): The Last-Event-ID the client sent on reconnecting.
+
+        Returns:
+            bool: False if the tournament does not exist (nothing was sent).
+        """
+        try:
+            tournament, version = self.resources.tournament(stem)
+        except Unavailable:
+            tournament = None
+        if tournament is None:
+            return False
+
+        channel = self.channels.setdefault(stem, Channel(stem))
+        channel.update(tournament, version)
+        subscriber = Subscriber()
+        channel.subscribers.add(subscriber)
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream; charset=utf-8\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Access-Control-Allow-Origin: *\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+        try:
+            if last_event_id != f"{EPOCH}.{channel.event_id}":
+                writer.write(
+                    format_event(channel.event_id, SNAPSHOT, snapshot(channel.current))
+                )
+            await writer.drain()
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), HEARTBEAT)
+                except asyncio.TimeoutError:
+                    event = b": ping\n\n"
+                if subscriber.resync:
+                    subscriber.resync = False
+                    event = format_event(
+                        channel.event_id, SNAPSHOT, snapshot(channel.current)
+                    )
+                writer.write(event)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            channel.subscribers.discard(subscriber)
+        return True
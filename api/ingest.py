@@ -0,0 +1,339 @@
+"""
+Result ingestion for several arbiters at once, with group commit.
+
+Arbiters' terminals POST results to /tournaments/<id>/results, in the format
+of the quick entry line ("1:1 2:d NG39713:w", see parse_results). Each
+submission is checked against the current round as soon as it arrives, then
+queued. Submissions arriving within a short window of each other are applied
+together by one MatchResultsCmd, so a whole batch costs one save, and each
+submission is answered once the save that holds it is done.
+
+Writes are idempotent per match: sending a result a match already has changes
+nothing, and sending a different one is refused, so an arbiter can resend a
+submission that timed out without risk. Corrections go through the menus.
+
+The menus may save the same file while the server runs. Saves are checked
+against the version of the file they were prepared from (see Tournament.save):
+when the menus saved in between, the batch is checked again against their
+version and written again, and it is refused if it still cannot be.
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from commands import MatchResultsCmd
+from commands.match_results import parse_results
+from models import Tournament
+from models.files import file_version
+from models.match import DRAW, PLAYER1, PLAYER2
+from models.tournament import TournamentChanged
+
+from .resources import Folder, Unavailable, Version, load_tournament
+
+# Seconds a batch stays open for more submissions after its first one.
+WINDOW = 0.02
+# Submissions a batch holds at most before it is written without waiting.
+MAX_BATCH = 5000
+# Times a batch is written again when another program saved the file first.
+RETRIES = 3
+
+# Result code of a completed match, by winner.
+CODES = {PLAYER1: "1", PLAYER2: "2", DRAW: "d"}
+
+
+class Conflict(Exception):
+    """Raised when a submission contradicts the tournament's state."""
+
+
+@dataclass
+class Submission:
+    """
+    Results sent by one arbiter, waiting for their batch to be written.
+
+    Attributes:
+        round_number (int): The round they were checked against.
+        results (dict[int, str]): Match index mapped to result ("1", "2" or "d").
+        done (asyncio.Future): Resolves to the outcome once written.
+    """
+
+    round_number: int
+    results: dict[int, str]
+    done: asyncio.Future = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+
+def settle(
+    submission: Submission,
+    outcome: Optional[dict] = None,
+    error: Optional[Exception] = None,
+) -> None:
+    """
+    Answers a submission, unless its arbiter already left.
+
+    Args:
+        submission (Submission): The submission.
+        outcome (Optional[dict]): Its outcome, if it was accepted.
+        error (Optional[Exception]): Why it was refused, otherwise.
+    """
+    if submission.done.done():
+        return
+    if error is not None:
+        submission.done.set_exception(error)
+    else:
+        submission.done.set_result(outcome)
+
+
+class Desk:
+    """
+    The results desk of one tournament: its queue of submissions and the only
+    writer of its file in this process.
+
+    Attributes:
+        filepath (Path): The tournament's file.
+        tournament (Optional[Tournament]): The tournament, as last read or written.
+        version (Optional[Version]): Version of the file it matches.
+        pending (list[Submission]): Submissions waiting for the next batch.
+    """
+
+    def __init__(self, filepath: Path, window: float, max_batch: int) -> None:
+        """
+        Initialize the desk.
+
+        Args:
+            filepath (Path): The tournament's file.
+            window (float): Seconds a batch stays open after its first submission.
+            max_batch (int): Submissions after which a batch is written at once.
+        """
+        self.filepath = filepath
+        self.window = window
+        self.max_batch = max_batch
+        self.tournament: Optional[Tournament] = None
+        self.version: Optional[Version] = None
+        self.pending: list[Submission] = []
+        self._full = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+        self._saving = False
+
+    def current(self) -> Tournament:
+        """
+        Gets the tournament, reading its file again if another process changed it.
+
+        Returns:
+            Tournament: The tournament.
+
+        Raises:
+            Unavailable: If its file cannot be read.
+        """
+        if self._saving:
+            # The file is being replaced by this desk: what is in memory is newer.
+            return self.tournament
+        version = file_version(self.filepath)
+        if self.tournament is None or version != self.version:
+            try:
+                self.tournament = load_tournament(self.filepath)
+            except (OSError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+                raise Unavailable(f"{self.filepath.name} cannot be read")
+            self.version = version
+        return self.tournament
+
+    async def submit(self, text: str, round_number: Optional[int] = None) -> dict:
+        """
+        Checks results against the current round and waits until they are saved.
+
+        Args:
+            text (str): The results, in the format of parse_results.
+            round_number (Optional[int]): The round the arbiter means, if given.
+
+        Returns:
+            dict: The round, and the number of results written and of results
+            the tournament already had.
+
+        Raises:
+            ValueError: If the results cannot be parsed.
+            Conflict: If no round is being played, the round is not the one
+                meant, or a match already has a different result.
+            Unavailable: If the tournament cannot be read.
+            OSError: If it cannot be written.
+        """
+        tournament = self.current()
+        index = tournament.current_round_index
+        if not 0 <= index < len(tournament.rounds):
+            raise Conflict("No round is being played.")
+        rnd = tournament.rounds[index]
+        if round_number is not None and round_number != rnd.round_number:
+            raise Conflict(
+                f"Round {round_number} is not being played (round {rnd.round_number} is)."
+            )
+
+        results = parse_results(text.splitlines(), rnd)
+        if not results:
+            raise ValueError("No results given.")
+
+        submission = Submission(rnd.round_number, results)
+        self.pending.append(submission)
+        if len(self.pending) >= self.max_batch:
+            self._full.set()
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._write_batches())
+        return await submission.done
+
+    async def _write_batches(self) -> None:
+        try:
+            while self.pending:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.window)
+                except asyncio.TimeoutError:
+                    pass
+                self._full.clear()
+                batch, self.pending = self.pending, []
+                await self._write(batch)
+        finally:
+            self._writer = None
+
+    async def _write(self, batch: list[Submission], retries: int = RETRIES) -> None:
+        # Submissions are settled in arrival order against the file as it is
+        # now, each one as a whole: it is refused if any of its results conflicts.
+        try:
+            tournament = self.current()
+        except Unavailable as e:
+            for submission in batch:
+                settle(submission, error=e)
+            return
+
+        index = tournament.current_round_index
+        rnd = tournament.rounds[index] if 0 <= index < len(tournament.rounds) else None
+        changes: dict[int, str] = {}
+        accepted = []
+        for submission in batch:
+            if rnd is None or rnd.round_number != submission.round_number:
+                settle(
+                    submission,
+                    error=Conflict(
+                        f"Round {submission.round_number} is no longer being played."
+                    ),
+                )
+                continue
+            written = unchanged = 0
+            conflict = None
+            for match_index, code in submission.results.items():
+                match = rnd.matches[match_index]
+                current = changes.get(match_index)
+                if current is None and match.completed:
+                    current = CODES[match.winner]
+                if current is None:
+                    written += 1
+                elif current == code:
+                    unchanged += 1
+                else:
+                    conflict = match_index
+                    break
+            if conflict is not None:
+                settle(
+                    submission,
+                    error=Conflict(
+                        f"Board {conflict + 1} already has a different result."
+                    ),
+                )
+                continue
+            for match_index, code in submission.results.items():
+                changes.setdefault(match_index, code)
+            accepted.append((submission, written, unchanged))
+
+        if changes:
+            # The results are entered on a copy, in a worker thread: the
+            # tournament the event loop reads never changes under it.
+            working = tournament.snapshot()
+            command = MatchResultsCmd(working, changes, speculate=False)
+            error = None
+            self._saving = True
+            try:
+                await asyncio.to_thread(command)
+            except Exception as e:
+                error = e
+            finally:
+                self._saving = False
+            if isinstance(error, TournamentChanged):
+                # Another program (e.g. the menus) saved the file first: check
+                # the batch again against what it wrote.
+                self.tournament = None
+                if retries:
+                    await self._write([s for s, _, _ in accepted], retries - 1)
+                    return
+                error = Conflict(f"{error} Send the results again.")
+            if error is not None:
+                # The file on disk is untouched (saves are atomic).
+                for submission, _, _ in accepted:
+                    settle(submission, error=error)
+                return
+            self.tournament = working
+            self.version = working.version
+
+        for submission, written, unchanged in accepted:
+            settle(
+                submission,
+                {
+                    "round": submission.round_number,
+                    "written": written,
+                    "unchanged": unchanged,
+                },
+            )
+
+
+class Ingest:
+    """
+    Accepts results for the tournaments of a folder, one desk per tournament.
+
+    Attributes:
+        folder (Folder): The tournament files.
+        window (float): Seconds a batch stays open after its first submission.
+        max_batch (int): Submissions after which a batch is written at once.
+    """
+
+    def __init__(
+        self, folder: Folder, window: float = WINDOW, max_batch: int = MAX_BATCH
+    ) -> None:
+        """
+        Initialize the ingestion.
+
+        Args:
+            folder (Folder): The tournament files.
+            window (float): Seconds a batch stays open after its first submission.
+            max_batch (int): Submissions after which a batch is written at once.
+        """
+        self.folder = folder
+        self.window = window
+        self.max_batch = max_batch
+        self.desks: dict[str, Desk] = {}
+
+    async def submit(
+        self, stem: str, text: str, round_number: Optional[int] = None
+    ) -> Optional[dict]:
+        """
+        Enters results in a tournament, batched with other arbiters' submissions.
+
+        Args:
+            stem (str): The tournament's id.
+            text (str): The results, in the format of parse_results.
+            round_number (Optional[int]): The round the arbiter means, if given.
+
+        Returns:
+            Optional[dict]: The outcome (see Desk.submit), or None if the
+            tournament does not exist.
+
+        Raises:
+            ValueError: If the results cannot be parsed.
+            Conflict: If they contradict the tournament's state.
+            Unavailable: If the tournament cannot be read.
+            OSError: If it cannot be written.
+        """
+        desk = self.desks.get(stem)
+        if desk is None:
+            entry = self.folder.files().get(stem)
+            if entry is None:
+                return None
+            desk = self.desks[stem] = Desk(entry[0], self.window, self.max_batch)
+        return await desk.submit(text, round_number)
@@ -0,0 +1,131 @@
+"""
+Just enough HTTP/1.1 for the API: reading requests and writing responses on
+asyncio streams, with persistent connections.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+# Longest a connection may stay idle between requests, in seconds.
+IDLE_TIMEOUT = 30.0
+MAX_HEADERS = 100
+MAX_BODY = 1 << 20
+
+
+class BadRequest(Exception):
+    """Raised when a request cannot be parsed."""
+
+
+@dataclass
+class Request:
+    """
+    A parsed HTTP request.
+
+    Attributes:
+        method (str): The request method, in uppercase.
+        path (str): The path, without the query string.
+        query (dict[str, list[str]]): The query string's parameters.
+        version (str): The HTTP version, e.g. "HTTP/1.1".
+        headers (dict[str, str]): Headers, by lowercase name.
+        body (bytes): The request body.
+    """
+
+    method: str
+    path: str
+    query: dict[str, list[str]]
+    version: str
+    headers: dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+    @property
+    def keep_alive(self) -> bool:
+        """
+        Tells whether the client wants the connection kept open.
+
+        Returns:
+            bool: True unless the client asked to close (or speaks HTTP/1.0
+            without asking to keep it).
+        """
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+
+async def read_request(
+    reader: asyncio.StreamReader, timeout: float = IDLE_TIMEOUT
+) -> Optional[Request]:
+    """
+    Reads one request from a connection.
+
+    Args:
+        reader (asyncio.StreamReader): The connection's reader.
+        timeout (float): Seconds to wait for the request line.
+
+    Returns:
+        Optional[Request]: The request, or None if the client closed the
+        connection or stayed idle too long.
+
+    Raises:
+        BadRequest: If the request is malformed or too large.
+    """
+    try:
+        line = await asyncio.wait_for(reader.readline(), timeout)
+    except asyncio.TimeoutError:
+        return None
+    if not line:
+        return None
+
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise BadRequest("Malformed request line")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        if len(headers) >= MAX_HEADERS:
+            raise BadRequest("Too many headers")
+        name, sep, value = line.decode("latin-1").partition(":")
+        if not sep:
+            raise BadRequest("Malformed header")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise BadRequest("Invalid Content-Length")
+    if not 0 <= length <= MAX_BODY:
+        raise BadRequest("Body too large")
+    body = await reader.readexactly(length) if length else b""
+
+    url = urlsplit(target)
+    return Request(
+        method=method.upper(),
+        path=url.path,
+        query=parse_qs(url.query),
+        version=version,
+        headers=headers,
+        body=body,
+    )
+
+
+def response_head(status: int, headers: dict[str, str]) -> bytes:
+    """
+    Builds the status line and headers of a response.
+
+    Args:
+        status (int): The status code.
+        headers (dict[str, str]): The response headers.
+
+    Returns:
+        bytes: The head, ending with the blank line.
+    """
+    lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
@@ -0,0 +1,395 @@
+"""
+The API's resources: tournaments and clubs read from their JSON files, with
+every response body serialized once per version of the files it comes from.
+"""
+
+import hashlib
+import json
+import time
+from datetime import date
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+import instrumentation
+from commands.export import RESULT_LABELS, standings_rows
+from models import ChessClub, Tournament
+
+# Seconds during which a folder listing is reused before the disk is checked again.
+REFRESH = 0.5
+
+# (modification time in ns, size) of a file.
+Version = Tuple[int, int]
+
+
+class Unavailable(Exception):
+    """Raised when a resource's file cannot be read and no earlier version is cached."""
+
+
+class Folder:
+    """
+    Listing of a folder of JSON files, with each file's version.
+
+    The listing is rescanned at most every `refresh` seconds, so many clients
+    polling at once cost one scan, not one per request.
+
+    Attributes:
+        path (Path): The folder.
+        refresh (float): Seconds a listing is reused.
+    """
+
+    def __init__(self, path: Path, refresh: float = REFRESH) -> None:
+        """
+        Initialize the listing.
+
+        Args:
+            path (Path): The folder.
+            refresh (float): Seconds a listing is reused.
+        """
+        self.path = path
+        self.refresh = refresh
+        self._files: dict[str, Tuple[Path, Version]] = {}
+        self._scanned = float("-inf")
+
+    def files(self) -> dict[str, Tuple[Path, Version]]:
+        """
+        Lists the folder's JSON files.
+
+        Returns:
+            dict[str, Tuple[Path, Version]]: Path and version by file stem.
+        """
+        now = time.monotonic()
+        if now - self._scanned >= self.refresh:
+            files = {}
+            if self.path.exists():
+                for filepath in sorted(self.path.glob("*.json")):
+                    try:
+                        stat = filepath.stat()
+                    except FileNotFoundError:
+                        continue
+                    files[filepath.stem] = (filepath, (stat.st_mtime_ns, stat.st_size))
+            self._files = files
+            self._scanned = now
+        return self._files
+
+    def invalidate(self) -> None:
+        """Makes the next listing rescan the folder."""
+        self._scanned = float("-inf")
+
+    def version(self) -> tuple:
+        """
+        Gets a version of the whole folder: it changes when any file does.
+
+        Returns:
+            tuple: The stems and versions of every file.
+        """
+        return tuple((stem, v) for stem, (_, v) in self.files().items())
+
+
+def encode(content) -> bytes:
+    """
+    Serializes content as compact UTF-8 JSON.
+
+    Args:
+        content: JSON-serializable content.
+
+    Returns:
+        bytes: The JSON document.
+    """
+    return json.dumps(
+        content, ensure_ascii=False, separators=(",", ":"), default=str
+    ).encode("utf-8")
+
+
+def tournament_summary(stem: str, tournament: Tournament) -> dict:
+    """
+    Summarizes a tournament for the tournament list.
+
+    Args:
+        stem (str): The tournament's id (its file name without extension).
+        tournament (Tournament): The tournament.
+
+    Returns:
+        dict: Its id, name, venue, dates, status, round and links.
+    """
+    return {
+        "id": stem,
+        "name": tournament.name,
+        "venue": tournament.venue,
+        "start_date": tournament.start_date.date().isoformat(),
+        "end_date": tournament.end_date.date().isoformat(),
+        "status": tournament.status_label.strip("[]"),
+        "round": tournament.current_round_index + 1,
+        "num_rounds": tournament.num_rounds,
+        "players": len(tournament.players),
+        "url": f"/tournaments/{stem}",
+    }
+
+
+def standings(tournament: Tournament) -> list[dict]:
+    """
+    Gets a tournament's standings.
+
+    Args:
+        tournament (Tournament): The tournament.
+
+    Returns:
+        list[dict]: Rank, chess ID, name, club, points and withdrawal of every registrant.
+    """
+    rows = []
+    for row in standings_rows(tournament):
+        del row["tournament"]
+        rows.append(row)
+    return rows
+
+
+def pairings(tournament: Tournament) -> dict:
+    """
+    Gets the boards of a tournament's current round.
+
+    Args:
+        tournament (Tournament): The tournament.
+
+    Returns:
+        dict: The round number and its boards, with their result so far
+        (None while a game is being played).
+    """
+    index = tournament.current_round_index
+    if not 0 <= index < len(tournament.rounds):
+        return {"round": None, "boards": []}
+
+    rnd = tournament.rounds[index]
+    boards = []
+    for board, match in enumerate(rnd.matches, 1):
+        bye = match.is_bye
+        if bye:
+            result = "bye"
+        elif match.completed:
+            result = RESULT_LABELS[match.winner]
+        else:
+            result = None
+        boards.append(
+            {
+                "board": board,
+                "white_id": match._get_chess_id(match.player1),
+                "white_name": match._get_name(match.player1),
+                "black_id": None if bye else match._get_chess_id(match.player2),
+                "black_name": None if bye else match._get_name(match.player2),
+                "result": result,
+            }
+        )
+    return {"round": rnd.round_number, "boards": boards}
+
+
+def club_summary(stem: str, club: ChessClub) -> dict:
+    """
+    Summarizes a club for the club list.
+
+    Args:
+        stem (str): The club's id (its file name without extension).
+        club (ChessClub): The club.
+
+    Returns:
+        dict: Its id, name, number of players and link.
+    """
+    return {
+        "id": stem,
+        "name": club.name,
+        "players": len(club.players),
+        "url": f"/clubs/{stem}",
+    }
+
+
+def club_detail(stem: str, club: ChessClub) -> dict:
+    """
+    Describes a club and its roster.
+
+    Only names and Chess IDs are published: e-mail addresses and birthdays
+    stay in the club files.
+
+    Args:
+        stem (str): The club's id.
+        club (ChessClub): The club.
+
+    Returns:
+        dict: Its id, name and players.
+    """
+    return {
+        "id": stem,
+        "name": club.name,
+        "players": [{"name": p.name, "chess_id": p.chess_id} for p in club.players],
+    }
+
+
+def load_tournament(filepath: Path) -> Tournament:
+    """
+    Loads a tournament file, timing the load in the metrics when they are collected.
+
+    Args:
+        filepath (Path): Path to the tournament's JSON file.
+
+    Returns:
+        Tournament: The tournament, with the version of the file it was read from.
+    """
+    metrics = instrumentation.metrics()
+    start = time.perf_counter()
+    tournament = Tournament.load(filepath)
+    if metrics is not None:
+        metrics.loaded(time.perf_counter() - start)
+    return tournament
+
+
+class Resources:
+    """
+    The API's resources, read from the tournament and club folders.
+
+    Each file is loaded once per version, and each response body is
+    serialized and hashed once per version of the files it comes from. A
+    request for an unchanged resource costs a dictionary lookup.
+
+    Attributes:
+        tournaments (Folder): The tournament files.
+        clubs (Folder): The club files.
+    """
+
+    def __init__(
+        self,
+        tournaments_dir: Path = Path("data/tournaments"),
+        clubs_dir: Path = Path("data/clubs"),
+        refresh: float = REFRESH,
+    ) -> None:
+        """
+        Initialize the resources.
+
+        Args:
+            tournaments_dir (Path): Folder of tournament files.
+            clubs_dir (Path): Folder of club files.
+            refresh (float): Seconds a folder listing is reused.
+        """
+        self.tournaments = Folder(tournaments_dir, refresh)
+        self.clubs = Folder(clubs_dir, refresh)
+        self._models: dict[Path, Tuple[Version, object]] = {}
+        self._bodies: dict[str, Tuple[object, str, bytes]] = {}
+
+    def _model(self, folder: Folder, stem: str, load: Callable[[Path], object]):
+        entry = folder.files().get(stem)
+        if entry is None:
+            return None, None
+        filepath, version = entry
+
+        cached = self._models.get(filepath)
+        hit = cached is not None and cached[0] == version
+        metrics = instrumentation.metrics()
+        if metrics is not None:
+            metrics.cache_lookup("api-models", hit)
+        if hit:
+            return cached[1], version
+        try:
+            model = load(filepath)
+        except (OSError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+            # Typically a file caught half-written: keep serving the last good version.
+            if cached is not None:
+                return cached[1], cached[0]
+            raise Unavailable(f"{filepath.name} cannot be read")
+        self._models[filepath] = (version, model)
+        return model, version
+
+    def tournament(self, stem: str) -> Tuple[Optional[Tournament], Optional[Version]]:
+        """
+        Gets a tournament by id.
+
+        Args:
+            stem (str): The tournament's id (file name without extension).
+
+        Returns:
+            Tuple: The tournament and its file's version, or (None, None) if unknown.
+
+        Raises:
+            Unavailable: If its file cannot be read and no version is cached.
+        """
+        return self._model(self.tournaments, stem, load_tournament)
+
+    def club(self, stem: str) -> Tuple[Optional[ChessClub], Optional[Version]]:
+        """
+        Gets a club by id.
+
+        Args:
+            stem (str): The club's id (file name without extension).
+
+        Returns:
+            Tuple: The club and its file's version, or (None, None) if unknown.
+
+        Raises:
+            Unavailable: If its file cannot be read and no version is cached.
+        """
+        return self._model(self.clubs, stem, ChessClub)
+
+    def body(self, key: str, version, build: Callable[[], object]) -> Tuple[str, bytes]:
+        """
+        Gets a response body, serializing it only if its version changed.
+
+        Args:
+            key (str): The resource's path.
+            version: Anything that changes when the content does.
+            build (Callable[[], object]): Builds the content.
+
+        Returns:
+            Tuple[str, bytes]: The body's ETag and the body.
+        """
+        cached = self._bodies.get(key)
+        hit = cached is not None and cached[0] == version
+        metrics = instrumentation.metrics()
+        if metrics is not None:
+            metrics.cache_lookup("api-bodies", hit)
+        if hit:
+            return cached[1], cached[2]
+        body = encode(build())
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        self._bodies[key] = (version, etag, body)
+        return etag, body
+
+    # Resources, by path. Each returns (ETag, body), or None if it does not exist.
+
+    def tournament_list(self, path: str) -> Tuple[str, bytes]:
+        # Statuses depend on today's date as well as on the files.
+        version = (self.tournaments.version(), date.today())
+
+        def build():
+            summaries = []
+            for stem in self.tournaments.files():
+                try:
+                    tournament, _ = self.tournament(stem)
+                except Unavailable:
+                    continue
+                if tournament is not None:
+                    summaries.append(tournament_summary(stem, tournament))
+            return summaries
+
+        return self.body(path, version, build)
+
+    def tournament_resource(
+        self, path: str, stem: str, view: Callable[[Tournament], object]
+    ) -> Optional[Tuple[str, bytes]]:
+        tournament, version = self.tournament(stem)
+        if tournament is None:
+            return None
+        return self.body(path, version, lambda: view(tournament))
+
+    def club_list(self, path: str) -> Tuple[str, bytes]:
+        def build():
+            summaries = []
+            for stem in self.clubs.files():
+                try:
+                    club, _ = self.club(stem)
+                except Unavailable:
+                    continue
+                if club is not None:
+                    summaries.append(club_summary(stem, club))
+            return summaries
+
+        return self.body(path, self.clubs.version(), build)
+
+    def club_resource(self, path: str, stem: str) -> Optional[Tuple[str, bytes]]:
+        club, version = self.club(stem)
+        if club is None:
+            return None
+        return self.body(path, version, lambda: club_detail(stem, club))
@@ -0,0 +1,334 @@
+"""
+Local HTTP server publishing tournaments and clubs as JSON.
+
+Endpoints (GET or HEAD):
+    /tournaments                     Every tournament, summarized
+    /tournaments/<id>                A tournament, as stored
+    /tournaments/<id>/standings      Its standings
+    /tournaments/<id>/pairings       The boards of its current round
+    /clubs                           Every club, summarized
+    /clubs/<id>                      A club and its roster (names and Chess IDs)
+
+GET /tournaments/<id>/events streams live standings and pairings (Server-Sent
+Events); it has no HEAD, since the stream has no end to describe.
+
+and POST /tournaments/<id>/results[?round=N], whose text body enters results
+in the current round (see api.ingest). While metrics are collected, /metrics
+serves them in the Prometheus text format.
+
+Every JSON response carries an ETag; a request whose If-None-Match matches it
+is answered with 304 Not Modified and no body.
+"""
+
+import asyncio
+import json
+import re
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+import instrumentation
+
+from .feed import Feed
+from .ingest import Conflict, Ingest
+from .protocol import BadRequest, Request, read_request, response_head
+from .resources import Resources, Unavailable, encode, pairings, standings
+
+
+EVENTS = re.compile(r"/tournaments/([\w\-]+)/events")
+RESULTS = re.compile(r"/tournaments/([\w\-]+)/results")
+
+
+class ApiServer:
+    """
+    Asyncio HTTP/1.1 server for the tournament and club JSON API.
+
+    One task serves each connection, and connections are kept open between
+    requests, so hundreds of polling displays can be served from one core.
+    Displays that would rather be told of changes subscribe to the feed, and
+    arbiters' terminals submit results to the ingestion desks.
+
+    Attributes:
+        resources (Resources): The resources served.
+        feed (Feed): The live feed of the tournaments.
+        ingest (Ingest): Where results are submitted.
+        host (str): Address to listen on.
+        port (int): Port to listen on (0 picks a free one).
+    """
+
+    def __init__(
+        self, resources: Resources, host: str = "127.0.0.1", port: int = 8000
+    ) -> None:
+        """
+        Initialize the server.
+
+        Args:
+            resources (Resources): The resources served.
+            host (str): Address to listen on.
+            port (int): Port to listen on (0 picks a free one).
+        """
+        self.resources = resources
+        self.feed = Feed(resources)
+        self.ingest = Ingest(resources.tournaments)
+        self.host = host
+        self.port = port
+        self.routes: list[
+            Tuple[re.Pattern, Callable[..., Optional[Tuple[str, bytes]]]]
+        ] = [
+            (re.compile(r"/tournaments/?"), resources.tournament_list),
+            (
+                re.compile(r"/tournaments/([\w\-]+)"),
+                lambda path, stem: resources.tournament_resource(
+                    path, stem, lambda t: t.to_dict()
+                ),
+            ),
+            (
+                re.compile(r"/tournaments/([\w\-]+)/standings"),
+                lambda path, stem: resources.tournament_resource(path, stem, standings),
+            ),
+            (
+                re.compile(r"/tournaments/([\w\-]+)/pairings"),
+                lambda path, stem: resources.tournament_resource(path, stem, pairings),
+            ),
+            (re.compile(r"/clubs/?"), resources.club_list),
+            (re.compile(r"/clubs/([\w\-]+)"), resources.club_resource),
+        ]
+
+    def respond(self, request: Request) -> Tuple[int, dict[str, str], bytes]:
+        """
+        Answers a request.
+
+        Args:
+            request (Request): The request.
+
+        Returns:
+            Tuple[int, dict[str, str], bytes]: Status, headers and body.
+        """
+        if request.method not in ("GET", "HEAD"):
+            return error(405, "Method not allowed", {"Allow": "GET, HEAD"})
+
+        if request.path == "/metrics":
+            metrics = instrumentation.metrics()
+            if metrics is None:
+                return error(404, "Not found")
+            headers = {
+                "Content-Type": "text/plain; version=0.0.4; charset=utf-8",
+                "Cache-Control": "no-cache",
+            }
+            return 200, headers, metrics.render().encode("utf-8")
+
+        for pattern, resource in self.routes:
+            match = pattern.fullmatch(request.path)
+            if match is None:
+                continue
+            try:
+                found = resource(request.path, *match.groups())
+            except Unavailable as e:
+                return error(503, str(e), {"Retry-After": "1"})
+            if found is None:
+                return error(404, "Not found")
+
+            etag, body = found
+            headers = {
+                "ETag": etag,
+                "Cache-Control": "no-cache",
+                "Access-Control-Allow-Origin": "*",
+            }
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return 304, headers, b""
+            headers["Content-Type"] = "application/json; charset=utf-8"
+            return 200, headers, body
+
+        return error(404, "Not found")
+
+    async def submit(
+        self, request: Request, stem: str
+    ) -> Tuple[int, dict[str, str], bytes]:
+        """
+        Answers a submission of results, once they are saved.
+
+        Args:
+            request (Request): The request, with the results as its body.
+            stem (str): The tournament's id.
+
+        Returns:
+            Tuple[int, dict[str, str], bytes]: Status, headers and body.
+        """
+        if request.method != "POST":
+            return error(405, "Method not allowed", {"Allow": "POST"})
+        round_number = request.query.get("round", [None])[0]
+        if round_number is not None and not round_number.isdigit():
+            return error(400, "round must be a number")
+        try:
+            text = request.body.decode("utf-8")
+        except UnicodeDecodeError:
+            return error(400, "Results must be UTF-8 text")
+
+        try:
+            outcome = await self.ingest.submit(
+                stem, text, int(round_number) if round_number else None
+            )
+        except ValueError as e:
+            return error(400, str(e))
+        except Conflict as e:
+            return error(409, str(e))
+        except Unavailable as e:
+            return error(503, str(e), {"Retry-After": "1"})
+        except OSError as e:
+            return error(500, f"Results could not be saved: {e}")
+        if outcome is None:
+            return error(404, "Not found")
+        return 200, {"Content-Type": "application/json; charset=utf-8"}, encode(outcome)
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Serves the requests of one connection until it closes.
+
+        Args:
+            reader (asyncio.StreamReader): The connection's reader.
+            writer (asyncio.StreamWriter): The connection's writer.
+        """
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except (
+                    BadRequest,
+                    asyncio.IncompleteReadError,
+                    asyncio.LimitOverrunError,
+                    ValueError,
+                ):
+                    status, headers, body = error(400, "Bad request")
+                    headers["Connection"] = "close"
+                    writer.write(response_head(status, headers) + body)
+                    break
+                if request is None:
+                    break
+
+                events = EVENTS.fullmatch(request.path)
+                results = RESULTS.fullmatch(request.path)
+                if results:
+                    status, headers, body = await self.submit(request, results.group(1))
+                elif events and request.method != "GET":
+                    status, headers, body = error(
+                        405, "Method not allowed", {"Allow": "GET"}
+                    )
+                elif events:
+                    # The stream holds the connection until the client leaves.
+                    if await self.feed.stream(
+                        events.group(1), writer, request.headers.get("last-event-id")
+                    ):
+                        break
+                    status, headers, body = error(404, "Not found")
+                else:
+                    status, headers, body = self.respond(request)
+                if status != 304:
+                    headers["Content-Length"] = str(len(body))
+                if not request.keep_alive:
+                    headers["Connection"] = "close"
+                head = response_head(status, headers)
+                writer.write(head if request.method == "HEAD" else head + body)
+                await writer.drain()
+                if not request.keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def start(self) -> asyncio.AbstractServer:
+        """
+        Starts listening.
+
+        Returns:
+            asyncio.AbstractServer: The listening server; its sockets give the
+            actual port when 0 was asked for.
+        """
+        server = await asyncio.start_server(
+            self.handle, self.host, self.port, backlog=1024
+        )
+        self.feed.start()
+        self.port = server.sockets[0].getsockname()[1]
+        return server
+
+    async def serve_forever(self) -> None:
+        """Listens and serves until cancelled."""
+        server = await self.start()
+        print(f"Serving on http://{self.host}:{self.port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.feed.stop()
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """
+    Checks an If-None-Match header against a resource's ETag.
+
+    Args:
+        header (Optional[str]): The header's value, if any.
+        etag (str): The resource's current ETag.
+
+    Returns:
+        bool: True if the client already has this version.
+    """
+    if not header:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+def error(
+    status: int, message: str, headers: Optional[dict[str, str]] = None
+) -> Tuple[int, dict[str, str], bytes]:
+    """
+    Builds a JSON error response.
+
+    Args:
+        status (int): The status code.
+        message (str): The error message.
+        headers (Optional[dict[str, str]]): Extra headers.
+
+    Returns:
+        Tuple[int, dict[str, str], bytes]: Status, headers and body.
+    """
+    body = json.dumps({"error": message}).encode("utf-8")
+    return (
+        status,
+        {"Content-Type": "application/json; charset=utf-8", **(headers or {})},
+        body,
+    )
+
+
+def serve(
+    tournaments_dir: Path = Path("data/tournaments"),
+    clubs_dir: Path = Path("data/clubs"),
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    metrics: bool = False,
+) -> None:
+    """
+    Runs the API server until interrupted.
+
+    Args:
+        tournaments_dir (Path): Folder of tournament files.
+        clubs_dir (Path): Folder of club files.
+        host (str): Address to listen on.
+        port (int): Port to listen on.
+        metrics (bool): Collect metrics and serve them at /metrics.
+    """
+    server = ApiServer(Resources(tournaments_dir, clubs_dir), host, port)
+    try:
+        if metrics:
+            with instrumentation.collecting():
+                asyncio.run(server.serve_forever())
+        else:
+            asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
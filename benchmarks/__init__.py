@@ -0,0 +1,6 @@
+"""
+Benchmarks for the application's hot paths.
+
+Run ``python -m benchmarks`` for the whole suite; each module can also be run
+on its own, e.g. ``python -m benchmarks.pairing``.
+"""
@@ -0,0 +1,80 @@
+"""
+Runs the benchmark suite and writes machine-readable results.
+
+Usage: python -m benchmarks [--sizes 1000 10000 100000] [--cases pairing ...]
+       [--repeat 3] [--output results.json] [--baseline baseline.json]
+       [--threshold 0.2]
+
+Save the results of a reference run and pass them as --baseline to later
+runs: any case slower than the baseline by more than the threshold is
+flagged, and the exit status is 1.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from .suite import CASES, DEFAULT_SIZES, compare, run
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the application.")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="club members"
+    )
+    parser.add_argument(
+        "--cases", nargs="+", choices=sorted(CASES), help="cases to run (default: all)"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case")
+    parser.add_argument(
+        "--data",
+        type=Path,
+        default=Path("benchmarks/data/suite"),
+        help="folder of the generated corpora",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmarks/data/results.json"),
+        help="results file",
+    )
+    parser.add_argument("--baseline", type=Path, help="results of a previous run")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="allowed slowdown (0.2 = 20%%)"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'Case':<20} {'Size':>8} {'Time (ms)':>11} "
+        f"{'Throughput':>22} {'Peak (MB)':>10}"
+    )
+    results = []
+    for result in run(args.sizes, args.cases, args.repeat, args.data):
+        results.append(result)
+        throughput = f"{result['throughput']:,.0f} {result['unit']}/s"
+        print(
+            f"{result['case']:<20} {result['size']:>8} "
+            f"{result['seconds'] * 1000:>11.2f} {throughput:>22} "
+            f"{result['peak_bytes'] / 1e6:>10.2f}"
+        )
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = 0
+        print(f"\nCompared with {args.baseline}:")
+        for row in compare(results, baseline, args.threshold):
+            flag = "  REGRESSION" if row["regressed"] else ""
+            regressions += row["regressed"]
+            print(
+                f"{row['case']:<20} {row['size']:>8} "
+                f"{row['baseline_seconds'] * 1000:>9.2f} -> "
+                f"{row['seconds'] * 1000:>9.2f} ms ({row['ratio']:.2f}x){flag}"
+            )
+        sys.exit(1 if regressions else 0)
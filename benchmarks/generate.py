@@ -0,0 +1,429 @@
+"""
+Synthetic data generator for load testing.
+
+Writes club files with any number of members and fully played tournament
+histories, in the same JSON formats as the application, without external
+dependencies. Members are numbered across all clubs and every attribute of a
+member is derived from its number and the seed, so tournaments can register
+any member without keeping the clubs in memory, and the same seed always
+gives the same corpus. Files are written in chunks as they are generated.
+
+Usage: python -m benchmarks.generate [--out benchmarks/data] [--clubs 10]
+       [--members 100000] [--tournaments 10] [--players 1000] [--rounds 9]
+       [--seed 0] [--swiss]
+"""
+
+import argparse
+import json
+import math
+import random
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+from commands.pairing import SwissPairing
+from models import Round, Tournament
+from models.match import PLAYER1, PLAYER2, DRAW
+
+
+FIRST_NAMES = (
+    "Adrian Alice Amelia Anna Arthur Ben Billy Brittany Carla Chloe Daniel "
+    "Deanna Deborah Derrick Dustin Elena Emma Ethan Felix Grace Hannah Henry "
+    "Hugo Ines Isaac Jack Jason Julia Karim Katelyn Leo Lina Lucas Maya Melissa "
+    "Michelle Nadia Noah Olga Oscar Paul Peter Philip Quentin Rachel Ruth Ryan "
+    "Sara Sofia Steven Theo Tim Tracy Tyler Uma Victor Wendy Xavier Yara Zoe"
+).split()
+LAST_NAMES = (
+    "Anderson Bauer Brown Byrd Chen Cobb Costa Cross Dubois Evans Fischer "
+    "Francis Garcia Grant Guerra Hendricks Ivanov Jensen Johnson Kim Kowalski "
+    "Lambert Lopez Martin Meyer Moreau Myers Nguyen Novak Okafor Peterson Petit "
+    "Ramos Richardson Rossi Sanford Schmidt Silva Smith Sullivan Suzuki Taylor "
+    "Underwood Velez Wagner Ward Warren Weber Wilson Young Zimmermann"
+).split()
+
+LETTERS = [chr(a) + chr(b) for a in range(65, 91) for b in range(65, 91)]
+CHESS_IDS = len(LETTERS) * 100000
+
+CHUNK = 10000
+
+
+class Members:
+    """
+    Deterministic member attributes, by member number.
+
+    Chess IDs come from an affine bijection of the member number over every
+    possible ID (two letters and five digits), so they are unique across clubs.
+
+    Attributes:
+        per_club (int): Members in each club.
+        multiplier (int): Multiplier of the chess ID bijection.
+        offset (int): Offset of the chess ID bijection.
+        salt (int): Seed-derived salt of the name and birthday hash.
+    """
+
+    def __init__(self, per_club: int, rng: random.Random) -> None:
+        """
+        Initialize the member numbering.
+
+        Args:
+            per_club (int): Members in each club.
+            rng (random.Random): Seeded source of the bijection and salt.
+        """
+        self.per_club = per_club
+        multiplier = rng.randrange(1, CHESS_IDS)
+        while math.gcd(multiplier, CHESS_IDS) != 1:
+            multiplier += 1
+        self.multiplier = multiplier
+        self.offset = rng.randrange(CHESS_IDS)
+        self.salt = rng.getrandbits(32)
+
+    def chess_id(self, k: int) -> str:
+        """
+        Gets the chess ID of member number k.
+
+        Args:
+            k (int): Member number.
+
+        Returns:
+            str: The member's chess ID.
+        """
+        j = (self.multiplier * k + self.offset) % CHESS_IDS
+        return f"{LETTERS[j // 100000]}{j % 100000:05d}"
+
+    def club_name(self, k: int) -> str:
+        """
+        Gets the name of member number k's club.
+
+        Args:
+            k (int): Member number.
+
+        Returns:
+            str: The club name.
+        """
+        return f"Synthetic Chess Club {k // self.per_club + 1:04d}"
+
+    def name(self, k: int) -> Tuple[str, str, int]:
+        """
+        Gets member number k's first and last name, and a hash for other attributes.
+
+        Args:
+            k (int): Member number.
+
+        Returns:
+            Tuple[str, str, int]: First name, last name and hash.
+        """
+        h = (k * 2654435761 ^ self.salt) & 0xFFFFFFFF
+        h ^= h >> 15
+        return (
+            FIRST_NAMES[h % len(FIRST_NAMES)],
+            LAST_NAMES[(h >> 8) % len(LAST_NAMES)],
+            h,
+        )
+
+    def registrant(self, k: int) -> dict:
+        """
+        Gets member number k as a tournament registrant.
+
+        Args:
+            k (int): Member number.
+
+        Returns:
+            dict: The registrant's name, chess ID and club name.
+        """
+        first, last, _ = self.name(k)
+        return {
+            "name": f"{first} {last}",
+            "chess_id": self.chess_id(k),
+            "club_name": self.club_name(k),
+        }
+
+    def club_json(self, ks: range) -> Iterator[str]:
+        """
+        Formats members as club file entries, in chunks.
+
+        Args:
+            ks (range): Member numbers.
+
+        Yields:
+            str: Comma-separated JSON objects for up to CHUNK members.
+        """
+        for start in range(ks.start, ks.stop, CHUNK):
+            entries = []
+            for k in range(start, min(start + CHUNK, ks.stop)):
+                first, last, h = self.name(k)
+                entries.append(
+                    f'{{"name": "{first} {last}", '
+                    f'"email": "{first.lower()}.{last.lower()}{k}@example.com", '
+                    f'"chess_id": "{self.chess_id(k)}", '
+                    f'"birthday": "{h % 28 + 1:02d}-{(h >> 5) % 12 + 1:02d}-'
+                    f'{1930 + (h >> 9) % 78}"}}'
+                )
+            yield ",\n".join(entries)
+
+
+def write_club(path: Path, name: str, members: Members, ks: range) -> int:
+    """
+    Writes one club file.
+
+    Args:
+        path (Path): Path of the club's JSON file.
+        name (str): Club name.
+        members (Members): Member attributes.
+        ks (range): Member numbers of the club.
+
+    Returns:
+        int: Bytes written.
+    """
+    written = 0
+    with open(path, "w", buffering=1 << 20) as f:
+        written += f.write(f'{{"name": {json.dumps(name)}, "players": [\n')
+        for i, chunk in enumerate(members.club_json(ks)):
+            if i:
+                written += f.write(",\n")
+            written += f.write(chunk)
+        written += f.write("\n]}\n")
+    return written
+
+
+def fast_rounds(
+    chess_ids: List[str], rounds: int, rng: random.Random
+) -> Iterator[List[dict]]:
+    """
+    Plays rounds by pairing neighbours in the standings, with random results.
+
+    Rematches are not avoided: this is meant for volume, not realism.
+
+    Args:
+        chess_ids (List[str]): Registrants' chess IDs.
+        rounds (int): Number of rounds.
+        rng (random.Random): Source of randomness for pairings and results.
+
+    Yields:
+        List[dict]: Serialized matches of each round, the bye last.
+    """
+    points = [0] * len(chess_ids)
+    for _ in range(rounds):
+        tiebreak = rng.random
+        order = sorted(range(len(chess_ids)), key=lambda i: (-points[i], tiebreak()))
+        matches = []
+        for b in range(0, len(order) - 1, 2):
+            white, black = order[b], order[b + 1]
+            if rng.random() < 0.5:
+                white, black = black, white
+            roll = rng.random()
+            if roll < 0.4:
+                winner, points[white] = chess_ids[white], points[white] + 2
+            elif roll < 0.8:
+                winner, points[black] = chess_ids[black], points[black] + 2
+            else:
+                winner = None
+                points[white] += 1
+                points[black] += 1
+            matches.append(
+                {
+                    "players": [chess_ids[white], chess_ids[black]],
+                    "winner": winner,
+                    "completed": True,
+                }
+            )
+        if len(order) % 2:
+            bye = order[-1]
+            points[bye] += 2
+            matches.append(
+                {
+                    "players": [chess_ids[bye]],
+                    "winner": chess_ids[bye],
+                    "completed": True,
+                    "bye": True,
+                }
+            )
+        yield matches
+
+
+def swiss_rounds(
+    players: List[dict], rounds: int, rng: random.Random
+) -> Iterator[List[dict]]:
+    """
+    Plays rounds with the application's Swiss pairing engine, with random results.
+
+    Args:
+        players (List[dict]): Tournament registrants.
+        rounds (int): Number of rounds.
+        rng (random.Random): Source of randomness for pairings and results.
+
+    Yields:
+        List[dict]: Serialized matches of each round, the bye last.
+    """
+    tournament = Tournament(
+        name="",
+        start_date=datetime.min,
+        end_date=datetime.min,
+        venue="",
+        players=players,
+    )
+    for number in range(1, rounds + 1):
+        matches = SwissPairing.from_tournament(tournament, rng).matches()
+        for match in matches:
+            if not match.is_bye:
+                match.update_result(
+                    rng.choice((PLAYER1, PLAYER2, PLAYER1, PLAYER2, DRAW))
+                )
+        tournament.add_round(
+            Round(round_number=number, matches=matches, is_complete=True)
+        )
+        yield [match.serialize() for match in matches]
+
+
+def write_tournament(
+    path: Path,
+    number: int,
+    members: Members,
+    total_members: int,
+    size: int,
+    rounds: int,
+    rng: random.Random,
+    swiss: bool = False,
+) -> int:
+    """
+    Writes one fully played tournament, a round at a time.
+
+    Args:
+        path (Path): Path of the tournament's JSON file.
+        number (int): Tournament number, used in its name.
+        members (Members): Member attributes.
+        total_members (int): Number of members to draw registrants from.
+        size (int): Number of registrants.
+        rounds (int): Number of rounds.
+        rng (random.Random): Source of randomness.
+        swiss (bool): Pair with the Swiss engine instead of neighbour pairing.
+
+    Returns:
+        int: Bytes written.
+    """
+    players = [members.registrant(k) for k in rng.sample(range(total_members), size)]
+    start = datetime(2000, 1, 1) + timedelta(days=rng.randrange(9000))
+    header = {
+        "name": f"Synthetic Open {number:04d}",
+        "start_date": start.isoformat(),
+        "end_date": (start + timedelta(days=rounds)).isoformat(),
+        "venue": f"Hall {number % 97 + 1}",
+    }
+    played = (
+        swiss_rounds(players, rounds, rng)
+        if swiss
+        else fast_rounds([p["chess_id"] for p in players], rounds, rng)
+    )
+
+    written = 0
+    with open(path, "w", buffering=1 << 20) as f:
+        written += f.write(json.dumps(header)[:-1])
+        written += f.write(', "players": ' + json.dumps(players) + ', "rounds": [')
+        for index, matches in enumerate(played):
+            if index:
+                written += f.write(", ")
+            written += f.write(
+                json.dumps(
+                    {
+                        "round_number": index + 1,
+                        "matches": matches,
+                        "is_complete": True,
+                    }
+                )
+            )
+        footer = {
+            "current_round_index": rounds - 1,
+            "num_rounds": rounds,
+            "is_complete": True,
+            "seed": rng.getrandbits(32),
+        }
+        written += f.write("], " + json.dumps(footer)[1:] + "\n")
+    return written
+
+
+def generate(
+    out: Path,
+    clubs: int,
+    members: int,
+    tournaments: int,
+    players: int,
+    rounds: int,
+    seed: int = 0,
+    swiss: bool = False,
+) -> int:
+    """
+    Generates a corpus of clubs and tournaments.
+
+    Args:
+        out (Path): Folder receiving the `clubs` and `tournaments` folders.
+        clubs (int): Number of clubs.
+        members (int): Members per club.
+        tournaments (int): Number of tournaments.
+        players (int): Registrants per tournament.
+        rounds (int): Rounds per tournament.
+        seed (int): Seed of the corpus.
+        swiss (bool): Pair tournaments with the Swiss engine (slower, no rematches).
+
+    Returns:
+        int: Bytes written.
+    """
+    rng = random.Random(seed)
+    numbering = Members(members, rng)
+    total = clubs * members
+    written = 0
+
+    club_dir = out / "clubs"
+    club_dir.mkdir(parents=True, exist_ok=True)
+    for c in range(clubs):
+        ks = range(c * members, (c + 1) * members)
+        path = club_dir / f"club-{c + 1:04d}.json"
+        written += write_club(path, numbering.club_name(ks.start), numbering, ks)
+
+    tournament_dir = out / "tournaments"
+    tournament_dir.mkdir(parents=True, exist_ok=True)
+    for t in range(tournaments):
+        path = tournament_dir / f"synthetic-open-{t + 1:04d}.json"
+        written += write_tournament(
+            path, t + 1, numbering, total, min(players, total), rounds, rng, swiss
+        )
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic clubs and tournaments for load testing."
+    )
+    parser.add_argument(
+        "--out", type=Path, default=Path("benchmarks/data"), help="output folder"
+    )
+    parser.add_argument("--clubs", type=int, default=10, help="number of clubs")
+    parser.add_argument("--members", type=int, default=100000, help="members per club")
+    parser.add_argument(
+        "--tournaments", type=int, default=10, help="number of tournaments"
+    )
+    parser.add_argument(
+        "--players", type=int, default=1000, help="registrants per tournament"
+    )
+    parser.add_argument("--rounds", type=int, default=9, help="rounds per tournament")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument(
+        "--swiss", action="store_true", help="pair with the Swiss engine"
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    written = generate(
+        args.out,
+        args.clubs,
+        args.members,
+        args.tournaments,
+        args.players,
+        args.rounds,
+        args.seed,
+        args.swiss,
+    )
+    elapsed = time.perf_counter() - start
+    print(
+        f"Wrote {written / 1e6:.1f} MB to {args.out} in {elapsed:.1f} s "
+        f"({written / 1e6 / max(elapsed, 1e-9):.1f} MB/s)"
+    )
@@ -0,0 +1,124 @@
+"""
+Benchmark harness for the Swiss pairing engine.
+
+Builds in-memory tournaments of growing size, plays a number of rounds with
+random results, then times the pairing of the next round.
+
+Usage: python -m benchmarks.pairing [--sizes 8 64 512 5000] [--rounds 4] [--repeat 3]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime
+
+from commands.pairing import SwissPairing
+from models import Round, Tournament
+from models.match import PLAYER1, PLAYER2, DRAW
+
+
+DEFAULT_SIZES = (8, 16, 32, 64, 128, 256, 512, 1000, 2000, 5000)
+
+
+def synthetic_tournament(size: int, rounds: int, rng: random.Random) -> Tournament:
+    """
+    Builds an in-memory tournament with `rounds` rounds already played.
+
+    Args:
+        size (int): Number of registrants.
+        rounds (int): Number of rounds to play before returning.
+        rng (random.Random): Source of randomness for pairings and results.
+
+    Returns:
+        Tournament: The tournament, ready for its next pairing.
+    """
+    tournament = Tournament(
+        name=f"Benchmark {size}",
+        start_date=datetime.today(),
+        end_date=datetime.today(),
+        venue="Benchmark",
+        players=[
+            {"name": f"Player {i}", "chess_id": f"BM{i:05d}", "club_name": "Bench"}
+            for i in range(size)
+        ],
+        num_rounds=rounds + 1,
+    )
+    for number in range(1, rounds + 1):
+        matches = SwissPairing.from_tournament(tournament, rng).matches()
+        for match in matches:
+            if not match.is_bye:
+                match.update_result(
+                    rng.choice((PLAYER1, PLAYER2, PLAYER1, PLAYER2, DRAW))
+                )
+        tournament.add_round(
+            Round(round_number=number, matches=matches, is_complete=True)
+        )
+        tournament.current_round_index = number - 1
+    return tournament
+
+
+def run(sizes, rounds: int = 4, repeat: int = 3, seed: int = 0) -> list[dict]:
+    """
+    Times the pairing of one round for each field size.
+
+    Args:
+        sizes: Field sizes to benchmark (odd sizes are rounded up, as the bye
+            is not part of the timed matching).
+        rounds (int): Rounds played before the timed pairing.
+        repeat (int): Timed pairings per size; the best time is kept.
+        seed (int): Seed for the synthetic tournaments.
+
+    Returns:
+        list[dict]: One result per size, with timings and pairing quality.
+    """
+    results = []
+    for size in sizes:
+        size += size % 2
+        rng = random.Random(seed)
+        tournament = synthetic_tournament(size, rounds, rng)
+        history = tournament.history
+        scores = tournament.player_scores()
+
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            engine = SwissPairing.from_tournament(tournament, rng)
+            pairs = engine.pair(engine.ranked())
+            best = min(best, time.perf_counter() - start)
+
+        results.append(
+            {
+                "players": size,
+                "rounds_played": rounds,
+                "seconds": best,
+                "rematches": sum(
+                    history.have_played(p1["chess_id"], p2["chess_id"])
+                    for p1, p2 in pairs
+                ),
+                "score_gap": sum(
+                    abs(scores[p1["chess_id"]] - scores[p2["chess_id"]])
+                    for p1, p2 in pairs
+                ),
+            }
+        )
+        print(
+            f"{size:>6} players | {best * 1000:>9.1f} ms | "
+            f"rematches: {results[-1]['rematches']:>3} | "
+            f"total score gap: {results[-1]['score_gap']}"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Swiss pairing engine.")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="field sizes"
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=4, help="rounds played before timing"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per size")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+
+    args = parser.parse_args()
+    run(args.sizes, rounds=args.rounds, repeat=args.repeat, seed=args.seed)
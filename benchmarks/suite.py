@@ -0,0 +1,233 @@
+"""
+Benchmark suite for the application's hot paths.
+
+Each case times one operation on a synthetic corpus (see benchmarks.generate)
+of a given size: the number of club members, with tournaments of a fiftieth
+as many players. A case is timed several times and the best time kept, then
+run once more under tracemalloc for its peak memory.
+"""
+
+import json
+import shutil
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from commands import AdvanceRoundCmd, TournamentReportCmd
+from models import ClubManager, Tournament, TournamentManager
+from models.tournament_manager import iter_tournaments
+from screens import PlayerRegistrationView
+
+from .generate import generate
+
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+CLUBS = 4
+TOURNAMENTS = 3
+ROUNDS = 7
+
+# A case's setup returns the operation to time and the work it does per call,
+# as (count, unit), for the throughput.
+Case = Callable[[Path], Tuple[Callable[[], object], int, str]]
+
+
+def corpus(data_dir: Path, size: int) -> Path:
+    """
+    Gets the corpus of a given size, generating it on first use.
+
+    Args:
+        data_dir (Path): Folder holding one corpus per size.
+        size (int): Number of club members.
+
+    Returns:
+        Path: The corpus folder, with `clubs` and `tournaments` folders.
+    """
+    path = data_dir.resolve() / f"size-{size}"
+    if not (path / "tournaments").exists():
+        generate(
+            path,
+            clubs=CLUBS,
+            members=max(size // CLUBS, 1),
+            tournaments=TOURNAMENTS,
+            players=max(size // 50, 8),
+            rounds=ROUNDS,
+        )
+    return path
+
+
+def first_tournament(path: Path) -> Tournament:
+    """
+    Loads the first tournament of a corpus.
+
+    Args:
+        path (Path): The corpus folder.
+
+    Returns:
+        Tournament: The tournament.
+    """
+    return next(iter_tournaments(path / "tournaments"))
+
+
+def club_load(path: Path):
+    """Cold load of every club file with ClubManager."""
+    club_dir = path / "clubs"
+    members = sum(
+        len(json.loads(f.read_text())["players"]) for f in club_dir.glob("*.json")
+    )
+    return lambda: ClubManager(club_dir), members, "players"
+
+
+def tournament_load(path: Path):
+    """Cold load of every tournament file with TournamentManager."""
+    folder = path / "tournaments"
+    matches = sum(
+        len(rnd.matches) for t in iter_tournaments(folder) for rnd in t.rounds
+    )
+    return lambda: TournamentManager(folder), matches, "matches"
+
+
+def tournament_save(path: Path):
+    """Tournament.save of one tournament (to a scratch file)."""
+    tournament = first_tournament(path)
+    scratch = path / "scratch"
+    scratch.mkdir(exist_ok=True)
+    tournament.filepath = scratch / "save.json"
+    tournament.save()
+    return tournament.save, tournament.filepath.stat().st_size, "bytes"
+
+
+def player_scores(path: Path):
+    """Tournament.player_scores over every round of one tournament."""
+    tournament = first_tournament(path)
+    matches = sum(len(rnd.matches) for rnd in tournament.rounds)
+    return tournament.player_scores, matches, "matches"
+
+
+def pairing(path: Path):
+    """AdvanceRoundCmd.generate_match_pairings for one tournament's next round."""
+    tournament = first_tournament(path)
+    command = AdvanceRoundCmd(tournament, search_budget=None)
+    return command.generate_match_pairings, len(tournament.players), "players"
+
+
+def html_report(path: Path):
+    """TournamentReportCmd.build_html_report for one tournament."""
+    command = TournamentReportCmd(first_tournament(path))
+    matches = sum(len(rnd.matches) for rnd in command.tournament.rounds)
+    return command.build_html_report, matches, "matches"
+
+
+def registration_search(path: Path):
+    """PlayerRegistrationView.search_players over every club member."""
+    view = PlayerRegistrationView(first_tournament(path), path / "clubs")
+    queries = ("smith", "anna", "ab123", "zz")
+
+    def search() -> None:
+        for query in queries:
+            view.search_players(query)
+
+    return search, len(view.players) * len(queries), "players"
+
+
+CASES: dict[str, Case] = {
+    "club_load": club_load,
+    "tournament_load": tournament_load,
+    "tournament_save": tournament_save,
+    "player_scores": player_scores,
+    "pairing": pairing,
+    "html_report": html_report,
+    "registration_search": registration_search,
+}
+
+
+def measure(operation: Callable[[], object], repeat: int) -> Tuple[float, int]:
+    """
+    Times an operation and measures its peak memory.
+
+    Args:
+        operation (Callable[[], object]): The operation.
+        repeat (int): Timed runs; the best is kept.
+
+    Returns:
+        Tuple[float, int]: Best time in seconds and peak traced memory in bytes.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def run(
+    sizes=DEFAULT_SIZES,
+    cases: Optional[List[str]] = None,
+    repeat: int = 3,
+    data_dir: Path = Path("benchmarks/data/suite"),
+) -> Iterator[dict]:
+    """
+    Runs the benchmark cases at every size.
+
+    Args:
+        sizes: Corpus sizes (number of club members).
+        cases (Optional[List[str]]): Names of the cases to run (all by default).
+        repeat (int): Timed runs per case and size.
+        data_dir (Path): Folder holding the generated corpora.
+
+    Yields:
+        dict: One result per case and size, with seconds, throughput and peak memory.
+    """
+    for size in sizes:
+        path = corpus(data_dir, size)
+        for name in cases or CASES:
+            operation, count, unit = CASES[name](path)
+            seconds, peak = measure(operation, repeat)
+            yield {
+                "case": name,
+                "size": size,
+                "seconds": seconds,
+                "count": count,
+                "unit": unit,
+                "throughput": count / seconds if seconds else 0.0,
+                "peak_bytes": peak,
+            }
+        shutil.rmtree(path / "scratch", ignore_errors=True)
+
+
+def compare(results: List[dict], baseline: List[dict], threshold: float) -> List[dict]:
+    """
+    Compares results with a baseline run.
+
+    Args:
+        results (List[dict]): The current results.
+        baseline (List[dict]): The baseline results.
+        threshold (float): Relative slowdown above which a case has regressed.
+
+    Returns:
+        List[dict]: The current results found in the baseline, each with the
+        baseline time, the ratio of the two and whether it regressed.
+    """
+    previous = {(r["case"], r["size"]): r for r in baseline}
+    compared = []
+    for result in results:
+        before = previous.get((result["case"], result["size"]))
+        if before is None:
+            continue
+        ratio = result["seconds"] / before["seconds"] if before["seconds"] else 1.0
+        compared.append(
+            dict(
+                result,
+                baseline_seconds=before["seconds"],
+                ratio=ratio,
+                regressed=ratio > 1 + threshold,
+            )
+        )
+    return compared
@@ -1,25 +1,8 @@
+import sys
+
+import instrumentation
+import screens
 from commands.context import Context
-from models.tournament_manager import TournamentManager
-from models.club_manager import ClubManager
-from screens import (
-    EditTournamentView,
-    TournamentView,
-    PlayerRegistrationView,
-    TournamentsMainView,
-    AppMainMenu,
-    MainMenu,
-    ClubCreate,
-    ClubView,
-    PlayerView,
-    PlayerEdit,
-)
-from screens.tournaments_main import CreateTournament
-from screens.manage_tournament import (
-    start_tournament,
-    advance_round,
-    tournament_report,
-)
-from screens.register_player import run as register_player_confirm
 
 
 class MainApp:
@@ -29,110 +12,353 @@ class MainApp:
     Manages navigation between screens based on the current context state.
     Starts from the main application menu and routes to screens
     for club management, tournament management, and player registration.
+
+    Routes are looked up in a table of handlers, and each screen is imported
+    from the `screens` registry the first time it is routed to.
     """
 
-    def __init__(self):
+    def __init__(self, redraw=None, transcript=None):
         """
         Initialize the MainApp with the starting context.
 
         Sets the initial screen to 'app-main'.
+
+        Args:
+            redraw (bool | None): Redraw screens in place, changed lines only
+                (default: when the terminal supports it).
+            transcript (Callable[[str], None] | None): Receives everything
+                printed, as printed, each time output is flushed.
         """
         self.context = Context("app-main")
+        self.redraw = redraw
+        self.transcript = transcript
+        self.routes = {
+            "app-main": self.app_main,
+            "tournaments-main": self.tournaments_main,
+            "tournament-create": self.tournament_create,
+            "tournament-view": self.tournament_view,
+            "start-tournament": self.start_tournament,
+            "advance-round": self.advance_round,
+            "tournament-report": self.tournament_report,
+            "leaderboard": self.leaderboard,
+            "register-player": self.register_player,
+            "register-player-confirm": self.register_player_confirm,
+            "main-menu": self.main_menu,
+            "club-create": self.club_create,
+            "club-view": self.club_view,
+            "player-view": self.player_view,
+            "player-edit": self.player_edit,
+            "player-create": self.player_edit,
+            "edit-tournament": self.edit_tournament,
+        }
+
+    def app_main(self) -> Context:
+        command = screens.AppMainMenu().run()
+        return command()
+
+    def tournaments_main(self) -> Context:
+        from models.tournament_manager import TournamentManager
+
+        source = getattr(self.context, "source", None)
+        manager = TournamentManager()
+        active_tournaments = [
+            t for t in manager.tournaments if t.status_label == "[Active]"
+        ]
+        if source == "main-menu" and len(active_tournaments) == 1:
+            return Context("tournament-view", tournament=active_tournaments[0])
+
+        command = screens.TournamentsMainView().run()
+        return command()
+
+    def tournament_create(self) -> Context:
+        cmd = screens.CreateTournament().display_menu()
+        context = cmd()
+        print(f"✅ '{getattr(context, 'tournament').name}' created.\n")
+        return context
+
+    def tournament_view(self) -> Context:
+        tournament = getattr(self.context, "tournament", None)
+        message = getattr(self.context, "message", None)
+        if message:
+            print(f"\n{message}")
+        if tournament:
+            command = screens.TournamentView(tournament).run()
+            return command()
+
+        print("[ERROR] No tournament found in context.")
+        return Context("tournaments-main")
+
+    def start_tournament(self) -> Context:
+        return screens.start_tournament(self.context.tournament)
+
+    def advance_round(self) -> Context:
+        return screens.advance_round(self.context.tournament)
+
+    def tournament_report(self) -> Context:
+        return screens.tournament_report(self.context.tournament)
+
+    def leaderboard(self) -> Context:
+        command = screens.LeaderboardView(**self.context.kwargs).run()
+        return command()
+
+    def register_player(self) -> Context:
+        command = screens.PlayerRegistrationView(self.context.tournament).run()
+        return command()
+
+    def register_player_confirm(self) -> Context:
+        command = screens.register_player_confirm(
+            self.context.tournament, self.context.player
+        )
+        return command()
+
+    def main_menu(self) -> Context:
+        from models.club_manager import ClubManager
+
+        manager = ClubManager()
+        command = screens.MainMenu(clubs=manager.clubs).run()
+        return command()
+
+    def club_create(self) -> Context:
+        command = screens.ClubCreate().run()
+        return command()
+
+    def club_view(self) -> Context:
+        command = screens.ClubView(**self.context.kwargs).run()
+        return command()
+
+    def player_view(self) -> Context:
+        command = screens.PlayerView(**self.context.kwargs).run()
+        return command()
+
+    def player_edit(self) -> Context:
+        command = screens.PlayerEdit(**self.context.kwargs).run()
+        return command()
+
+    def edit_tournament(self) -> Context:
+        command = screens.EditTournamentView(self.context.tournament).run()
+        return command()
+
+    def tournament_changed(self, error) -> Context:
+        """
+        Reopens a tournament that another program (e.g. the API server) saved
+        while it was open here, instead of writing over its changes.
+
+        Args:
+            error (TournamentChanged): The refused save.
+
+        Returns:
+            Context: The tournament's view, as it is now on disk.
+        """
+        from models import Tournament
+
+        return Context(
+            "tournament-view",
+            tournament=Tournament.load(error.filepath),
+            message=f"{error} Your last change was not saved: "
+            "please enter it again on the tournament as it is now.",
+        )
 
     def run(self):
         """
         Launch the main application loop.
 
-        Continuously checks the current screen in context and executes the appropriate
-        view or command. Exits when an unknown or None screen is encountered.
+        Continuously looks up the current screen in the route table and runs
+        its handler. Exits when an unknown or None screen is encountered.
+        Output goes through one ScreenBuffer for the whole session, and each
+        dispatch is timed when instrumentation is on.
         """
-        while True:
-            screen = self.context.screen
-
-            if screen == "app-main":
-                command = AppMainMenu().run()
-                self.context = command()
-
-            elif screen == "tournaments-main":
-                source = getattr(self.context, "source", None)
-                manager = TournamentManager()
-                active_tournaments = [
-                    t for t in manager.tournaments if t.status_label == "[Active]"
-                ]
-                if source == "main-menu" and len(active_tournaments) == 1:
-                    self.context = Context(
-                        "tournament-view", tournament=active_tournaments[0]
-                    )
+        with screens.ScreenBuffer(redraw=self.redraw, transcript=self.transcript):
+            while True:
+                screen = self.context.screen
+                route = self.routes.get(screen)
+
+                if route is None:
+                    if screen is not None:
+                        print(f"[!] Unknown screen: {screen}")
+                    break
 
-                else:
-                    command = TournamentsMainView().run()
-                    self.context = command()
+                recorder = instrumentation.active()
+                try:
+                    if recorder is None:
+                        self.context = route()
+                    else:
+                        self.context = recorder.run("screen", screen, route)
+                except Exception as e:
+                    from models.tournament import TournamentChanged
 
-            elif screen == "tournament-create":
-                cmd = CreateTournament().display_menu()
-                self.context = cmd.execute()
-                print(f"✅ '{getattr(self.context, 'tournament').name}' created.\n")
+                    if not isinstance(e, TournamentChanged):
+                        raise
+                    self.context = self.tournament_changed(e)
 
-            elif screen == "tournament-view":
-                tournament = getattr(self.context, "tournament", None)
-                if tournament:
-                    command = TournamentView(tournament).run()
-                    self.context = command()
 
-                else:
-                    print("[ERROR] No tournament found in context.")
-                    self.context = Context("tournaments-main")
+def run_to_first_prompt() -> None:
+    """Runs the application until it first waits for input, then exits."""
+    import builtins
 
-            elif screen == "start-tournament":
-                self.context = start_tournament(self.context.tournament)
+    def stop(prompt=""):
+        raise SystemExit(0)
 
-            elif screen == "advance-round":
-                self.context = advance_round(self.context.tournament)
+    builtins.input = stop
+    MainApp().run()
 
-            elif screen == "tournament-report":
-                self.context = tournament_report(self.context.tournament)
 
-            elif screen == "register-player":
-                command = PlayerRegistrationView(self.context.tournament).run()
-                self.context = command()
+def measure_startup(runs: int, top: int) -> None:
+    """
+    Times the program's start-up, up to its first prompt, in fresh interpreters.
+
+    Each run starts the program under `python -X importtime` and stops it at
+    its first prompt. The best and median times are printed, followed by the
+    slowest top-level imports of the fastest run.
+
+    Args:
+        runs (int): Number of runs.
+        top (int): Number of imports listed.
+    """
+    import statistics
+    import subprocess
+    import time
+
+    command = [sys.executable, "-X", "importtime", __file__, "--first-prompt"]
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        done = subprocess.run(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        timings.append((time.perf_counter() - start, done.stderr))
 
-            elif screen == "register-player-confirm":
+    best, report = min(timings)
+    print(
+        f"Time to first prompt over {runs} runs: best {best * 1000:.1f} ms, "
+        f"median {statistics.median(t for t, _ in timings) * 1000:.1f} ms"
+    )
 
-                command = register_player_confirm(
-                    self.context.tournament, self.context.player
-                )
-                self.context = command()
+    imports = []
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        imports.append((int(cumulative_us), int(self_us), name))
+    top_level = sorted((i for i in imports if not i[2].startswith("  ")), reverse=True)
+    total = sum(self_us for _, self_us, _ in imports)
+    print(f"{len(imports)} modules imported in {total / 1000:.1f} ms\n")
+    print(f"{'cumulative':>12} {'self':>9}  module")
+    for cumulative_us, self_us, name in top_level[:top]:
+        print(
+            f"{cumulative_us / 1000:>9.1f} ms {self_us / 1000:>6.1f} ms  {name.strip()}"
+        )
 
-            elif screen == "main-menu":
-                manager = ClubManager()
-                command = MainMenu(clubs=manager.clubs).run()
-                self.context = command()
 
-            elif screen == "club-create":
-                command = ClubCreate().run()
-                self.context = command()
+def main(argv=None) -> None:
+    """
+    Starts the application, records or replays a session, or measures its start-up time.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:]).
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        MainApp().run()
+        return
+    if argv == ["--first-prompt"]:
+        # Checked before argparse is imported, so that it is not timed.
+        run_to_first_prompt()
+        return
 
-            elif screen == "club-view":
-                command = ClubView(**self.context.kwargs).run()
-                self.context = command()
+    import argparse
+    from pathlib import Path
 
-            elif screen == "player-view":
-                command = PlayerView(**self.context.kwargs).run()
-                self.context = command()
+    parser = argparse.ArgumentParser(description="Castle Chess management system.")
+    parser.add_argument(
+        "--startup-time",
+        type=int,
+        nargs="?",
+        const=5,
+        metavar="RUNS",
+        help="time the start-up up to the first prompt (default: 5 runs) and list the slowest imports",
+    )
+    parser.add_argument("--top", type=int, default=15, help="imports listed")
+    parser.add_argument(
+        "--plain",
+        action="store_true",
+        help="print screens one after the other instead of redrawing them in place",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="time every screen and command, and print a summary table on exit",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="DIR",
+        help="also profile every command with cProfile and dump its stats to DIR",
+    )
+    parser.add_argument(
+        "--metrics",
+        type=Path,
+        metavar="FILE",
+        help="write metrics to FILE in the Prometheus text format, every 15 seconds and on exit",
+    )
+    parser.add_argument(
+        "--record",
+        type=Path,
+        metavar="DIR",
+        help="record the session (prompts, answers, output and timings) and a copy of the data to DIR",
+    )
+    parser.add_argument(
+        "--replay",
+        type=Path,
+        metavar="DIR",
+        help="replay a recorded session headlessly on a copy of its data, and compare latency and output",
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        metavar="X",
+        help="with --replay, wait the recorded time between answers divided by X (default: no waits)",
+    )
+    parser.add_argument("--first-prompt", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--replay-journal", nargs=2, type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
 
-            elif screen in ("player-edit", "player-create"):
-                command = PlayerEdit(**self.context.kwargs).run()
-                self.context = command()
-            elif screen == "edit-tournament":
-                command = EditTournamentView(self.context.tournament).run()
-                self.context = command()
+    app = MainApp(
+        redraw=False if args.plain or args.record or args.replay_journal else None
+    )
+    if args.startup_time:
+        measure_startup(args.startup_time, args.top)
+    elif args.replay:
+        sys.exit(instrumentation.replay_session(args.replay, args.speed))
+    elif args.replay_journal:
+        from instrumentation.session import play
 
-            else:
-                if self.context.screen is not None:
-                    print(f"[!] Unknown screen: {screen}")
-                break
+        play(app, *args.replay_journal, speed=args.speed)
+    elif args.stats or args.profile or args.metrics or args.record:
+        from contextlib import ExitStack
+
+        with ExitStack() as stack:
+            if args.record:
+                stack.enter_context(instrumentation.SessionRecorder(args.record, app))
+            if args.stats or args.profile or args.metrics:
+                recorder = stack.enter_context(instrumentation.recording(args.profile))
+            if args.metrics:
+                stack.enter_context(instrumentation.collecting(args.metrics))
+            try:
+                app.run()
+            finally:
+                if args.stats or args.profile:
+                    print(f"\n{recorder.summary()}")
+                if args.profile:
+                    print(
+                        f"\nCommand profiles written to {args.profile}/ (see python -m pstats)"
+                    )
+    else:
+        app.run()
 
 
 if __name__ == "__main__":
-    app = MainApp()
-    app.run()
+    main()
@@ -0,0 +1,242 @@
+"""
+Headless command-line tools for the tournament data.
+
+Usage: python cli.py <command> [options]  (python cli.py --help for the list)
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from commands import (
+    AdvanceRoundCmd,
+    BatchReportCmd,
+    ExportCmd,
+    MatchResultsCmd,
+    StartTournamentCmd,
+    TournamentReportCmd,
+)
+from commands.export import EXPORTS, FORMATS
+from commands.match_results import parse_results
+from models import Tournament
+from models.tournament import TournamentChanged
+
+# The application's data, wherever the tools are run from.
+DATA = Path(__file__).resolve().parent / "data"
+
+
+def reports(args: argparse.Namespace) -> int:
+    """Renders the reports of every (or the named) tournament, and an index page."""
+    context = BatchReportCmd(
+        tournaments_dir=args.tournaments,
+        reports_dir=args.out,
+        names=args.names,
+        workers=args.workers,
+        force=args.force,
+    )()
+    print(context.message)
+    return 0
+
+
+def load_tournament(path: Path) -> Tournament:
+    """
+    Loads one tournament file.
+
+    Args:
+        path (Path): Path to the tournament's JSON file.
+
+    Returns:
+        Tournament: The tournament.
+    """
+    return Tournament.load(path)
+
+
+def export(args: argparse.Namespace) -> int:
+    """Exports standings, pairings or results of one tournament or the archive."""
+    tournament = load_tournament(args.tournament) if args.tournament else None
+    command = ExportCmd(args.kind, args.format, args.out, tournament, args.tournaments)
+    try:
+        context = command()
+    except BrokenPipeError:
+        # The reader stopped early (e.g. piped into head): silence the final flush.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    print(context.message, file=sys.stderr)
+    return 0
+
+
+def results(args: argparse.Namespace) -> int:
+    """Enters a file of results for the current round, with one command and one save."""
+    tournament = load_tournament(args.tournament)
+    index = tournament.current_round_index
+    if index < 0 or index >= len(tournament.rounds):
+        print("No round in progress.", file=sys.stderr)
+        return 1
+    rnd = tournament.rounds[index]
+
+    if str(args.file) == "-":
+        lines = sys.stdin.readlines()
+    else:
+        with open(args.file) as f:
+            lines = f.readlines()
+    try:
+        entries = parse_results(lines, rnd)
+    except ValueError as e:
+        print(f"{args.file}: {e}", file=sys.stderr)
+        return 1
+
+    MatchResultsCmd(tournament, entries, speculate=False)()
+    left = sum(not match.completed for match in rnd.matches)
+    print(
+        f"{len(entries)} results entered in {rnd.name} "
+        f"({left} of {len(rnd.matches)} boards still to play)."
+    )
+    return 0
+
+
+def advance(args: argparse.Namespace) -> int:
+    """Starts the tournament, or pairs its next round once every game has a result."""
+    tournament = load_tournament(args.tournament)
+    if tournament.current_round_index == -1:
+        context = StartTournamentCmd(tournament)()
+        if tournament.current_round_index < 0:
+            print(
+                f"{tournament.name} was not started: it needs at least two players.",
+                file=sys.stderr,
+            )
+            return 1
+    else:
+        rnd = tournament.rounds[tournament.current_round_index]
+        unplayed = sum(not m.completed for m in rnd.matches)
+        if unplayed and not args.force:
+            print(
+                f"{rnd.name} still has {unplayed} games without a result "
+                "(use --force to pair the next round anyway).",
+                file=sys.stderr,
+            )
+            return 1
+        context = AdvanceRoundCmd(tournament)()
+
+    message = getattr(context, "message", None)
+    if message:
+        print(message)
+    else:
+        rnd = tournament.rounds[tournament.current_round_index]
+        print(
+            f"{rnd.name} of {tournament.num_rounds} paired: {len(rnd.matches)} boards."
+        )
+    return 0
+
+
+def report(args: argparse.Namespace) -> int:
+    """Renders one tournament's report without opening a browser."""
+    command = TournamentReportCmd(load_tournament(args.tournament))
+    args.out.mkdir(parents=True, exist_ok=True)
+    filepath, cache = command.report_location(args.out)
+    written = command.write_report(filepath, cache)
+    print(f"{filepath} {'written' if written else 'is up to date'}.")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Parses the command line and runs the chosen tool.
+
+    Args:
+        argv (Optional[List[str]]): Command-line arguments.
+
+    Returns:
+        int: The exit status.
+    """
+    parser = argparse.ArgumentParser(description="Chess tournament tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_reports = subparsers.add_parser(
+        "reports", help="render tournament reports without opening a browser"
+    )
+    parser_reports.add_argument(
+        "names", nargs="*", help="only tournaments whose name contains one of these"
+    )
+    parser_reports.add_argument(
+        "--tournaments",
+        type=Path,
+        default=DATA / "tournaments",
+        help="folder of tournament files",
+    )
+    parser_reports.add_argument(
+        "--out", type=Path, default=DATA / "reports", help="reports folder"
+    )
+    parser_reports.add_argument("--workers", type=int, help="worker processes")
+    parser_reports.add_argument(
+        "--force",
+        action="store_true",
+        help="check reports even if newer than their tournament file",
+    )
+    parser_reports.set_defaults(run=reports)
+
+    parser_export = subparsers.add_parser(
+        "export", help="export standings, pairings or results as CSV or JSON lines"
+    )
+    parser_export.add_argument("kind", choices=sorted(EXPORTS), help="what to export")
+    parser_export.add_argument(
+        "--format", choices=FORMATS, default="csv", help="output format"
+    )
+    parser_export.add_argument(
+        "--out", type=Path, help="output file (default: standard output)"
+    )
+    parser_export.add_argument(
+        "--tournament", type=Path, help="tournament file (default: the whole archive)"
+    )
+    parser_export.add_argument(
+        "--tournaments",
+        type=Path,
+        default=DATA / "tournaments",
+        help="folder of tournament files",
+    )
+    parser_export.set_defaults(run=export)
+
+    parser_results = subparsers.add_parser(
+        "results", help="enter a file of results for the current round"
+    )
+    parser_results.add_argument("tournament", type=Path, help="tournament file")
+    parser_results.add_argument(
+        "file",
+        type=Path,
+        nargs="?",
+        default=Path("-"),
+        help='results, as "board result" or "chess_id w/l/d" entries (default: standard input)',
+    )
+    parser_results.set_defaults(run=results)
+
+    parser_advance = subparsers.add_parser(
+        "advance", help="start the tournament or pair its next round"
+    )
+    parser_advance.add_argument("tournament", type=Path, help="tournament file")
+    parser_advance.add_argument(
+        "--force",
+        action="store_true",
+        help="pair the next round even if some games have no result",
+    )
+    parser_advance.set_defaults(run=advance)
+
+    parser_report = subparsers.add_parser(
+        "report", help="render one tournament's report without opening a browser"
+    )
+    parser_report.add_argument("tournament", type=Path, help="tournament file")
+    parser_report.add_argument(
+        "--out", type=Path, default=DATA / "reports", help="reports folder"
+    )
+    parser_report.set_defaults(run=report)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.run(args)
+    except TournamentChanged as e:
+        print(f"{e} Nothing was saved: run the command again.", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
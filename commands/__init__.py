@@ -1,32 +1,74 @@
-from .advance_round import AdvanceRoundCmd
-from .base import BaseCommand
-from .club_list import ClubListCmd
-from .context import Context
-from .create_club import ClubCreateCmd
-from .create_tournament import CreateTournamentCmd
-from .exit import ExitCmd
-from .match_results import MatchResultsCmd
-from .noop import NoopCmd
-from .register_player import RegisterPlayerCmd
-from .report import TournamentReportCmd
-from .start_tournament import StartTournamentCmd
-from .tournament_list import TournamentListCmd
-from .update_player import PlayerUpdateCmd
+"""
+Commands of the application.
+
+Each command is imported from its module the first time it is used, so
+starting the program does not load the report, pairing and export code (and
+the standard library modules they need) before the first menu appears.
+"""
+
+import importlib
+
+# Exported name -> module defining it.
+_EXPORTS = {
+    "AdvanceRoundCmd": ".advance_round",
+    "BaseCommand": ".base",
+    "BatchReportCmd": ".batch_report",
+    "ClubCreateCmd": ".create_club",
+    "ClubListCmd": ".club_list",
+    "Context": ".context",
+    "CreateTournamentCmd": ".create_tournament",
+    "ExitCmd": ".exit",
+    "ExportCmd": ".export",
+    "MatchResultsCmd": ".match_results",
+    "NoopCmd": ".noop",
+    "PlayerUpdateCmd": ".update_player",
+    "RegisterPlayerCmd": ".register_player",
+    "StartTournamentCmd": ".start_tournament",
+    "TournamentListCmd": ".tournament_list",
+    "TournamentReportCmd": ".report",
+    "WithdrawPlayerCmd": ".withdraw_player",
+}
 
 __all__ = [
     "AdvanceRoundCmd",
     "BaseCommand",
+    "BatchReportCmd",
     "ClubCreateCmd",
     "Context",
     "CreateTournamentCmd",
     "ExitCmd",
+    "ExportCmd",
     "ClubListCmd",
     "MatchResultsCmd",
     "NoopCmd",
     "PlayerUpdateCmd",
     "RegisterPlayerCmd",
     "StartTournamentCmd",
-    "TournamentReportCmd",
     "TournamentListCmd",
     "TournamentReportCmd",
+    "WithdrawPlayerCmd",
 ]
+
+
+def __getattr__(name: str):
+    """
+    Imports an exported command on first access.
+
+    Args:
+        name (str): The attribute looked up on the package.
+
+    Returns:
+        The exported object, cached on the package for later lookups.
+
+    Raises:
+        AttributeError: If the name is not exported.
+    """
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,9 +1,14 @@
-from typing import List
+import time
+from typing import List, Optional
 
+import instrumentation
 from models import Round, Match, Tournament
 
 from .base import BaseCommand
 from .context import Context
+from .events import PAIRINGS, publish
+from .indexes import update_indexes
+from .pairing import PairingSearch, SpeculativePairing, SwissPairing
 
 
 class AdvanceRoundCmd(BaseCommand):
@@ -13,16 +18,37 @@ class AdvanceRoundCmd(BaseCommand):
     Generates match pairings based on tournament scores,
     updates round index, saves the tournament state, and
     prevents advancement past the total number of rounds.
+
+    Pairings precomputed by `speculate` while the last games were being
+    played are used when they match the actual results.
+
+    Attributes:
+        tournament (Tournament): The tournament to update.
+        search_budget (Optional[float]): Seconds the parallel pairing search may
+            spend when the matching engine cannot avoid a rematch (None disables it).
+        search_workers (Optional[int]): Worker processes of the pairing search
+            (None for one per CPU).
     """
 
-    def __init__(self, tournament: Tournament) -> None:
+    SEARCH_BUDGET = 1.5
+
+    def __init__(
+        self,
+        tournament: Tournament,
+        search_budget: Optional[float] = SEARCH_BUDGET,
+        search_workers: Optional[int] = None,
+    ) -> None:
         """
         Initialize the AdvanceRoundCmd.
 
         Args:
             tournament (Tournament): The tournament to update.
+            search_budget (Optional[float]): Budget of the pairing search, in seconds.
+            search_workers (Optional[int]): Worker processes of the pairing search.
         """
         self.tournament = tournament
+        self.search_budget = search_budget
+        self.search_workers = search_workers
 
     def _current_round(self) -> Round | None:
         idx = self.tournament.current_round_index
@@ -30,25 +56,64 @@ class AdvanceRoundCmd(BaseCommand):
             return self.tournament.rounds[idx]
         return None
 
-    def generate_match_pairings(self) -> List[Match]:
+    @classmethod
+    def speculate(
+        cls, tournament: Tournament, search_budget: Optional[float] = SEARCH_BUDGET
+    ) -> None:
+        """
+        Starts precomputing the next round once the current one is mostly complete.
+
+        The pairings are computed on a background thread, so the pairing search
+        runs in that thread rather than starting worker processes from it.
+
+        Args:
+            tournament (Tournament): The tournament whose results were just entered.
+            search_budget (Optional[float]): Budget of the pairing search, in seconds.
+        """
+
+        def pair(snapshot: Tournament, scores: dict[str, float]) -> List[Match]:
+            command = cls(snapshot, search_budget, search_workers=1)
+            return command.generate_match_pairings(scores)
+
+        SpeculativePairing.start(tournament, pair)
+
+    def generate_match_pairings(
+        self, scores: Optional[dict[str, float]] = None
+    ) -> List[Match]:
         """
-        Generate match pairings for the new round, sorted by descending score.
-        Players are paired in order (1st vs 2nd, 3rd vs 4th, etc.).
+        Generate match pairings for the new round with the Swiss pairing engine.
+
+        Players are ranked by descending score (randomly among equal scores) and
+        paired as a maximum-weight matching that keeps score differences small
+        and avoids repeat opponents whenever possible. Ties are broken with the
+        tournament's generator for the new round, so the pairing is reproducible
+        from the seed and the results.
+
+        If that still leaves a rematch (typically late in a long tournament),
+        a parallel backtracking search looks for the best rematch-free pairing
+        within the search budget.
+
+        Args:
+            scores (Optional[dict[str, float]]): Points to pair on, instead of
+                the tournament's current standings.
 
         Returns:
             List[Match]: A list of new match pairings.
         """
-        scores = self.tournament.player_scores()
-        registrants_by_id = {p["chess_id"]: p for p in self.tournament.players}
-        sorted_players = [
-            registrants_by_id[cid]
-            for cid in sorted(scores, key=scores.get, reverse=True)
-        ]
-
-        matches = [
-            Match(player1=sorted_players[i], player2=sorted_players[i + 1])
-            for i in range(0, len(sorted_players), 2)
-        ]
+        rng = self.tournament.rng_for_round(len(self.tournament.rounds) + 1)
+        engine = SwissPairing.from_tournament(self.tournament, rng, scores)
+        matches = engine.matches()
+
+        history = self.tournament.history
+        if self.search_budget and any(
+            history.have_played(
+                match._get_chess_id(match.player1), match._get_chess_id(match.player2)
+            )
+            for match in matches
+            if not match.is_bye
+        ):
+            search = PairingSearch(engine, self.search_budget, self.search_workers)
+            matches = search.matches()
         return matches
 
     def execute(self) -> Context:
@@ -77,18 +142,38 @@ class AdvanceRoundCmd(BaseCommand):
                 message="Final round is in progress. Enter match results to complete the tournament.",
             )
 
+        if len(self.tournament.active_players) < 2:
+            return Context(
+                "tournament-view",
+                tournament=self.tournament,
+                message="Fewer than two players are still in the tournament: no round can be paired.",
+            )
+
         next_index = (
             0
             if self.tournament.current_round_index == -1
             else self.tournament.current_round_index + 1
         )
 
-        matches = self.generate_match_pairings()
+        metrics = instrumentation.metrics()
+        start = time.perf_counter()
+        matches = None
+        if self.tournament.current_round_index >= 0:
+            matches = SpeculativePairing.take(self.tournament)
+            if metrics is not None:
+                metrics.cache_lookup("speculative-pairing", matches is not None)
+        precomputed = matches is not None
+        if matches is None:
+            matches = self.generate_match_pairings()
+        if metrics is not None:
+            metrics.paired(time.perf_counter() - start, precomputed)
 
         new_round = Round(round_number=next_index + 1, matches=matches)
-        self.tournament.rounds.append(new_round)
+        self.tournament.add_round(new_round)
         self.tournament.current_round_index = next_index
 
         self.tournament.save()
+        update_indexes(self.tournament)
+        publish(self.tournament, PAIRINGS)
 
         return Context("tournament-view", tournament=self.tournament)
@@ -1,5 +1,7 @@
 from abc import ABCMeta, abstractmethod
 
+import instrumentation
+
 
 class BaseCommand(metaclass=ABCMeta):
     """This is the base class for a command"""
@@ -10,5 +12,12 @@ class BaseCommand(metaclass=ABCMeta):
         pass
 
     def __call__(self):
-        """Syntactic sugar: calling the instance calls its execute() method"""
-        return self.execute()
+        """
+        Syntactic sugar: calling the instance calls its execute() method.
+
+        Its latency is recorded when instrumentation is on.
+        """
+        recorder = instrumentation.active()
+        if recorder is None:
+            return self.execute()
+        return recorder.run("command", type(self).__name__, self.execute)
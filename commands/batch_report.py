@@ -0,0 +1,188 @@
+import html
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from models import Tournament
+
+from .base import BaseCommand
+from .context import Context
+from .report import WRITE_BUFFER, TournamentReportCmd
+
+
+INDEX_FILE = "index.html"
+# The application's data, wherever the command is run from.
+DATA = Path(__file__).resolve().parents[1] / "data"
+
+
+def render_report(
+    filepath: Path,
+    reports_dir: Path,
+    force: bool = False,
+    names: Optional[List[str]] = None,
+) -> dict:
+    """
+    Renders one tournament's report without opening it, unless it is up to date.
+
+    A report is up to date when it is newer than the tournament file; otherwise
+    the fragment cache still avoids rewriting a report whose content is unchanged.
+
+    Args:
+        filepath (Path): Path to the tournament's JSON file.
+        reports_dir (Path): Folder holding every report.
+        force (bool): Check the report even if it is newer than the tournament file.
+        names (Optional[List[str]]): Lowercase parts of the names of the
+            tournaments to render (all of them if None).
+
+    Returns:
+        dict: The tournament's name, venue, dates, status and round, the report
+        file name, whether the tournament was selected, whether the report was
+        written and whether it exists.
+    """
+    with open(filepath, "r") as f:
+        tournament = Tournament.from_dict(json.load(f), filepath)
+
+    command = TournamentReportCmd(tournament)
+    report, cache = command.report_location(reports_dir)
+    fresh = report.exists() and report.stat().st_mtime >= filepath.stat().st_mtime
+    selected = names is None or any(n in tournament.name.lower() for n in names)
+    written = False
+    if selected and (force or not fresh):
+        written = command.write_report(report, cache)
+        if not written:
+            # Same content: mark the report fresh so the next run skips the check.
+            os.utime(report)
+
+    return {
+        "name": tournament.name,
+        "venue": tournament.venue,
+        "start_date": tournament.start_date.strftime("%d-%m-%Y"),
+        "end_date": tournament.end_date.strftime("%d-%m-%Y"),
+        "status": tournament.status_label,
+        "round": f"{len(tournament.rounds)} of {tournament.num_rounds}",
+        "report": report.name,
+        "selected": selected,
+        "written": written,
+        "exists": report.exists(),
+    }
+
+
+def write_index(reports_dir: Path, entries: List[dict]) -> Path:
+    """
+    Writes an index page linking every report, newest tournament first.
+
+    Tournaments without a report (not selected by a name filter, and never
+    rendered before) are left out, so every link leads to a report.
+
+    Args:
+        reports_dir (Path): Folder holding every report.
+        entries (List[dict]): Results of render_report.
+
+    Returns:
+        Path: The index page.
+    """
+    index = reports_dir / INDEX_FILE
+    entries = sorted(
+        (e for e in entries if e["exists"]),
+        key=lambda e: tuple(reversed(e["start_date"].split("-"))),
+        reverse=True,
+    )
+    with open(index, "w", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+        f.write(
+            "<html><head><title>Tournament reports</title></head><body>"
+            "<h1>Tournament reports</h1><table>"
+            "<tr><th>Tournament</th><th>Venue</th><th>Dates</th>"
+            "<th>Rounds</th><th>Status</th></tr>"
+        )
+        for e in entries:
+            f.write(
+                f'<tr><td><a href="{html.escape(e["report"])}">'
+                f'{html.escape(e["name"])}</a></td>'
+                f'<td>{html.escape(e["venue"] or "")}</td>'
+                f'<td>{e["start_date"]} to {e["end_date"]}</td>'
+                f'<td>{e["round"]}</td><td>{html.escape(e["status"])}</td></tr>'
+            )
+        f.write("</table></body></html>\n")
+    return index
+
+
+class BatchReportCmd(BaseCommand):
+    """
+    Command to render the reports of many tournaments at once, without a browser.
+
+    Tournament files are rendered across a process pool. Reports newer than
+    their tournament file are skipped, and an index page linking every
+    tournament's report is written last.
+
+    Attributes:
+        tournaments_dir (Path): Folder holding the tournament files.
+        reports_dir (Path): Folder receiving the reports and index page.
+        names (Optional[List[str]]): Only tournaments whose name contains one of
+            these (case-insensitive) are rendered; all of them if None.
+        workers (Optional[int]): Number of worker processes.
+        force (bool): Check every report, even those newer than their tournament.
+    """
+
+    def __init__(
+        self,
+        tournaments_dir: Path = DATA / "tournaments",
+        reports_dir: Path = DATA / "reports",
+        names: Optional[Iterable[str]] = None,
+        workers: Optional[int] = None,
+        force: bool = False,
+    ) -> None:
+        """
+        Initialize the command.
+
+        Args:
+            tournaments_dir (Path): Folder holding the tournament files.
+            reports_dir (Path): Folder receiving the reports and index page.
+            names (Optional[Iterable[str]]): Parts of the names of the tournaments to render.
+            workers (Optional[int]): Number of worker processes (defaults to the CPU count).
+            force (bool): Check every report, even those newer than their tournament.
+        """
+        self.tournaments_dir = tournaments_dir
+        self.reports_dir = reports_dir
+        self.names = [n.lower() for n in names] if names else None
+        self.workers = workers or os.cpu_count() or 1
+        self.force = force
+
+    def execute(self) -> Context:
+        """
+        Renders the reports and writes the index page.
+
+        Returns:
+            Context: Back to the tournaments menu, with a summary message.
+        """
+        self.reports_dir.mkdir(parents=True, exist_ok=True)
+        files = sorted(self.tournaments_dir.glob("*.json"))
+
+        entries = []
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = {
+                executor.submit(
+                    render_report, path, self.reports_dir, self.force, self.names
+                ): path
+                for path in files
+            }
+            for future, path in futures.items():
+                try:
+                    entries.append(future.result())
+                except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                    print(path, "is not a valid tournament file.")
+                except OSError as e:
+                    # Unreadable tournament, or report that cannot be written.
+                    print(path, f"was skipped: {e}")
+
+        index = write_index(self.reports_dir, entries)
+        selected = sum(e["selected"] for e in entries)
+        written = sum(e["written"] for e in entries)
+        return Context(
+            "tournaments-main",
+            message=(
+                f"{written} of {selected} reports written "
+                f"({selected - written} up to date). Index: {index}"
+            ),
+        )
@@ -0,0 +1,52 @@
+"""
+Notifications sent after a command changes a tournament.
+
+Listeners run synchronously in the thread of the command, right after its
+save, so they must return quickly: hand the work over (e.g. to an event loop)
+rather than do it in place.
+"""
+
+from typing import Callable
+
+from models import Tournament
+
+RESULTS = "results"
+PAIRINGS = "pairings"
+
+Listener = Callable[[Tournament, str], None]
+
+_listeners: list[Listener] = []
+
+
+def subscribe(listener: Listener) -> None:
+    """
+    Registers a listener for tournament changes.
+
+    Args:
+        listener (Listener): Called with the tournament and the kind of change
+            (RESULTS or PAIRINGS).
+    """
+    _listeners.append(listener)
+
+
+def unsubscribe(listener: Listener) -> None:
+    """
+    Removes a listener registered with subscribe.
+
+    Args:
+        listener (Listener): The listener.
+    """
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def publish(tournament: Tournament, kind: str) -> None:
+    """
+    Notifies every listener of a change to a tournament.
+
+    Args:
+        tournament (Tournament): The tournament, as just saved.
+        kind (str): RESULTS or PAIRINGS.
+    """
+    for listener in list(_listeners):
+        listener(tournament, kind)
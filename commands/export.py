@@ -0,0 +1,268 @@
+import csv
+import json
+import sys
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, TextIO
+
+from models import Tournament
+from models.match import PLAYER1, PLAYER2, DRAW
+from models.tournament_manager import iter_tournaments
+
+from .base import BaseCommand
+from .context import Context
+from .report import WRITE_BUFFER
+
+
+STANDINGS_FIELDS = (
+    "tournament",
+    "rank",
+    "chess_id",
+    "name",
+    "club",
+    "points",
+    "withdrawn",
+)
+PAIRINGS_FIELDS = (
+    "tournament",
+    "round",
+    "board",
+    "white_id",
+    "white_name",
+    "black_id",
+    "black_name",
+)
+RESULTS_FIELDS = (
+    "tournament",
+    "round",
+    "board",
+    "white_id",
+    "black_id",
+    "result",
+    "white_points",
+    "black_points",
+)
+
+RESULT_LABELS = {PLAYER1: "1-0", PLAYER2: "0-1", DRAW: "1/2-1/2"}
+
+
+def standings_rows(tournament: Tournament) -> Iterator[dict]:
+    """
+    Yields the standings, best first; players on equal points share a rank.
+
+    Args:
+        tournament (Tournament): The tournament.
+
+    Yields:
+        dict: One row per registrant, with the STANDINGS_FIELDS keys.
+    """
+    scores = tournament.player_scores()
+    players = sorted(
+        tournament.players,
+        key=lambda p: scores.get(p["chess_id"], 0.0),
+        reverse=True,
+    )
+    rank, previous = 0, None
+    for position, player in enumerate(players, 1):
+        points = scores.get(player["chess_id"], 0.0)
+        if points != previous:
+            rank, previous = position, points
+        yield {
+            "tournament": tournament.name,
+            "rank": rank,
+            "chess_id": player["chess_id"],
+            "name": player["name"],
+            "club": player["club_name"],
+            "points": points,
+            "withdrawn": bool(player.get("withdrawn")),
+        }
+
+
+def pairings_rows(tournament: Tournament) -> Iterator[dict]:
+    """
+    Yields every board of every round; black is empty for a bye.
+
+    Args:
+        tournament (Tournament): The tournament.
+
+    Yields:
+        dict: One row per board, with the PAIRINGS_FIELDS keys.
+    """
+    for rnd in tournament.rounds:
+        for board, match in enumerate(rnd.matches, 1):
+            bye = match.is_bye
+            yield {
+                "tournament": tournament.name,
+                "round": rnd.round_number,
+                "board": board,
+                "white_id": match._get_chess_id(match.player1),
+                "white_name": match._get_name(match.player1),
+                "black_id": "" if bye else match._get_chess_id(match.player2),
+                "black_name": "" if bye else match._get_name(match.player2),
+            }
+
+
+def results_rows(tournament: Tournament) -> Iterator[dict]:
+    """
+    Yields the result of every completed game and bye.
+
+    Args:
+        tournament (Tournament): The tournament.
+
+    Yields:
+        dict: One row per completed board, with the RESULTS_FIELDS keys.
+    """
+    for rnd in tournament.rounds:
+        for board, match in enumerate(rnd.matches, 1):
+            if not match.completed:
+                continue
+            bye = match.is_bye
+            yield {
+                "tournament": tournament.name,
+                "round": rnd.round_number,
+                "board": board,
+                "white_id": match._get_chess_id(match.player1),
+                "black_id": "" if bye else match._get_chess_id(match.player2),
+                "result": "bye" if bye else RESULT_LABELS[match.winner],
+                "white_points": match.get_points(match.player1),
+                "black_points": "" if bye else match.get_points(match.player2),
+            }
+
+
+EXPORTS: dict[str, tuple[Callable[[Tournament], Iterator[dict]], tuple]] = {
+    "standings": (standings_rows, STANDINGS_FIELDS),
+    "pairings": (pairings_rows, PAIRINGS_FIELDS),
+    "results": (results_rows, RESULTS_FIELDS),
+}
+FORMATS = ("csv", "jsonl")
+
+# The application's data, wherever the command is run from.
+DATA = Path(__file__).resolve().parents[1] / "data"
+
+
+def write_rows(rows: Iterable[dict], fields: tuple, fmt: str, out: TextIO) -> int:
+    """
+    Writes rows one at a time as CSV (with a header) or JSON lines.
+
+    Args:
+        rows (Iterable[dict]): The rows.
+        fields (tuple): Column names, in order.
+        fmt (str): "csv" or "jsonl".
+        out (TextIO): The output stream.
+
+    Returns:
+        int: Number of rows written.
+    """
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=fields, lineterminator="\n")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    else:
+        for row in rows:
+            out.write(json.dumps(row, ensure_ascii=False))
+            out.write("\n")
+            count += 1
+    return count
+
+
+class ExportCmd(BaseCommand):
+    """
+    Command to export standings, pairings or results as CSV or JSON lines.
+
+    Exports one tournament, or the whole archive read one file at a time.
+    Rows are generated and written one by one, so memory does not grow with
+    the number of tournaments exported.
+
+    Attributes:
+        kind (str): "standings", "pairings" or "results".
+        fmt (str): "csv" or "jsonl".
+        output (Optional[Path]): File to write, or None for standard output.
+        tournament (Optional[Tournament]): Tournament to export, or None for
+            the whole archive.
+        tournaments_dir (Path): Folder of the archive.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        fmt: str = "csv",
+        output: Optional[Path] = None,
+        tournament: Optional[Tournament] = None,
+        tournaments_dir: Path = DATA / "tournaments",
+    ) -> None:
+        """
+        Initialize the command.
+
+        Args:
+            kind (str): "standings", "pairings" or "results".
+            fmt (str): "csv" or "jsonl".
+            output (Optional[Path]): File to write, or None for standard output.
+            tournament (Optional[Tournament]): Tournament to export (default: the archive).
+            tournaments_dir (Path): Folder of the archive.
+
+        Raises:
+            ValueError: If the kind or format is unknown.
+        """
+        if kind not in EXPORTS:
+            raise ValueError(f"Unknown export: {kind}")
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format: {fmt}")
+        self.kind = kind
+        self.fmt = fmt
+        self.output = output
+        self.tournament = tournament
+        self.tournaments_dir = tournaments_dir
+
+    def rows(self) -> Iterator[dict]:
+        """
+        Yields the rows to export, one tournament at a time.
+
+        Yields:
+            dict: The rows.
+        """
+        make_rows, _ = EXPORTS[self.kind]
+        if self.tournament is not None:
+            yield from make_rows(self.tournament)
+            return
+        for tournament in iter_tournaments(self.tournaments_dir, warn=self.warn):
+            yield from make_rows(tournament)
+
+    @staticmethod
+    def warn(message: str) -> None:
+        """
+        Reports a tournament file that cannot be exported.
+
+        Warnings go to standard error, so that only rows reach the output,
+        which may be standard output.
+
+        Args:
+            message (str): The warning.
+        """
+        print(message, file=sys.stderr)
+
+    def execute(self) -> Context:
+        """
+        Writes the export.
+
+        Returns:
+            Context: Back to the tournament view (or tournaments menu), with a summary.
+        """
+        _, fields = EXPORTS[self.kind]
+        if self.output is None:
+            count = write_rows(self.rows(), fields, self.fmt, sys.stdout)
+            destination = "standard output"
+        else:
+            with open(
+                self.output, "w", encoding="utf-8", newline="", buffering=WRITE_BUFFER
+            ) as f:
+                count = write_rows(self.rows(), fields, self.fmt, f)
+            destination = str(self.output)
+
+        message = f"Exported {count} {self.kind} rows to {destination}."
+        if self.tournament is not None:
+            return Context(
+                "tournament-view", tournament=self.tournament, message=message
+            )
+        return Context("tournaments-main", message=message)
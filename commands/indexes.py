@@ -0,0 +1,25 @@
+import threading
+
+from models import HeadToHeadIndex, PlayerStatsIndex, Tournament
+
+# The indexes cover the whole archive: one update at a time, whichever thread
+# (a menu, or an API desk saving another tournament) makes it.
+_lock = threading.Lock()
+
+
+def update_indexes(tournament: Tournament) -> None:
+    """
+    Refreshes every archive-wide index with a tournament's latest results.
+
+    Called by the commands that save match results or new pairings, possibly
+    from several threads at once: updates are serialized, since they change
+    the same indexes. The indexes updated are those of the archive the
+    tournament's file is in.
+
+    Args:
+        tournament (Tournament): The tournament that was just saved.
+    """
+    archive = tournament.filepath.parent
+    with _lock:
+        PlayerStatsIndex.load(archive).update(tournament)
+        HeadToHeadIndex.load(archive).update(tournament)
@@ -1,8 +1,115 @@
-from models import Tournament
+from typing import Iterable
+
+import instrumentation
+from models import Round, Tournament
 from models.match import PLAYER1, PLAYER2, DRAW
 
+from .advance_round import AdvanceRoundCmd
 from .context import Context
 from .base import BaseCommand
+from .events import RESULTS, publish
+from .indexes import update_indexes
+
+
+# Result of a board, by board number: the codes of MatchResultsCmd, and the
+# labels used by the results export.
+BOARD_RESULTS = {
+    "1": "1",
+    "2": "2",
+    "d": "d",
+    "1-0": "1",
+    "0-1": "2",
+    "1/2-1/2": "d",
+}
+# Result of a player, by chess ID: won, lost or drew.
+PLAYER_RESULTS = {"w": ("1", "2"), "l": ("2", "1"), "d": ("d", "d")}
+
+
+def match_indexes(rnd: Round) -> dict[str, int]:
+    """
+    Maps the chess ID of every player in a round to the index of their match.
+
+    Args:
+        rnd (Round): The round.
+
+    Returns:
+        dict[str, int]: Match index by (uppercase) chess ID.
+    """
+    indexes = {}
+    for index, match in enumerate(rnd.matches):
+        indexes[match._get_chess_id(match.player1).upper()] = index
+        if not match.is_bye:
+            indexes[match._get_chess_id(match.player2).upper()] = index
+    return indexes
+
+
+def parse_results(lines: Iterable[str], rnd: Round) -> dict[int, str]:
+    """
+    Parses result entries for a round into the input of MatchResultsCmd.
+
+    Each entry is a board number and its result (1, 2, d, 1-0, 0-1 or
+    1/2-1/2), or a chess ID and that player's result (w, l or d). Entries are
+    separated by spaces, commas or new lines, with a colon or space between
+    target and result, so "1:1 2:d NG39713:w" and one "12 1" per line both
+    work. Anything after a "#" is a comment.
+
+    Args:
+        lines (Iterable[str]): The entries, a line at a time.
+        rnd (Round): The round the results belong to.
+
+    Returns:
+        dict[int, str]: Match index mapped to result ("1", "2", or "d").
+
+    Raises:
+        ValueError: If an entry is malformed, names an unknown board or
+            player, targets a bye, or contradicts another entry.
+    """
+    indexes = None
+    results: dict[int, str] = {}
+
+    for number, line in enumerate(lines, 1):
+        tokens = line.split("#", 1)[0].replace(":", " ").replace(",", " ").split()
+        if len(tokens) % 2:
+            raise ValueError(
+                f"Line {number}: expected pairs of board or chess ID and result."
+            )
+
+        for target, result in zip(tokens[::2], tokens[1::2]):
+            result = result.lower()
+            if target.isdigit():
+                index = int(target) - 1
+                if not 0 <= index < len(rnd.matches):
+                    raise ValueError(f"Line {number}: there is no board {target}.")
+                if result not in BOARD_RESULTS:
+                    raise ValueError(
+                        f"Line {number}: board result must be 1, 2, d, 1-0, 0-1 or 1/2-1/2, not {result!r}."
+                    )
+                code = BOARD_RESULTS[result]
+            else:
+                if indexes is None:
+                    indexes = match_indexes(rnd)
+                index = indexes.get(target.upper())
+                if index is None:
+                    raise ValueError(
+                        f"Line {number}: {target} is not playing this round."
+                    )
+                if result not in PLAYER_RESULTS:
+                    raise ValueError(
+                        f"Line {number}: player result must be w, l or d, not {result!r}."
+                    )
+                match = rnd.matches[index]
+                as_white, as_black = PLAYER_RESULTS[result]
+                is_white = match._get_chess_id(match.player1).upper() == target.upper()
+                code = as_white if is_white else as_black
+
+            if rnd.matches[index].is_bye:
+                raise ValueError(f"Line {number}: board {index + 1} is a bye.")
+            if results.get(index, code) != code:
+                raise ValueError(
+                    f"Line {number}: board {index + 1} already has a different result."
+                )
+            results[index] = code
+    return results
 
 
 class MatchResultsCmd(BaseCommand):
@@ -11,18 +118,25 @@ class MatchResultsCmd(BaseCommand):
 
     Attributes:
         tournament (Tournament): The tournament being updated.
+        results (dict[int, str]): Match index mapped to result.
+        speculate (bool): Whether to precompute the next round afterwards.
     """
 
-    def __init__(self, tournament: Tournament, results: dict[int, str]) -> None:
+    def __init__(
+        self, tournament: Tournament, results: dict[int, str], speculate: bool = True
+    ) -> None:
         """
         Initialize the command.
 
         Args:
             tournament (Tournament): The tournament being updated.
             results (dict[int, str]): Match index mapped to result ("1", "2", or "d").
+            speculate (bool): Start precomputing the next round's pairings
+                (pointless when the process exits right after).
         """
         self.tournament = tournament
         self.results = results
+        self.speculate = speculate
 
     def execute(self) -> Context:
         """
@@ -33,6 +147,8 @@ class MatchResultsCmd(BaseCommand):
             "2" - player2 wins
             "d" - draw
 
+        Byes already carry their result and are left unchanged.
+
         Returns:
             Context: Updated context returning to the tournament view.
         """
@@ -47,15 +163,19 @@ class MatchResultsCmd(BaseCommand):
 
         current_round = self.tournament.rounds[current_index]
 
+        entered = 0
         for index, result in self.results.items():
             if 0 <= index < len(current_round.matches):
                 match = current_round.matches[index]
+                if match.is_bye or result not in ("1", "2", "d"):
+                    continue
                 if result == "1":
                     match.update_result(PLAYER1)
                 elif result == "2":
                     match.update_result(PLAYER2)
-                elif result == "d":
+                else:
                     match.update_result(DRAW)
+                entered += 1
         if (
             all(match.completed for match in current_round.matches)
             and self.tournament.current_round_index + 1 == self.tournament.num_rounds
@@ -63,4 +183,11 @@ class MatchResultsCmd(BaseCommand):
             self.tournament.is_complete = True
 
         self.tournament.save()
+        update_indexes(self.tournament)
+        publish(self.tournament, RESULTS)
+        metrics = instrumentation.metrics()
+        if metrics is not None:
+            metrics.results_entered(entered)
+        if self.speculate:
+            AdvanceRoundCmd.speculate(self.tournament)
         return Context("tournament-view", tournament=self.tournament)
@@ -0,0 +1,11 @@
+from .blossom import max_weight_matching
+from .search import PairingSearch
+from .speculative import SpeculativePairing
+from .swiss import SwissPairing
+
+__all__ = [
+    "max_weight_matching",
+    "PairingSearch",
+    "SpeculativePairing",
+    "SwissPairing",
+]
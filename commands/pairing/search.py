@@ -0,0 +1,315 @@
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import List, Optional, Tuple
+
+from models import Match
+
+from .swiss import SwissPairing
+
+
+# A single process is used below this many players: starting a pool costs more
+# than the search itself.
+PARALLEL_THRESHOLD = 64
+
+Solution = Tuple[int, List[int]]
+
+# Set in worker processes: tells their search to stop once a result was taken.
+_cancelled = None
+
+
+def _init_worker(cancelled) -> None:
+    global _cancelled
+    _cancelled = cancelled
+
+
+def crossing_cost(points: List[int]) -> int:
+    """
+    Lowest cost of pairing two players with different scores.
+
+    Args:
+        points (List[int]): Scores in half-points.
+
+    Returns:
+        int: The squared gap between the two closest distinct scores (1 if
+        everyone has the same score).
+    """
+    scores = sorted(set(points))
+    if len(scores) < 2:
+        return 1
+    return min((b - a) ** 2 for a, b in zip(scores, scores[1:]))
+
+
+def solve(
+    points: List[int],
+    opponents: List[int],
+    seed: int,
+    deadline: float,
+    breadth: int = 8,
+) -> Optional[Solution]:
+    """
+    Depth-first branch-and-bound search for the best rematch-free pairing.
+
+    Players are given in ranking order. The highest-ranked unpaired player is
+    always paired next, trying up to `breadth` legal opponents from nearest to
+    furthest in the ranking. A pairing costs the squared score difference, and a
+    branch is cut as soon as its cost plus a lower bound for the rest reaches the
+    best complete pairing found so far. The lower bound counts score groups with
+    an odd number of unpaired players: every two of them force a pairing across
+    groups, which costs at least the squared gap between the closest scores.
+
+    With a non-zero seed, equal-scored opponents are tried in a shuffled order, so
+    that several searches explore different transpositions and floaters.
+
+    Args:
+        points (List[int]): Scores in half-points, in ranking order (non-increasing).
+        opponents (List[int]): Bitset of previous opponents, by ranking position.
+        seed (int): 0 for the canonical order, otherwise a shuffle seed.
+        deadline (float): Wall-clock time (time.time()) at which to stop (or
+            earlier, in a worker process, once the search is cancelled).
+        breadth (int): Maximum number of opponents tried per player.
+
+    Returns:
+        Optional[Solution]: (cost, partner list), or None if no legal pairing was found.
+    """
+    n = len(points)
+    if not n:
+        return 0, []
+
+    rng = random.Random(seed) if seed else None
+    partner = [-1] * n
+
+    groups: dict[int, int] = {}
+    for p in points:
+        groups[p] = groups.get(p, 0) + 1
+    odd = sum(count & 1 for count in groups.values())
+    gap = crossing_cost(points)
+    root_bound = odd // 2 * gap
+
+    best_cost = float("inf")
+    best: Optional[List[int]] = None
+    cost = 0
+    nodes = 0
+
+    def candidates(i: int) -> List[int]:
+        found = []
+        played = opponents[i]
+        for j in range(i + 1, n):
+            if partner[j] == -1 and not played >> j & 1:
+                found.append(j)
+                if len(found) == breadth:
+                    break
+        if rng:
+            # Shuffle within runs of equal scores; the cost order is unchanged.
+            start = 0
+            for end in range(1, len(found) + 1):
+                if end == len(found) or points[found[end]] != points[found[start]]:
+                    run = found[start:end]
+                    rng.shuffle(run)
+                    found[start:end] = run
+                    start = end
+        return found
+
+    def move(p: int, delta: int) -> int:
+        """Moves a player in or out of its score group; returns the change in odd groups."""
+        groups[p] += delta
+        return 1 if groups[p] & 1 else -1
+
+    # Each frame: [player, candidates, next candidate index, current opponent or -1].
+    frames: List[list] = [[0, candidates(0), 0, -1]]
+
+    while frames:
+        nodes += 1
+        if nodes & 1023 == 0 and (
+            time.time() > deadline or _cancelled is not None and _cancelled.is_set()
+        ):
+            break
+
+        frame = frames[-1]
+        i, cands, k, j = frame
+        if j != -1:
+            # Undo the previous choice at this level.
+            partner[i] = partner[j] = -1
+            cost -= (points[i] - points[j]) ** 2
+            odd += move(points[i], 1) + move(points[j], 1)
+            frame[3] = -1
+
+        if k >= len(cands):
+            frames.pop()
+            continue
+
+        j = cands[k]
+        frame[2] = k + 1
+        step = (points[i] - points[j]) ** 2
+        odd += move(points[i], -1) + move(points[j], -1)
+
+        if cost + step + odd // 2 * gap >= best_cost:
+            odd += move(points[i], 1) + move(points[j], 1)
+            if step > 0:
+                # No later candidate has a lower bound, so this level is
+                # exhausted. Candidates come in non-increasing score order. One
+                # with the same step has the same score, hence the same effect
+                # on the odd groups. One scoring e lower adds at least 2e + e*e
+                # to the step, while its odd groups (only its own group's
+                # parity differs) save at most one crossing, worth gap <= e*e.
+                frame[2] = len(cands)
+            continue
+
+        partner[i], partner[j] = j, i
+        cost += step
+        frame[3] = j
+
+        nxt = i + 1
+        while nxt < n and partner[nxt] != -1:
+            nxt += 1
+        if nxt >= n:
+            best_cost, best = cost, partner[:]
+            if best_cost <= root_bound:
+                break
+            continue
+        frames.append([nxt, candidates(nxt), 0, -1])
+
+    if best is None:
+        return None
+    return best_cost, best
+
+
+class PairingSearch:
+    """
+    Parallel backtracking search for the best rematch-free pairing of a round.
+
+    Used when the matching engine cannot avoid a rematch, typically late in a
+    tournament when many opponents are already used up. The problem is encoded
+    compactly (scores and opponent bitsets in ranking order) and searched by
+    several worker processes, each trying equal-scored opponents in a different
+    order. The best pairing found before the wall-clock budget runs out wins.
+
+    Attributes:
+        engine (SwissPairing): The matching engine, used for ranking and as fallback.
+        budget (float): Wall-clock budget in seconds.
+        workers (int): Number of worker processes.
+    """
+
+    def __init__(
+        self, engine: SwissPairing, budget: float, workers: Optional[int] = None
+    ) -> None:
+        """
+        Initialize the search.
+
+        Args:
+            engine (SwissPairing): The matching engine, used for ranking and as fallback.
+            budget (float): Wall-clock budget in seconds.
+            workers (Optional[int]): Number of worker processes (defaults to the CPU count).
+        """
+        self.engine = engine
+        self.budget = budget
+        self.workers = workers or os.cpu_count() or 1
+
+    def encode(self, ranked: List[dict]) -> Tuple[List[int], List[int]]:
+        """
+        Encodes the ranked field as scores and opponent bitsets by ranking position.
+
+        Args:
+            ranked (List[dict]): The ranked registrants.
+
+        Returns:
+            Tuple[List[int], List[int]]: Half-point scores and opponent bitsets.
+        """
+        history = self.engine.history
+        ids = [p["chess_id"] for p in ranked]
+        rank_of = {history.position(cid): rank for rank, cid in enumerate(ids)}
+        points = [round(self.engine.scores.get(cid, 0.0) * 2) for cid in ids]
+
+        opponents = []
+        for cid in ids:
+            bits = history.opponents[history.position(cid)]
+            local = 0
+            while bits:
+                low = bits & -bits
+                rank = rank_of.get(low.bit_length() - 1)
+                if rank is not None:
+                    local |= 1 << rank
+                bits ^= low
+            opponents.append(local)
+        return points, opponents
+
+    def search(self, points: List[int], opponents: List[int]) -> Optional[Solution]:
+        """
+        Runs the search, in worker processes for large fields.
+
+        The search stops before the budget runs out when the best pairing
+        reaches the lower bound, when a worker has gone through the whole
+        search tree, or at once when some player has no legal opponent left.
+
+        Args:
+            points (List[int]): Half-point scores in ranking order.
+            opponents (List[int]): Opponent bitsets by ranking position.
+
+        Returns:
+            Optional[Solution]: The best (cost, partner list) found, or None.
+        """
+        everyone = (1 << len(points)) - 1
+        if any(played | 1 << i == everyone for i, played in enumerate(opponents)):
+            # Someone has played every other player: no rematch-free pairing exists.
+            return None
+
+        deadline = time.time() + self.budget
+        odd = sum(points.count(p) & 1 for p in set(points))
+        root_bound = odd // 2 * crossing_cost(points)
+
+        if self.workers < 2 or len(points) < PARALLEL_THRESHOLD:
+            return solve(points, opponents, 0, deadline)
+
+        best: Optional[Solution] = None
+        context = multiprocessing.get_context()
+        cancelled = context.Event()
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(cancelled,),
+        )
+        try:
+            pending = {
+                executor.submit(solve, points, opponents, seed, deadline)
+                for seed in range(self.workers)
+            }
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    if result and (best is None or result[0] < best[0]):
+                        best = result
+                if best and best[0] <= root_bound:
+                    break
+                if time.time() < deadline:
+                    # A worker finished early, so it went through the whole
+                    # search tree, which the others only visit in another order:
+                    # nothing better than its result is left to find.
+                    break
+        finally:
+            # Workers still searching stop within a few thousand nodes.
+            cancelled.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+        return best
+
+    def matches(self) -> List[Match]:
+        """
+        Finds the best rematch-free pairing within the budget, as new matches.
+
+        Falls back to the matching engine (which allows rematches as a last
+        resort) if no rematch-free pairing was found in time.
+
+        Returns:
+            List[Match]: The new round's matches, in board order.
+        """
+        bye, ranked = self.engine.allocate_bye(self.engine.ranked())
+        result = self.search(*self.encode(ranked))
+        if result is None:
+            return self.engine.to_matches(self.engine.pair(ranked), bye)
+
+        _, partner = result
+        pairs = [(ranked[i], ranked[j]) for i, j in enumerate(partner) if i < j]
+        return self.engine.to_matches(pairs, bye)
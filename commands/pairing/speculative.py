@@ -0,0 +1,215 @@
+import itertools
+import threading
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from models import Match, Tournament
+from models.match import PLAYER1, PLAYER2, DRAW
+
+
+Outcome = Tuple
+Pairer = Callable[[Tournament, dict[str, float]], List[Match]]
+
+
+class SpeculativePairing:
+    """
+    Precomputes the next round's pairings while the last games are still being played.
+
+    Once a round has at most MAX_PENDING unfinished games, a background thread
+    pairs the next round for each possible combination of their results, most
+    expected first (the higher-scored player winning, then a draw, then an
+    upset). Every pairing is stored under a key made of the round's results
+    and the active registrants, so advancing the round only has to look up the
+    actual outcome. A key that was never computed (for example after a
+    withdrawal) is simply a miss, and the round is paired as usual.
+
+    The thread pairs a snapshot of the tournament, never the live one. A new
+    speculation on the same round waits for the one it replaces to finish its
+    pairing in progress before taking over its results, and `take` waits for
+    the thread, so no pairing outlives the round it was computed for.
+
+    Attributes:
+        tournament (Tournament): Snapshot of the tournament the pairings are computed on.
+        key_prefix (tuple): Round index and active registrants the pairings assume.
+        scores (dict[str, float]): Points by chess ID, excluding unfinished games.
+        winners (List[Optional[str]]): Result of each match of the round so far.
+        pending (List[Tuple[int, str, str]]): Unfinished games as
+            (match index, player1 chess ID, player2 chess ID).
+        pair (Pairer): Pairs the next round of a tournament for the given scores.
+        results (dict[Outcome, List[Match]]): Pairings computed so far, by outcome key.
+    """
+
+    MAX_PENDING = 4
+
+    # Speculations by tournament, so results entered one at a time reuse earlier work.
+    running: dict[str, "SpeculativePairing"] = {}
+    # Guards `running`: results may be entered from the menus and the API at once.
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        tournament: Tournament,
+        pair: Pairer,
+        previous: Optional["SpeculativePairing"] = None,
+    ) -> None:
+        """
+        Snapshot the current round of a tournament.
+
+        Args:
+            tournament (Tournament): The tournament whose next round to pair.
+            pair (Pairer): Pairs the next round of a tournament for the given scores.
+            previous (Optional[SpeculativePairing]): Stopped speculation on the
+                same round, whose pairings are taken over once it has finished.
+        """
+        self.tournament = tournament.snapshot()
+        rnd = tournament.rounds[tournament.current_round_index]
+        self.key_prefix = (
+            tournament.current_round_index,
+            tuple(p["chess_id"] for p in tournament.active_players),
+        )
+        self.scores = tournament.player_scores()
+        self.winners = [m.winner if m.completed else None for m in rnd.matches]
+        self.pending = [
+            (i, m._get_chess_id(m.player1), m._get_chess_id(m.player2))
+            for i, m in enumerate(rnd.matches)
+            if not m.completed
+        ]
+        self.pair = pair
+        self.results: dict[Outcome, List[Match]] = {}
+        self._previous = previous
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def _tournament_key(tournament: Tournament) -> str:
+        return str(tournament.filepath or tournament.name)
+
+    @staticmethod
+    def outcome_key(tournament: Tournament) -> Outcome:
+        """
+        Gets the key of a tournament's current round outcome.
+
+        Args:
+            tournament (Tournament): The tournament.
+
+        Returns:
+            Outcome: Round index, active registrants and results of the round.
+        """
+        rnd = tournament.rounds[tournament.current_round_index]
+        return (
+            tournament.current_round_index,
+            tuple(p["chess_id"] for p in tournament.active_players),
+            tuple(m.winner if m.completed else None for m in rnd.matches),
+        )
+
+    @classmethod
+    def start(cls, tournament: Tournament, pair: Pairer) -> None:
+        """
+        Starts (or restarts) speculation if the current round is mostly complete.
+
+        Pairings computed by a previous speculation on the same round are kept.
+        Nothing waits here: the new thread waits for the previous one.
+
+        Args:
+            tournament (Tournament): The tournament whose next round to pair.
+            pair (Pairer): Pairs the next round for the given scores.
+        """
+        index = tournament.current_round_index
+        if (
+            tournament.is_complete
+            or not 0 <= index < len(tournament.rounds)
+            or index + 1 >= tournament.num_rounds
+        ):
+            return
+        pending = sum(not m.completed for m in tournament.rounds[index].matches)
+        if pending > cls.MAX_PENDING:
+            return
+
+        key = cls._tournament_key(tournament)
+        with cls._lock:
+            previous = cls.running.pop(key, None)
+            if previous:
+                previous.stop()
+            speculation = cls(tournament, pair, previous)
+            cls.running[key] = speculation
+        speculation._thread.start()
+
+    @classmethod
+    def take(cls, tournament: Tournament) -> Optional[List[Match]]:
+        """
+        Stops speculation on a tournament and gets the pairing for its actual outcome.
+
+        Waits for the pairing in progress, if any, to finish. The pairings were
+        computed on a snapshot: the matches returned hold the tournament's own
+        registrants.
+
+        Args:
+            tournament (Tournament): The tournament being advanced.
+
+        Returns:
+            Optional[List[Match]]: The precomputed matches, or None on a miss.
+        """
+        with cls._lock:
+            speculation = cls.running.pop(cls._tournament_key(tournament), None)
+        if speculation is None:
+            return None
+        speculation.stop()
+        speculation._thread.join()
+        matches = speculation.results.get(cls.outcome_key(tournament))
+        if matches is None:
+            return None
+
+        players = {p["chess_id"]: p for p in tournament.players}
+        return [
+            Match(
+                player1=players[m._get_chess_id(m.player1)],
+                player2=None if m.is_bye else players[m._get_chess_id(m.player2)],
+                winner=m.winner,
+                completed=m.completed,
+            )
+            for m in matches
+        ]
+
+    def stop(self) -> None:
+        """Asks the background thread to stop after the pairing in progress."""
+        self._stop.set()
+
+    def outcomes(self) -> Iterator[Tuple[Outcome, dict[str, float]]]:
+        """
+        Enumerates the possible outcomes of the unfinished games, most expected first.
+
+        Yields:
+            Tuple[Outcome, dict[str, float]]: Each outcome's key and the scores it gives.
+        """
+        choices = []
+        for _, cid1, cid2 in self.pending:
+            if self.scores.get(cid1, 0.0) >= self.scores.get(cid2, 0.0):
+                choices.append((PLAYER1, DRAW, PLAYER2))
+            else:
+                choices.append((PLAYER2, DRAW, PLAYER1))
+
+        combos = sorted(
+            itertools.product(range(3), repeat=len(choices)), key=lambda c: sum(c)
+        )
+        points = {PLAYER1: (1.0, 0.0), PLAYER2: (0.0, 1.0), DRAW: (0.5, 0.5)}
+        for combo in combos:
+            winners = self.winners[:]
+            scores = dict(self.scores)
+            for (index, cid1, cid2), options, pick in zip(self.pending, choices, combo):
+                winner = options[pick]
+                winners[index] = winner
+                scores[cid1] += points[winner][0]
+                scores[cid2] += points[winner][1]
+            yield self.key_prefix + (tuple(winners),), scores
+
+    def _run(self) -> None:
+        previous, self._previous = self._previous, None
+        if previous is not None:
+            previous._thread.join()
+            if previous.key_prefix[0] == self.key_prefix[0]:
+                self.results.update(previous.results)
+
+        for key, scores in self.outcomes():
+            if self._stop.is_set():
+                return
+            if key not in self.results:
+                self.results[key] = self.pair(self.tournament, scores)
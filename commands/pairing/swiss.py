@@ -0,0 +1,244 @@
+import random
+from typing import List, Optional, Tuple
+
+from models import Match, PairingHistory, Tournament
+
+from .blossom import max_weight_matching
+
+
+# Edge weights are integers so the matching runs in exact arithmetic.
+# A rematch costs more than any combination of score differences in a window,
+# so one is only chosen when every alternative is also a rematch. Between
+# equal-scored players, a small cost on the distance in the (shuffled) ranking
+# keeps pairs local, which lets each window commit most of its players.
+RANK_COST = 1
+SCORE_COST = 10**4
+REMATCH_COST = 10**9
+
+
+class SwissPairing:
+    """
+    Pairs one Swiss round as a maximum-weight matching.
+
+    Players are ranked by score, with ties broken at random. Every possible
+    pairing gets a weight that penalizes the squared score difference and, much
+    more heavily, a rematch. The heaviest perfect matching then gives the round.
+    Rematches are looked up in the tournament's opponent bitsets, and white goes
+    to whichever player of a pair has had white less often.
+
+    In an odd field, the bye goes to the lowest-ranked player with the fewest
+    byes so far, found with one pass up the ranking over the bye history.
+
+    To scale to large fields, the ranking is matched in overlapping windows:
+    each window also sees the next `lookahead` players, but only pairs made
+    entirely inside the window are kept. Players left over float down into
+    the next window, so a bracket that cannot be paired without a rematch
+    can still borrow opponents from the bracket below it.
+
+    Attributes:
+        players (List[dict]): Tournament registrants to pair.
+        scores (dict[str, float]): Points by chess ID.
+        history (PairingHistory): Opponent and colour history of the registrants.
+        rng (random.Random): Source of randomness for tie-breaking.
+        window (int): Number of players committed per matching.
+        lookahead (int): Extra players each matching may consider.
+    """
+
+    WINDOW = 16
+    LOOKAHEAD = 8
+
+    def __init__(
+        self,
+        players: List[dict],
+        scores: dict[str, float],
+        history: PairingHistory,
+        rng: Optional[random.Random] = None,
+        window: int = WINDOW,
+        lookahead: int = LOOKAHEAD,
+    ) -> None:
+        """
+        Initialize the pairing engine.
+
+        Args:
+            players (List[dict]): Tournament registrants to pair.
+            scores (dict[str, float]): Points by chess ID.
+            history (PairingHistory): Opponent and colour history of the registrants.
+            rng (Optional[random.Random]): Source of randomness for tie-breaking.
+            window (int): Number of players committed per matching.
+            lookahead (int): Extra players each matching may consider.
+        """
+        self.players = players
+        self.scores = scores
+        self.history = history
+        self.rng = rng or random.Random()
+        self.window = window
+        self.lookahead = lookahead
+        self._ranking: Optional[List[dict]] = None
+
+    @classmethod
+    def from_tournament(
+        cls,
+        tournament: Tournament,
+        rng: Optional[random.Random] = None,
+        scores: Optional[dict[str, float]] = None,
+    ) -> "SwissPairing":
+        """
+        Builds a pairing engine for the next round of a tournament.
+
+        Args:
+            tournament (Tournament): The tournament to pair.
+            rng (Optional[random.Random]): Source of randomness for tie-breaking.
+            scores (Optional[dict[str, float]]): Points to pair on, instead of
+                the tournament's current standings.
+
+        Returns:
+            SwissPairing: The engine, ready to pair.
+        """
+        return cls(
+            players=tournament.active_players,
+            scores=tournament.player_scores() if scores is None else scores,
+            history=tournament.history,
+            rng=rng,
+        )
+
+    def ranked(self) -> List[dict]:
+        """
+        Ranks players by descending score, in random order within equal scores.
+
+        The order is drawn once: later calls (e.g. by a PairingSearch after the
+        matching) get the same ranking, and the generator is consumed once, so
+        the same seed always gives the same pairings.
+
+        Returns:
+            List[dict]: The ranked registrants.
+        """
+        if self._ranking is None:
+            players = self.players[:]
+            self.rng.shuffle(players)
+            players.sort(
+                key=lambda p: self.scores.get(p["chess_id"], 0.0), reverse=True
+            )
+            self._ranking = players
+        return self._ranking[:]
+
+    def allocate_bye(self, ranked: List[dict]) -> Tuple[Optional[dict], List[dict]]:
+        """
+        Picks the bye for an odd field.
+
+        Args:
+            ranked (List[dict]): The ranked registrants.
+
+        Returns:
+            Tuple[Optional[dict], List[dict]]: The registrant receiving the bye
+            (None for an even field) and the registrants left to pair.
+        """
+        if len(ranked) % 2 == 0:
+            return None, ranked
+
+        byes = self.history.byes
+        chosen = len(ranked) - 1
+        fewest = None
+        for i in range(len(ranked) - 1, -1, -1):
+            count = byes[self.history.position(ranked[i]["chess_id"])]
+            if fewest is None or count < fewest:
+                chosen, fewest = i, count
+                if count == 0:
+                    break
+        rest = ranked[:]
+        return rest.pop(chosen), rest
+
+    def _match(self, block: List[dict]) -> List[Tuple[int, int]]:
+        """
+        Finds the maximum-weight pairing of one block of ranked players.
+
+        Args:
+            block (List[dict]): Consecutive ranked registrants.
+
+        Returns:
+            List[Tuple[int, int]]: Pairs of positions in the block, higher-ranked first.
+        """
+        ids = [p["chess_id"] for p in block]
+        points = [round(self.scores.get(cid, 0.0) * 2) for cid in ids]
+        positions = [self.history.position(cid) for cid in ids]
+        opponents = [self.history.opponents[pos] for pos in positions]
+        edges = []
+        for i in range(len(block)):
+            for j in range(i + 1, len(block)):
+                diff = points[i] - points[j]
+                cost = SCORE_COST * diff * diff + RANK_COST * (j - i)
+                if opponents[i] >> positions[j] & 1:
+                    cost += REMATCH_COST
+                edges.append((i, j, 2 * (REMATCH_COST - cost)))
+
+        mate = max_weight_matching(edges, max_cardinality=True)
+        return [(i, m) for i, m in enumerate(mate) if i < m]
+
+    def pair(self, ranked: List[dict]) -> List[Tuple[dict, dict]]:
+        """
+        Pairs every player of an even field.
+
+        Args:
+            ranked (List[dict]): The ranked registrants, without the bye.
+
+        Returns:
+            List[Tuple[dict, dict]]: Pairs of registrants, higher-ranked first,
+            in board order.
+        """
+        pending = ranked
+        pairs: List[Tuple[dict, dict]] = []
+
+        while len(pending) > 1:
+            block = pending[: self.window + self.lookahead]
+            matched = self._match(block)
+
+            if len(block) < len(pending):
+                committed = [(i, j) for i, j in matched if j < self.window]
+                if committed:
+                    matched = committed
+
+            paired = {i for pair in matched for i in pair}
+            pairs.extend((block[i], block[j]) for i, j in sorted(matched))
+            unpaired = [p for i, p in enumerate(block) if i not in paired]
+            taken = len(block)
+            pending = unpaired + pending[taken:]
+
+            if not matched:
+                break
+
+        return pairs
+
+    def to_matches(
+        self, pairs: List[Tuple[dict, dict]], bye: Optional[dict] = None
+    ) -> List[Match]:
+        """
+        Wraps pairs of registrants into new matches, allocating colours.
+
+        The player who has had white less often becomes player1 (white);
+        on a tie, the higher-ranked player does. The bye, if any, comes last.
+
+        Args:
+            pairs (List[Tuple[dict, dict]]): Pairs of registrants, higher-ranked first.
+            bye (Optional[dict]): The registrant receiving the bye, if any.
+
+        Returns:
+            List[Match]: The new matches, in the same order.
+        """
+        balance = self.history.colour_balance
+        matches = []
+        for p1, p2 in pairs:
+            if balance(p1["chess_id"]) > balance(p2["chess_id"]):
+                p1, p2 = p2, p1
+            matches.append(Match(player1=p1, player2=p2))
+        if bye is not None:
+            matches.append(Match.bye(bye))
+        return matches
+
+    def matches(self) -> List[Match]:
+        """
+        Pairs every player and wraps the pairs into new matches.
+
+        Returns:
+            List[Match]: The new round's matches, in board order.
+        """
+        bye, ranked = self.allocate_bye(self.ranked())
+        return self.to_matches(self.pair(ranked), bye)
@@ -1,12 +1,76 @@
 import html
 from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
 import webbrowser
 
-from models import Tournament
-from models.match import PLAYER1, PLAYER2, DRAW
+from models import Round, Tournament
+from models.match import PLAYER1, PLAYER2, DRAW, BYE_POINTS
 
 from .base import BaseCommand
 from .context import Context
+from .report_cache import ReportCache, content_key
+
+
+WRITE_BUFFER = 1 << 16
+
+# Part of every cache key: bump it when the markup of a fragment changes.
+CACHE_VERSION = 1
+
+REPORT_HEAD = """
+            <html>
+            <head>
+            <style>
+                body {
+                    font-family: "Times New Roman", serif;
+                    font-size: 12pt;
+                }
+                h1 {
+                    font-size: 20pt;
+                    text-align: center;
+                }
+                h2 {
+                    font-size: 16pt;
+                    text-align: center;
+                }
+                h4 {
+                    font-size: 14pt;
+                    text-align: center;
+                }
+                .player-table {
+                    width: 100%;
+                    border-collapse: collapse;
+                    margin-bottom: 40px;
+                }
+                .player-table td {
+                    vertical-align: top;
+                    text-align: center;
+                    padding: 10px;
+                }
+                .round-table {
+                    width: 100%;
+                    border-collapse: collapse;
+                    margin-bottom: 40px;
+                }
+                .round-table td {
+                    width: 33%;
+                    vertical-align: top;
+                    padding: 15px;
+                    border: none;
+                }
+                .print-instruction {
+                    text-align: center;
+                    font-style: italic;
+                    margin-top: 20px;
+                }
+            </style>
+            </head>
+            <body>
+"""
+
+REPORT_TAIL = """
+            </body>
+            </html>
+            """
 
 
 class TournamentReportCmd(BaseCommand):
@@ -15,17 +79,22 @@ class TournamentReportCmd(BaseCommand):
 
     The report includes player standings and round-by-round match results.
     Users can print or save the report as a PDF using their browser.
+
+    Completed rounds and the players table are cached on disk by content, so
+    regenerating a report only renders what changed, and an unchanged report
+    is not written again.
     """
 
     def __init__(self, tournament: Tournament):
         self.tournament = tournament
 
-    def build_players_info(self) -> str:
+    def standings(self) -> Tuple[List[dict], dict[str, float]]:
         """
-        Builds a 2-column HTML table displaying player info and scores.
+        Ranks the registrants by score.
 
         Returns:
-            str: The HTML string representing the players table.
+            Tuple[List[dict], dict[str, float]]: Registrants by descending score,
+            and points by chess ID.
         """
         scores = self.tournament.player_scores()
         players = sorted(
@@ -33,16 +102,32 @@ class TournamentReportCmd(BaseCommand):
             key=lambda player: scores.get(player["chess_id"], 0.0),
             reverse=True,
         )
+        return players, scores
 
-        rows = []
+    def iter_players_info(
+        self, standings: Optional[Tuple[List[dict], dict[str, float]]] = None
+    ) -> Iterator[str]:
+        """
+        Yields a 2-column HTML table displaying player info and scores, a row at a time.
+
+        Args:
+            standings (Optional[Tuple]): Precomputed result of standings().
+
+        Yields:
+            str: Fragments of the players table.
+        """
+        players, scores = standings or self.standings()
+
+        yield '<table class="player-table">'
         for i in range(0, len(players), 2):
             row_cells = []
             for j in range(2):
                 if i + j < len(players):
                     p = players[i + j]
+                    status = " (withdrawn)" if p.get("withdrawn") else ""
                     cell = f"""
                                 <td>
-                                    <strong>{html.escape(p['name'])}</strong><br>
+                                    <strong>{html.escape(p['name'])}</strong>{status}<br>
                                     From {html.escape(p['club_name'])}<br>
                                     Tournament points: {scores.get(p['chess_id'], 0.0)}
                                 </td>
@@ -50,31 +135,45 @@ class TournamentReportCmd(BaseCommand):
                 else:
                     cell = "<td></td>"
                 row_cells.append(cell)
-            rows.append("<tr>" + "".join(row_cells) + "</tr>")
-
-        return f'<table class="player-table">{"".join(rows)}</table>'
+            yield "<tr>" + "".join(row_cells) + "</tr>"
+        yield "</table>"
 
-    def build_rounds_info(self) -> str:
+    def build_players_info(self) -> str:
         """
-        Creates headers for each round including "Final Round Match Results" for the last round.
-        Builds a 3-column HTML table displaying match outcomes.
+        Builds a 2-column HTML table displaying player info and scores.
 
         Returns:
-            str: The HTML string representing the match results.
+            str: The HTML string representing the players table.
+        """
+        return "".join(self.iter_players_info())
+
+    def iter_round_info(self, idx: int, rnd: Round) -> Iterator[str]:
+        """
+        Yields the header and 3-column match table of one round, a row at a time.
+
+        Args:
+            idx (int): Index of the round in the tournament.
+            rnd (Round): The round.
+
+        Yields:
+            str: Fragments of the round's results.
         """
-        rounds_html = []
         total_rounds = self.tournament.num_rounds
+        if idx == total_rounds - 1:
+            yield "<h2>Final Round Match Results</h2>"
+        else:
+            yield f"<h2>Round {idx + 1} of {total_rounds} Match Results</h2>"
 
-        for idx, rnd in enumerate(self.tournament.rounds):
-            header = (
-                "<h2>Final Round Match Results</h2>"
-                if idx == total_rounds - 1
-                else f"<h2>Round {idx + 1} of {total_rounds} Match Results</h2>"
-            )
+        yield '<table class="round-table">'
+        match_cells = []
+        for match in rnd.matches:
+            p1 = html.escape(match._get_name(match.player1))
 
-            match_cells = []
-            for match in rnd.matches:
-                p1 = html.escape(match._get_name(match.player1))
+            if match.is_bye:
+                match_cells.append(
+                    f"<td>{p1}<br><em>Bye ({BYE_POINTS} point)</em></td>"
+                )
+            else:
                 p2 = html.escape(match._get_name(match.player2))
 
                 if match.winner == DRAW:
@@ -88,84 +187,200 @@ class TournamentReportCmd(BaseCommand):
 
                 match_cells.append(f"<td>{content}</td>")
 
-            rows = [
-                "<tr>" + "".join(match_cells[i : i + 3]) + "</tr>"
-                for i in range(0, len(match_cells), 3)
-            ]
-            round_table = f'<table class="round-table">{"".join(rows)}</table>'
-            rounds_html.append(header + round_table)
+            if len(match_cells) == 3:
+                yield "<tr>" + "".join(match_cells) + "</tr>"
+                match_cells = []
+        if match_cells:
+            yield "<tr>" + "".join(match_cells) + "</tr>"
+        yield "</table>"
 
-        return "".join(rounds_html)
+    def iter_rounds_info(self) -> Iterator[str]:
+        """
+        Yields the results of every round, with "Final Round Match Results" for the last round.
 
-    def build_html_report(self) -> str:
+        Yields:
+            str: Fragments of the match results.
         """
-        Builds the full HTML report as a string with embedded styles and tournament data.
+        for idx, rnd in enumerate(self.tournament.rounds):
+            yield from self.iter_round_info(idx, rnd)
+
+    def build_rounds_info(self) -> str:
+        """
+        Creates headers for each round including "Final Round Match Results" for the last round.
+        Builds a 3-column HTML table displaying match outcomes.
 
         Returns:
-            str: The complete HTML string of the report.
+            str: The HTML string representing the match results.
+        """
+        return "".join(self.iter_rounds_info())
+
+    def build_title(self) -> str:
         """
-        rounds_html = self.build_rounds_info()
-        player_html = self.build_players_info()
+        Builds the report's title block: name, venue and dates.
 
+        Returns:
+            str: The HTML string of the title block.
+        """
         return f"""
-            <html>
-            <head>
-            <style>
-                body {{
-                    font-family: "Times New Roman", serif;
-                    font-size: 12pt;
-                }}
-                h1 {{
-                    font-size: 20pt;
-                    text-align: center;
-                }}
-                h2 {{
-                    font-size: 16pt;
-                    text-align: center;
-                }}
-                h4 {{
-                    font-size: 14pt;
-                    text-align: center;
-                }}
-                .player-table {{
-                    width: 100%;
-                    border-collapse: collapse;
-                    margin-bottom: 40px;
-                }}
-                .player-table td {{
-                    vertical-align: top;
-                    text-align: center;
-                    padding: 10px;
-                }}
-                .round-table {{
-                    width: 100%;
-                    border-collapse: collapse;
-                    margin-bottom: 40px;
-                }}
-                .round-table td {{
-                    width: 33%;
-                    vertical-align: top;
-                    padding: 15px;
-                    border: none;
-                }}
-                .print-instruction {{
-                    text-align: center;
-                    font-style: italic;
-                    margin-top: 20px;
-                }}
-            </style>
-            </head>
-            <body>
                 <h1>♛♞♝ <strong>{html.escape(self.tournament.name)}</strong> ♝♞♛</h1>
                 <h2>at {html.escape(self.tournament.venue)}</h2>
                 <h4>{self.tournament.start_date.strftime('%B %d, %Y')}
                 to {self.tournament.end_date.strftime('%B %d, %Y')}</h4>
                 <h2>Players</h2>
-                {player_html}
-                {rounds_html}
-            </body>
-            </html>
-            """
+                """
+
+    def iter_html_report(self) -> Iterator[str]:
+        """
+        Yields the full HTML report, with embedded styles and tournament data, in fragments.
+
+        Only one row of a table is built at a time, so the memory used does not
+        grow with the size of the tournament.
+
+        Yields:
+            str: Consecutive fragments of the HTML document.
+        """
+        yield REPORT_HEAD
+        yield self.build_title()
+        yield from self.iter_players_info()
+        yield from self.iter_rounds_info()
+        yield REPORT_TAIL
+
+    def players_key(self, standings: Tuple[List[dict], dict[str, float]]) -> str:
+        """
+        Gets the cache key of the players table: everything it shows, in order.
+
+        Args:
+            standings (Tuple): Result of standings().
+
+        Returns:
+            str: The table's content key.
+        """
+        players, scores = standings
+        return content_key(
+            [
+                CACHE_VERSION,
+                [
+                    [
+                        p["name"],
+                        p["club_name"],
+                        bool(p.get("withdrawn")),
+                        scores.get(p["chess_id"], 0.0),
+                    ]
+                    for p in players
+                ],
+            ]
+        )
+
+    def round_key(self, idx: int, rnd: Round) -> str:
+        """
+        Gets the cache key of a round's results: its position, names and results.
+
+        Args:
+            idx (int): Index of the round in the tournament.
+            rnd (Round): The round.
+
+        Returns:
+            str: The round's content key.
+        """
+        matches = [
+            [
+                match._get_name(match.player1),
+                None if match.is_bye else match._get_name(match.player2),
+                match.winner,
+            ]
+            for match in rnd.matches
+        ]
+        return content_key([CACHE_VERSION, idx, self.tournament.num_rounds, matches])
+
+    def _iter_cached_report(
+        self,
+        cache: ReportCache,
+        standings: Tuple[List[dict], dict[str, float]],
+        players_key: str,
+        round_keys: List[str],
+    ) -> Iterator[str]:
+        yield REPORT_HEAD
+        yield self.build_title()
+        yield from cache.fragments(
+            players_key, lambda: self.iter_players_info(standings)
+        )
+        for idx, (rnd, key) in enumerate(zip(self.tournament.rounds, round_keys)):
+            if all(match.completed for match in rnd.matches):
+                yield from cache.fragments(
+                    key, lambda idx=idx, rnd=rnd: self.iter_round_info(idx, rnd)
+                )
+            else:
+                yield from self.iter_round_info(idx, rnd)
+        yield REPORT_TAIL
+
+    def build_html_report(self) -> str:
+        """
+        Builds the full HTML report as a string with embedded styles and tournament data.
+
+        Returns:
+            str: The complete HTML string of the report.
+        """
+        return "".join(self.iter_html_report())
+
+    def write_report(self, filepath: Path, cache: Optional[ReportCache] = None) -> bool:
+        """
+        Streams the HTML report into a file through a write buffer.
+
+        With a cache, the players table is keyed on the standings and each
+        completed round on its matches. The round in progress is always
+        rendered, and nothing is written if the report's content is unchanged.
+
+        Args:
+            filepath (Path): Path of the HTML file to write.
+            cache (Optional[ReportCache]): The tournament's fragment cache.
+
+        Returns:
+            bool: True if the file was written, False if it was already up to date.
+        """
+        if cache is None:
+            fragments = self.iter_html_report()
+        else:
+            standings = self.standings()
+            players_key = self.players_key(standings)
+            round_keys = [
+                self.round_key(idx, rnd)
+                for idx, rnd in enumerate(self.tournament.rounds)
+            ]
+            key = content_key(
+                [self.build_title(), players_key, round_keys, REPORT_HEAD, REPORT_TAIL]
+            )
+            if cache.is_current(filepath, key):
+                return False
+            fragments = self._iter_cached_report(
+                cache, standings, players_key, round_keys
+            )
+
+        with open(filepath, "w", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+            for fragment in fragments:
+                f.write(fragment)
+
+        if cache is not None:
+            completed = [
+                k
+                for k, rnd in zip(round_keys, self.tournament.rounds)
+                if all(m.completed for m in rnd.matches)
+            ]
+            cache.commit(key, [players_key] + completed)
+        return True
+
+    def report_location(self, reports_dir: Path) -> Tuple[Path, ReportCache]:
+        """
+        Gets where the tournament's report and fragment cache are kept.
+
+        Args:
+            reports_dir (Path): Folder holding every report.
+
+        Returns:
+            Tuple[Path, ReportCache]: The report file and the tournament's cache.
+        """
+        safe_name = self.tournament.name.replace(" ", "_")
+        filepath = reports_dir / f"{safe_name}_report.html"
+        return filepath, ReportCache(reports_dir / "cache" / safe_name)
 
     def execute(self) -> Context:
         """
@@ -174,20 +389,20 @@ class TournamentReportCmd(BaseCommand):
         Returns:
             Context: Returns to the tournament view screen.
         """
-        html = self.build_html_report()
         reports_dir = Path("data/reports")
         reports_dir.mkdir(exist_ok=True)
 
-        safe_name = self.tournament.name.replace(" ", "_")
-        filepath = reports_dir / f"{safe_name}_report.html"
-
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(html)
+        filepath, cache = self.report_location(reports_dir)
+        written = self.write_report(filepath, cache)
 
         webbrowser.open(filepath.resolve().as_uri())
 
         return Context(
             "tournament-view",
             tournament=self.tournament,
-            message="Tournament report has been opened in your browser.",
+            message=(
+                "Tournament report has been opened in your browser."
+                if written
+                else "Tournament report is up to date and has been opened in your browser."
+            ),
         )
@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+import instrumentation
+
+
+CHUNK_SIZE = 1 << 16
+
+
+def content_key(content) -> str:
+    """
+    Hashes JSON-serializable content into a cache key.
+
+    Args:
+        content: The content a fragment is rendered from.
+
+    Returns:
+        str: The hex SHA-256 digest of the content's canonical JSON form.
+    """
+    data = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class ReportCache:
+    """
+    On-disk cache of one tournament's report fragments, keyed by content hash.
+
+    Each fragment is stored in its own file named after its key. The key of the
+    whole report is stored alongside, so an unchanged report need not be
+    written again.
+
+    Attributes:
+        directory (Path): Folder holding the tournament's cached fragments.
+    """
+
+    KEY_FILE = "report.key"
+
+    def __init__(self, directory: Path) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            directory (Path): Folder holding the tournament's cached fragments.
+        """
+        self.directory = directory
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.html"
+
+    def fragments(self, key: str, render: Callable[[], Iterable[str]]) -> Iterator[str]:
+        """
+        Yields a cached fragment, rendering and storing it on a miss.
+
+        Args:
+            key (str): The fragment's content key.
+            render (Callable[[], Iterable[str]]): Renders the fragment on a miss.
+
+        Yields:
+            str: The fragment, in pieces.
+        """
+        path = self._path(key)
+        cached = path.exists()
+        metrics = instrumentation.metrics()
+        if metrics is not None:
+            metrics.cache_lookup("report-fragments", cached)
+        if cached:
+            with open(path, "r", encoding="utf-8") as f:
+                while chunk := f.read(CHUNK_SIZE):
+                    yield chunk
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        partial = path.with_suffix(".tmp")
+        with open(partial, "w", encoding="utf-8", buffering=CHUNK_SIZE) as f:
+            for fragment in render():
+                f.write(fragment)
+                yield fragment
+        os.replace(partial, path)
+
+    def is_current(self, report: Path, key: str) -> bool:
+        """
+        Checks whether a report file was written from the given content.
+
+        Args:
+            report (Path): The report file.
+            key (str): The key of the report's content.
+
+        Returns:
+            bool: True if the file exists and was last written with this key.
+        """
+        key_file = self.directory / self.KEY_FILE
+        return report.exists() and key_file.exists() and key_file.read_text() == key
+
+    def commit(self, key: str, used: Iterable[str]) -> None:
+        """
+        Records the key of the report just written and drops unused fragments.
+
+        Args:
+            key (str): The key of the report's content.
+            used (Iterable[str]): Keys of the fragments the report is made of.
+        """
+        keep = {self._path(k).name for k in used}
+        for path in self.directory.glob("*.html"):
+            if path.name not in keep:
+                path.unlink()
+        (self.directory / self.KEY_FILE).write_text(key)
@@ -1,10 +1,10 @@
-from random import shuffle
 from typing import List
 
 from models import Match, Round, Tournament
 
 from .base import BaseCommand
 from .context import Context
+from .events import PAIRINGS, publish
 
 
 class StartTournamentCmd(BaseCommand):
@@ -37,23 +37,29 @@ class StartTournamentCmd(BaseCommand):
         """
         Randomly shuffle players and generate first-round matchups.
 
+        The shuffle uses the tournament's round 1 generator, so the same seed
+        always gives the same first round. In an odd field, the last player
+        after shuffling receives a bye.
+
         Returns:
-            List[Match]: A list of randomized matchups.
+            List[Match]: A list of randomized matchups (and the bye, last).
 
         Raises:
-            ValueError: If the number of players is not even.
+            ValueError: If there are fewer than two players.
         """
-        players = self.tournament.players[:]
+        players = self.tournament.active_players
 
-        if len(players) % 2 != 0:
-            raise ValueError("Tournament must have an even number of players.")
+        if len(players) < 2:
+            raise ValueError("Tournament must have at least two players.")
 
-        shuffle(players)
+        self.tournament.rng_for_round(1).shuffle(players)
 
         matches = [
             Match(player1=players[i], player2=players[i + 1])
-            for i in range(0, len(players), 2)
+            for i in range(0, len(players) - 1, 2)
         ]
+        if len(players) % 2 != 0:
+            matches.append(Match.bye(players[-1]))
         return matches
 
     def execute(self) -> Context:
@@ -74,9 +80,10 @@ class StartTournamentCmd(BaseCommand):
             return Context("tournament-view", tournament=self.tournament)
 
         first_round = Round(round_number=1, matches=matches)
-        self.tournament.rounds.append(first_round)
+        self.tournament.add_round(first_round)
         self.tournament.current_round_index = 0
         self.tournament.save()
+        publish(self.tournament, PAIRINGS)
 
         print("Tournament started. Round 1 matches created.")
         return Context("tournament-view", tournament=self.tournament)
@@ -0,0 +1,49 @@
+from models import Tournament
+
+from .base import BaseCommand
+from .context import Context
+
+
+class WithdrawPlayerCmd(BaseCommand):
+    """
+    Command to withdraw a registrant from a tournament in progress.
+
+    The registrant keeps the points already earned but is left out of the
+    pairings of every following round.
+
+    Attributes:
+        tournament (Tournament): The tournament being updated.
+        chess_id (str): Chess ID of the withdrawing registrant.
+    """
+
+    def __init__(self, tournament: Tournament, chess_id: str) -> None:
+        """
+        Initialize the command.
+
+        Args:
+            tournament (Tournament): The tournament being updated.
+            chess_id (str): Chess ID of the withdrawing registrant.
+        """
+        self.tournament = tournament
+        self.chess_id = chess_id
+
+    def execute(self) -> Context:
+        """
+        Marks the registrant as withdrawn and saves the tournament.
+
+        Returns:
+            Context: Updated context returning to the tournament view.
+        """
+        try:
+            player = self.tournament.withdraw(self.chess_id)
+        except ValueError as e:
+            return Context(
+                "tournament-view", tournament=self.tournament, message=str(e)
+            )
+
+        self.tournament.save()
+        return Context(
+            "tournament-view",
+            tournament=self.tournament,
+            message=f"{player['name']} has withdrawn and will not be paired in later rounds.",
+        )
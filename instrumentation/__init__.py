@@ -0,0 +1,60 @@
+"""
+Measurements of the application at work.
+
+Everything is off by default. The hooks (`active`, `metrics`, `saving`) are
+imported at start-up and cost next to nothing until recording or collection
+starts; the recorder and the metrics registry are imported from their modules
+the first time they are used.
+"""
+
+import importlib
+
+from .hooks import active, metrics, saving
+
+# Exported name -> module defining it, for the names imported on first use.
+_EXPORTS = {
+    "Histogram": ".latency",
+    "Metrics": ".prometheus",
+    "Recorder": ".latency",
+    "SessionRecorder": ".session",
+    "collecting": ".prometheus",
+    "recording": ".latency",
+    "replay_session": ".session",
+}
+
+__all__ = [
+    "Histogram",
+    "Metrics",
+    "Recorder",
+    "SessionRecorder",
+    "active",
+    "collecting",
+    "metrics",
+    "recording",
+    "replay_session",
+    "saving",
+]
+
+
+def __getattr__(name: str):
+    """
+    Imports an exported name on first access.
+
+    Args:
+        name (str): The attribute looked up on the package.
+
+    Returns:
+        The exported object, cached on the package for later lookups.
+
+    Raises:
+        AttributeError: If the name is not exported.
+    """
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
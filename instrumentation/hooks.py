@@ -0,0 +1,111 @@
+"""
+The hooks the application calls, whether or not anything is recorded.
+
+They are imported at start-up by the models and commands, so this module only
+uses modules Python has already loaded: while nothing is recorded, a hook is
+one function call returning None (or a shared do-nothing context manager).
+"""
+
+import os
+import time
+
+_recorder = None
+_metrics = None
+
+
+class _Nothing:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOTHING = _Nothing()
+
+
+class _TimedSave:
+    def __init__(self, filepath, kind: str) -> None:
+        self.filepath = filepath
+        self.kind = kind
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        try:
+            size = os.stat(self.filepath).st_size
+        except OSError:
+            size = 0
+        if _recorder is not None:
+            _recorder.saved(elapsed, size)
+        if _metrics is not None:
+            _metrics.saved(self.kind, elapsed, size)
+        return False
+
+
+def active():
+    """
+    Gets the installed recorder.
+
+    Returns:
+        Optional[Recorder]: The recorder, or None when not recording.
+    """
+    return _recorder
+
+
+def install(recorder):
+    """
+    Installs a recorder, or removes it.
+
+    Args:
+        recorder (Optional[Recorder]): The recorder, or None to stop recording.
+
+    Returns:
+        Optional[Recorder]: The recorder installed until now.
+    """
+    global _recorder
+    previous, _recorder = _recorder, recorder
+    return previous
+
+
+def metrics():
+    """
+    Gets the installed metrics.
+
+    Returns:
+        Optional[Metrics]: The metrics, or None when they are not collected.
+    """
+    return _metrics
+
+
+def install_metrics(registry):
+    """
+    Installs metrics, or removes them.
+
+    Args:
+        registry (Optional[Metrics]): The metrics, or None to stop collecting.
+
+    Returns:
+        Optional[Metrics]: The metrics installed until now.
+    """
+    global _metrics
+    previous, _metrics = _metrics, registry
+    return previous
+
+
+def saving(filepath, kind: str = "tournament"):
+    """
+    Times a file save, when recording or collecting metrics.
+
+    Args:
+        filepath (Path): The file saved; its size is read once it is written.
+        kind (str): What the file holds ("tournament", "club" or "index").
+
+    Returns:
+        A context manager around the save.
+    """
+    if _recorder is None and _metrics is None:
+        return _NOTHING
+    return _TimedSave(filepath, kind)
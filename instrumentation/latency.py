@@ -0,0 +1,329 @@
+"""
+Latency of the application's screens and commands, recorded in process.
+
+Recording is off unless a Recorder is installed (see `recording` and
+instrumentation.hooks). Once installed, each command run through
+BaseCommand.__call__ and each screen dispatched by MainApp is timed,
+with the time spent saving files and the bytes written while it ran. Time
+spent waiting at a prompt is not counted, so a screen's time is the time the
+arbiter waited for the program, not the other way round.
+"""
+
+import builtins
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from . import hooks
+
+# Upper bounds of the histogram buckets, in seconds.
+BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram:
+    """
+    Distribution of durations, counted in fixed buckets.
+
+    Attributes:
+        bounds (tuple[float, ...]): Upper bounds of the buckets, in seconds;
+            a last bucket holds everything above.
+        counts (list[int]): Number of durations in each bucket.
+        count (int): Number of durations.
+        total (float): Their sum, in seconds.
+        max (float): The longest, in seconds.
+    """
+
+    def __init__(self, bounds: tuple[float, ...] = BUCKETS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """
+        Counts a duration.
+
+        Args:
+            seconds (float): The duration.
+        """
+        bucket = 0
+        while bucket < len(self.bounds) and seconds > self.bounds[bucket]:
+            bucket += 1
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def copy(self) -> "Histogram":
+        """
+        Copies the histogram.
+
+        Returns:
+            Histogram: A histogram with the same observations.
+        """
+        other = Histogram(self.bounds)
+        other.counts = self.counts[:]
+        other.count, other.total, other.max = self.count, self.total, self.max
+        return other
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimates a quantile: the upper bound of the bucket it falls in.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The estimate in seconds, never above the longest duration.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class Stats:
+    """
+    What was recorded for one screen or command.
+
+    Attributes:
+        latency (Histogram): Its durations, prompts excluded.
+        save_time (float): Seconds spent saving files while it ran.
+        bytes_written (int): Bytes of the files it saved.
+        saves (int): Number of files it saved.
+    """
+
+    def __init__(self) -> None:
+        self.latency = Histogram()
+        self.save_time = 0.0
+        self.bytes_written = 0
+        self.saves = 0
+
+
+class Frame:
+    """A screen or command being timed."""
+
+    __slots__ = ("key", "start", "idle", "save_time", "bytes_written", "saves")
+
+    def __init__(self, key: tuple[str, str]) -> None:
+        self.key = key
+        self.start = time.perf_counter()
+        self.idle = 0.0
+        self.save_time = 0.0
+        self.bytes_written = 0
+        self.saves = 0
+
+
+class Recorder:
+    """
+    Records the latency of screens and commands.
+
+    Frames nest: a command run from a screen counts in both, and so do its
+    saves. Each thread has its own stack of frames, so commands run in worker
+    threads (e.g. by the API) are timed too.
+
+    Attributes:
+        stats (dict[tuple[str, str], Stats]): Records by (kind, name), kind
+            being "screen" or "command".
+        profile_dir (Optional[Path]): Folder the profile of every command is
+            dumped to, if profiling.
+    """
+
+    def __init__(self, profile_dir: Optional[Path] = None) -> None:
+        """
+        Initialize the recorder.
+
+        Args:
+            profile_dir (Optional[Path]): Profile every command with cProfile
+                and dump its stats to a file in this folder.
+        """
+        self.stats: dict[tuple[str, str], Stats] = {}
+        self.profile_dir = profile_dir
+        self._profiles = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self) -> list[Frame]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def run(self, kind: str, name: str, func: Callable[[], object]):
+        """
+        Runs a screen or command and records its latency.
+
+        Args:
+            kind (str): "screen" or "command".
+            name (str): The screen's or command's name.
+            func (Callable[[], object]): Runs it.
+
+        Returns:
+            Whatever func returns.
+        """
+        frame = Frame((kind, name))
+        stack = self._stack()
+        stack.append(frame)
+        try:
+            if kind == "command" and self.profile_dir is not None:
+                return self._profile(name, func)
+            return func()
+        finally:
+            elapsed = time.perf_counter() - frame.start - frame.idle
+            stack.pop()
+            with self._lock:
+                stats = self.stats.get(frame.key)
+                if stats is None:
+                    stats = self.stats[frame.key] = Stats()
+                stats.latency.observe(elapsed)
+                stats.save_time += frame.save_time
+                stats.bytes_written += frame.bytes_written
+                stats.saves += frame.saves
+
+    def latencies(self) -> dict[tuple[str, str], Histogram]:
+        """
+        Copies the latency histograms, for reading while screens keep running.
+
+        Returns:
+            dict[tuple[str, str], Histogram]: Latency by (kind, name).
+        """
+        with self._lock:
+            return {key: stats.latency.copy() for key, stats in self.stats.items()}
+
+    def _profile(self, name: str, func: Callable[[], object]):
+        import cProfile
+
+        with self._lock:
+            self._profiles += 1
+            number = self._profiles
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(func)
+        finally:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            profile.dump_stats(self.profile_dir / f"{number:04d}-{name}.prof")
+
+    def waited(self, seconds: float) -> None:
+        """
+        Leaves time spent at a prompt out of the running frames.
+
+        Args:
+            seconds (float): Time spent waiting for input.
+        """
+        for frame in self._stack():
+            frame.idle += seconds
+
+    def saved(self, seconds: float, size: int) -> None:
+        """
+        Counts a file save in the running frames.
+
+        Args:
+            seconds (float): Time the save took.
+            size (int): Bytes written.
+        """
+        for frame in self._stack():
+            frame.save_time += seconds
+            frame.bytes_written += size
+            frame.saves += 1
+
+    def summary(self) -> str:
+        """
+        Formats what was recorded as a table, slowest first.
+
+        Returns:
+            str: The table.
+        """
+        header = (
+            f"{'':<7} {'name':<28} {'runs':>5} {'mean':>8} {'p50':>8} {'p95':>8} "
+            f"{'max':>8} {'total':>9} {'saving':>9} {'written':>9}"
+        )
+        lines = ["Latency by screen and command, in ms (prompts excluded)", header]
+        rows = sorted(self.stats.items(), key=lambda item: -item[1].latency.total)
+        for (kind, name), stats in rows:
+            latency = stats.latency
+            lines.append(
+                f"{kind:<7} {name[:28]:<28} {latency.count:>5} "
+                f"{latency.total / latency.count * 1000:>8.1f} "
+                f"{latency.quantile(0.5) * 1000:>8.1f} {latency.quantile(0.95) * 1000:>8.1f} "
+                f"{latency.max * 1000:>8.1f} {latency.total * 1000:>9.1f} "
+                f"{stats.save_time * 1000:>9.1f} {format_size(stats.bytes_written):>9}"
+            )
+        if not rows:
+            lines.append("(nothing recorded)")
+        return "\n".join(lines)
+
+
+def format_size(size: int) -> str:
+    """
+    Formats a number of bytes for the summary.
+
+    Args:
+        size (int): Bytes.
+
+    Returns:
+        str: e.g. "0", "812 B", "1.2 MB".
+    """
+    if not size:
+        return "0"
+    for unit in ("B", "KB", "MB"):
+        if size < 1024 or unit == "MB":
+            return f"{size} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+@contextmanager
+def recording(profile_dir: Optional[Path] = None) -> Iterator[Recorder]:
+    """
+    Installs a recorder for the duration of a block.
+
+    Prompts (builtins.input) are timed so that their waits are left out.
+
+    Args:
+        profile_dir (Optional[Path]): Profile every command and dump its stats there.
+
+    Yields:
+        Recorder: The installed recorder.
+    """
+    recorder = Recorder(profile_dir)
+    prompt = builtins.input
+
+    def timed_input(*args):
+        start = time.perf_counter()
+        try:
+            return prompt(*args)
+        finally:
+            recorder.waited(time.perf_counter() - start)
+
+    previous = hooks.install(recorder)
+    builtins.input = timed_input
+    try:
+        yield recorder
+    finally:
+        builtins.input = prompt
+        hooks.install(previous)
@@ -0,0 +1,330 @@
+"""
+Counters of the application at work, exported in the Prometheus text format.
+
+Collection is off unless a Metrics registry is installed (see `collecting`,
+and instrumentation.hooks for what the application calls). The registry can
+then be written to a file, for node_exporter's textfile collector or any
+other reader, or served by the API at /metrics.
+
+While a latency Recorder is installed as well, the latency of screens and
+commands is exported too.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from . import hooks
+from .latency import Histogram
+
+# Name -> (type, help) of every metric exported.
+METRICS = {
+    "chess_tournament_loads_total": ("counter", "Tournament files loaded."),
+    "chess_tournament_load_seconds": ("histogram", "Time to load a tournament file."),
+    "chess_save_seconds": ("histogram", "Time to save a file, by kind of file."),
+    "chess_bytes_written_total": (
+        "counter",
+        "Bytes of the files saved, by kind of file.",
+    ),
+    "chess_result_entries_total": ("counter", "Match results entered."),
+    "chess_result_entries_per_minute": (
+        "gauge",
+        "Match results entered in the last minute.",
+    ),
+    "chess_pairing_seconds": (
+        "histogram",
+        "Time to get the pairings of a new round, computed or precomputed.",
+    ),
+    "chess_cache_lookups_total": ("counter", "Cache lookups, by cache and result."),
+    "chess_cache_hit_ratio": (
+        "gauge",
+        "Share of cache lookups that were hits, by cache.",
+    ),
+    "chess_screen_seconds": ("histogram", "Time to show a screen, prompts excluded."),
+    "chess_command_seconds": ("histogram", "Time to run a command."),
+}
+
+# Seconds the results-per-minute gauge looks back.
+MINUTE = 60.0
+# Seconds between two writes of a metrics file.
+INTERVAL = 15.0
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: Labels, extra: str = "") -> str:
+    """
+    Formats a sample's labels.
+
+    Args:
+        labels (Labels): (name, value) pairs.
+        extra (str): A formatted label to add, e.g. 'le="0.5"'.
+
+    Returns:
+        str: e.g. '{cache="report",result="hit"}', or "" without labels.
+    """
+    parts = [f'{name}="{escape(value)}"' for name, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def format_number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def histogram_lines(name: str, labels: Labels, histogram: Histogram) -> list[str]:
+    """
+    Formats a histogram's samples, with cumulative buckets.
+
+    Args:
+        name (str): The metric's name.
+        labels (Labels): The histogram's labels.
+        histogram (Histogram): Its counts.
+
+    Returns:
+        list[str]: The bucket, sum and count samples.
+    """
+    lines = []
+    seen = 0
+    for bound, count in zip(histogram.bounds, histogram.counts):
+        seen += count
+        le = f'le="{bound}"'
+        lines.append(f"{name}_bucket{format_labels(labels, le)} {seen}")
+    inf = 'le="+Inf"'
+    lines.append(f"{name}_bucket{format_labels(labels, inf)} {histogram.count}")
+    lines.append(f"{name}_sum{format_labels(labels)} {format_number(histogram.total)}")
+    lines.append(f"{name}_count{format_labels(labels)} {histogram.count}")
+    return lines
+
+
+class Metrics:
+    """
+    Registry of the counters and histograms fed by the application's hooks.
+
+    Its methods may be called from any thread.
+
+    Attributes:
+        counters (dict[tuple[str, Labels], float]): Values by metric name and labels.
+        histograms (dict[tuple[str, Labels], Histogram]): Durations by metric name and labels.
+    """
+
+    def __init__(self) -> None:
+        self.counters: dict[tuple[str, Labels], float] = {}
+        self.histograms: dict[tuple[str, Labels], Histogram] = {}
+        self._entries: deque[tuple[float, int]] = deque()
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        """
+        Adds to a counter.
+
+        Args:
+            name (str): The counter's name.
+            value (float): The amount added.
+            **labels (str): The counter's labels.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        """
+        Counts a duration in a histogram.
+
+        Args:
+            name (str): The histogram's name.
+            seconds (float): The duration.
+            **labels (str): The histogram's labels.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    # What the hooks report.
+
+    def loaded(self, seconds: float) -> None:
+        """
+        Counts a tournament file loaded.
+
+        Args:
+            seconds (float): Time it took.
+        """
+        self.inc("chess_tournament_loads_total")
+        self.observe("chess_tournament_load_seconds", seconds)
+
+    def saved(self, kind: str, seconds: float, size: int) -> None:
+        """
+        Counts a file saved.
+
+        Args:
+            kind (str): What the file holds ("tournament", "club" or "index").
+            seconds (float): Time it took.
+            size (int): Bytes written.
+        """
+        self.observe("chess_save_seconds", seconds, file=kind)
+        self.inc("chess_bytes_written_total", size, file=kind)
+
+    def results_entered(self, count: int) -> None:
+        """
+        Counts match results entered.
+
+        Args:
+            count (int): Number of results.
+        """
+        self.inc("chess_result_entries_total", count)
+        with self._lock:
+            self._entries.append((time.monotonic(), count))
+
+    def paired(self, seconds: float, precomputed: bool) -> None:
+        """
+        Counts the pairing of a new round.
+
+        Args:
+            seconds (float): Time it took.
+            precomputed (bool): Whether the pairing had been computed in advance.
+        """
+        source = "precomputed" if precomputed else "computed"
+        self.observe("chess_pairing_seconds", seconds, source=source)
+
+    def cache_lookup(self, cache: str, hit: bool) -> None:
+        """
+        Counts a cache lookup.
+
+        Args:
+            cache (str): The cache's name.
+            hit (bool): Whether it was a hit.
+        """
+        self.inc(
+            "chess_cache_lookups_total", cache=cache, result="hit" if hit else "miss"
+        )
+
+    # Export.
+
+    def _entries_per_minute(self) -> int:
+        cutoff = time.monotonic() - MINUTE
+        while self._entries and self._entries[0][0] < cutoff:
+            self._entries.popleft()
+        return sum(count for _, count in self._entries)
+
+    def samples(self) -> dict[str, list[str]]:
+        """
+        Formats the samples of every metric with data.
+
+        Returns:
+            dict[str, list[str]]: Sample lines by metric name.
+        """
+        samples: dict[str, list[str]] = {}
+        with self._lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                samples.setdefault(name, []).append(
+                    f"{name}{format_labels(labels)} {format_number(value)}"
+                )
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                samples.setdefault(name, []).extend(
+                    histogram_lines(name, labels, histogram)
+                )
+            samples["chess_result_entries_per_minute"] = [
+                f"chess_result_entries_per_minute {self._entries_per_minute()}"
+            ]
+
+            lookups: dict[str, list[float]] = {}
+            for (name, labels), value in self.counters.items():
+                if name == "chess_cache_lookups_total":
+                    label = dict(labels)
+                    counts = lookups.setdefault(label["cache"], [0, 0])
+                    counts[label["result"] == "hit"] += value
+            if lookups:
+                samples["chess_cache_hit_ratio"] = [
+                    f"chess_cache_hit_ratio{format_labels((('cache', cache),))} "
+                    f"{format_number(hits / (hits + misses))}"
+                    for cache, (misses, hits) in sorted(lookups.items())
+                ]
+
+        recorder = hooks.active()
+        if recorder is not None:
+            # Copied under the recorder's lock: the writer thread samples
+            # while the application keeps recording.
+            for (kind, name), latency in sorted(recorder.latencies().items()):
+                metric = f"chess_{kind}_seconds"
+                samples.setdefault(metric, []).extend(
+                    histogram_lines(metric, ((kind, name),), latency)
+                )
+        return samples
+
+    def render(self) -> str:
+        """
+        Formats every metric with data in the Prometheus text format.
+
+        Returns:
+            str: The exposition, ending with a new line.
+        """
+        samples = self.samples()
+        lines = []
+        for name, (kind, description) in METRICS.items():
+            if name in samples:
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.extend(samples[name])
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path) -> None:
+        """
+        Writes the metrics to a file, replacing it in one step.
+
+        Args:
+            path (Path): The file.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(partial, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(partial, path)
+
+
+@contextmanager
+def collecting(
+    path: Optional[Path] = None, interval: float = INTERVAL
+) -> Iterator[Metrics]:
+    """
+    Installs a metrics registry for the duration of a block.
+
+    Args:
+        path (Optional[Path]): File the metrics are written to every `interval`
+            seconds and on leaving the block, if any.
+        interval (float): Seconds between writes.
+
+    Yields:
+        Metrics: The installed registry.
+    """
+    registry = Metrics()
+    previous = hooks.install_metrics(registry)
+    stop = threading.Event()
+    writer = None
+    if path is not None:
+
+        def write_periodically():
+            while not stop.wait(interval):
+                registry.write(path)
+
+        writer = threading.Thread(target=write_periodically, daemon=True)
+        writer.start()
+    try:
+        yield registry
+    finally:
+        stop.set()
+        if writer is not None:
+            writer.join()
+            registry.write(path)
+        hooks.install_metrics(previous)
@@ -0,0 +1,472 @@
+"""
+Recording of real sessions, and their replay for latency testing.
+
+A recording is a folder holding a copy of the data as it was when the session
+started (`data/`) and a journal of the session (`session.jsonl`): a header,
+then one line per prompt, with the screen it was on, the output printed since
+the previous prompt, the answer given, how long the program took to get to the
+prompt after the previous answer (its latency) and how long the arbiter took
+to answer. Every prompt of the application goes through builtins.input, which
+is where answers are captured.
+
+A replay runs the application headlessly on a copy of the project and of the
+recorded data, answering each prompt with the recorded answer, and compares
+the latency of every screen and the output of every step with the recording.
+The random seed and the date are the recorded ones, so the same answers lead
+through the same screens. The project's folder differs between the two, so
+it is replaced by a placeholder in both outputs before they are compared.
+"""
+
+import builtins
+import difflib
+import json
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+FORMAT = 1
+JOURNAL = "session.jsonl"
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+# The application's data, wherever the application is run from.
+DATA = PROJECT_ROOT / "data"
+# Stands for the project's folder in compared output.
+PROJECT = "<project>"
+# Lines of each output diff printed.
+DIFF_LINES = 40
+# Not copied from the project for a replay: everything else is code.
+NOT_COPIED = ("data", ".git", "__pycache__", "flake8_report", "*.pyc")
+
+
+class Diverged(Exception):
+    """Raised when a replay asks for more answers than were recorded."""
+
+
+class SessionRecorder:
+    """
+    Records the prompts, answers and output of a session of the application.
+
+    Attributes:
+        directory (Path): The recording's folder.
+        app: The application recorded (a MainApp).
+    """
+
+    def __init__(self, directory: Path, app) -> None:
+        """
+        Initialize the recorder.
+
+        Args:
+            directory (Path): The recording's folder (created, or emptied).
+            app: The application recorded (a MainApp); its output is captured
+                through its transcript.
+        """
+        self.directory = directory
+        self.app = app
+        self._output: list[str] = []
+        self._journal = None
+        self._start = self._answered = 0.0
+
+    def transcript(self, text: str) -> None:
+        """
+        Receives the application's output.
+
+        Args:
+            text (str): Text printed since the last flush.
+        """
+        self._output.append(text)
+
+    def _take_output(self) -> str:
+        sys.stdout.flush()
+        output = "".join(self._output)
+        self._output.clear()
+        return output
+
+    def _write(self, entry: dict) -> None:
+        self._journal.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._journal.flush()
+
+    def prompt(self, read: Callable[[str], str], prompt: str = "") -> str:
+        """
+        Asks the arbiter, and records the step.
+
+        Args:
+            read (Callable[[str], str]): The real input function.
+            prompt (str): The prompt.
+
+        Returns:
+            str: The answer.
+        """
+        output = self._take_output()
+        asked = time.perf_counter()
+        answer = read(prompt)
+        answered = time.perf_counter()
+        if "".join(self._output) == prompt:
+            # Echo of the prompt itself, when input() writes it to the buffer.
+            self._output.clear()
+        self._write(
+            {
+                "at": round(asked - self._start, 6),
+                "screen": self.app.context.screen,
+                "output": output,
+                "prompt": prompt,
+                "answer": answer,
+                "latency": round(asked - self._answered, 6),
+                "wait": round(answered - asked, 6),
+            }
+        )
+        self._answered = answered
+        return answer
+
+    def __enter__(self) -> "SessionRecorder":
+        if self.directory.exists():
+            shutil.rmtree(self.directory)
+        self.directory.mkdir(parents=True)
+        if DATA.exists():
+            shutil.copytree(DATA, self.directory / "data")
+
+        seed = random.randrange(2**32)
+        random.seed(seed)
+        self._journal = open(self.directory / JOURNAL, "w", encoding="utf-8")
+        self._write(
+            {
+                "format": FORMAT,
+                "started": datetime.now().isoformat(),
+                "seed": seed,
+                "root": str(PROJECT_ROOT),
+            }
+        )
+
+        self.app.transcript = self.transcript
+        self._read = builtins.input
+        builtins.input = lambda prompt="": self.prompt(self._read, prompt)
+        self._start = self._answered = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        builtins.input = self._read
+        self.app.transcript = None
+        end = {
+            "at": round(time.perf_counter() - self._start, 6),
+            "screen": None,
+            "output": "".join(self._output),
+            "latency": round(time.perf_counter() - self._answered, 6),
+            "end": True,
+        }
+        if exc_type is not None:
+            end["error"] = exc_type.__name__
+        self._write(end)
+        self._journal.close()
+
+
+def read_journal(path: Path) -> tuple[dict, list[dict], Optional[dict]]:
+    """
+    Reads a session journal.
+
+    Args:
+        path (Path): The journal.
+
+    Returns:
+        tuple: The header, the steps, and the end of the session (None if
+        the recording was cut short).
+
+    Raises:
+        ValueError: If the file is not a session journal this version can read.
+    """
+    with open(path, encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    if not entries or entries[0].get("format") != FORMAT:
+        raise ValueError(f"{path} is not a session recording.")
+    header, steps = entries[0], entries[1:]
+    end = steps.pop() if steps and steps[-1].get("end") else None
+    return header, steps, end
+
+
+def freeze_clock(started: datetime) -> None:
+    """
+    Makes the application's clock start at a recorded date.
+
+    Status labels and date checks use datetime.now() and datetime.today(),
+    which are shifted so that the replay runs on the day it was recorded.
+
+    Args:
+        started (datetime): When the recording started.
+    """
+    import models.tournament
+    import screens.base_screen
+
+    offset = started - datetime.now()
+
+    class Clock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.now(tz) + offset
+
+        @classmethod
+        def today(cls):
+            return datetime.today() + offset
+
+    models.tournament.datetime = Clock
+    screens.base_screen.datetime = Clock
+
+
+def play(app, journal: Path, result: Path, speed: Optional[float] = None) -> None:
+    """
+    Replays a recorded session in this process, and writes what it measured.
+
+    Meant to run in a copy of the project holding the recorded data (see
+    replay_session): the session changes the data as it did when recorded.
+
+    Args:
+        app: The application to run (a MainApp, not redrawing).
+        journal (Path): The session's journal.
+        result (Path): JSON file the replayed steps are written to.
+        speed (Optional[float]): Wait the recorded time between prompts,
+            divided by this factor, so that background work (such as the
+            precomputed pairings) gets the time it had; None answers at once.
+    """
+    import webbrowser
+
+    header, steps, _ = read_journal(journal)
+    random.seed(header["seed"])
+    freeze_clock(datetime.fromisoformat(header["started"]))
+    # Reports are rendered as recorded, but not opened.
+    webbrowser.open = lambda url, *args, **kwargs: True
+
+    replayed: list[dict] = []
+    output: list[str] = []
+    answered = time.perf_counter()
+
+    def answer(prompt: str = "") -> str:
+        nonlocal answered
+        sys.stdout.flush()
+        asked = time.perf_counter()
+        replayed.append(
+            {
+                "screen": app.context.screen,
+                "output": "".join(output),
+                "latency": asked - answered,
+            }
+        )
+        output.clear()
+        if len(replayed) > len(steps):
+            raise Diverged(
+                f"The replay asked for answer {len(replayed)}, but only {len(steps)} were recorded."
+            )
+        step = steps[len(replayed) - 1]
+        if speed:
+            time.sleep(step["wait"] / speed)
+        answered = time.perf_counter()
+        return step["answer"]
+
+    error = None
+    app.transcript = output.append
+    read, builtins.input = builtins.input, answer
+    try:
+        app.run()
+    except Diverged as e:
+        error = str(e)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        builtins.input = read
+    end = {
+        "screen": None,
+        "output": "".join(output),
+        "latency": time.perf_counter() - answered,
+        "end": True,
+    }
+    with open(result, "w", encoding="utf-8") as f:
+        json.dump(
+            {"steps": replayed, "end": end, "error": error, "root": str(PROJECT_ROOT)},
+            f,
+        )
+
+
+def quantile(values: list[float], q: float) -> float:
+    """
+    Gets a quantile of some values (the value at that rank, no interpolation).
+
+    Args:
+        values (list[float]): The values (not empty).
+        q (float): The quantile, between 0 and 1.
+
+    Returns:
+        float: The quantile.
+    """
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def latency_table(recorded: list[dict], replayed: list[dict]) -> Iterator[str]:
+    """
+    Compares the latency of each screen, over the steps both runs share.
+
+    Args:
+        recorded (list[dict]): The recorded steps (and end).
+        replayed (list[dict]): The replayed steps (and end).
+
+    Yields:
+        str: The table's lines.
+    """
+    by_screen: dict[str, tuple[list[float], list[float]]] = {}
+    for before, after in zip(recorded, replayed):
+        if before["screen"] != after["screen"]:
+            break
+        times = by_screen.setdefault(before["screen"] or "(exit)", ([], []))
+        times[0].append(before["latency"])
+        times[1].append(after["latency"])
+
+    yield (
+        f"{'screen':<26} {'steps':>5} {'recorded':>9} {'replayed':>9} {'change':>7} "
+        f"{'rec p95':>8} {'rep p95':>8} {'rep max':>8}"
+    )
+    for screen, (before, after) in sorted(
+        by_screen.items(), key=lambda item: -sum(item[1][1])
+    ):
+        mean_before, mean_after = statistics.mean(before), statistics.mean(after)
+        change = (mean_after / mean_before - 1) * 100 if mean_before else 0.0
+        yield (
+            f"{screen[:26]:<26} {len(before):>5} {mean_before * 1000:>9.1f} "
+            f"{mean_after * 1000:>9.1f} {change:>+6.0f}% "
+            f"{quantile(before, 0.95) * 1000:>8.1f} {quantile(after, 0.95) * 1000:>8.1f} "
+            f"{max(after) * 1000:>8.1f}"
+        )
+
+
+def normalize(output: str, root: Optional[str]) -> str:
+    """
+    Replaces the project's folder in an output, for comparing outputs of copies.
+
+    Args:
+        output (str): Output of a step.
+        root (Optional[str]): The project's folder when it was printed (unknown
+            for recordings made before it was journaled).
+
+    Returns:
+        str: The output, with the folder replaced by PROJECT.
+    """
+    return output.replace(root, PROJECT) if root else output
+
+
+def replay_session(
+    directory: Path, speed: Optional[float] = None, diffs: int = 3, keep: bool = False
+) -> int:
+    """
+    Replays a recorded session headlessly and reports latency and output changes.
+
+    The project's code and the recorded data are copied to a temporary
+    folder, where `chess.py` replays the session in a fresh interpreter, so
+    the real data is never touched.
+
+    Args:
+        directory (Path): The recording's folder.
+        speed (Optional[float]): Replay the arbiter's waits, divided by this factor.
+        diffs (int): Number of differing steps whose output diff is printed.
+        keep (bool): Keep the temporary copy (its path is printed).
+
+    Returns:
+        int: 0 if the replay went through the same screens with the same
+        output, 1 otherwise.
+    """
+    journal = directory / JOURNAL
+    header, steps, end = read_journal(journal)
+
+    workdir = Path(tempfile.mkdtemp(prefix="chess-replay-"))
+    try:
+        shutil.copytree(
+            PROJECT_ROOT,
+            workdir / "project",
+            ignore=shutil.ignore_patterns(*NOT_COPIED),
+        )
+        if (directory / "data").exists():
+            shutil.copytree(directory / "data", workdir / "project" / "data")
+        result = workdir / "result.json"
+        command = [
+            sys.executable,
+            str(workdir / "project" / "chess.py"),
+            "--replay-journal",
+            str(journal.resolve()),
+            str(result),
+        ]
+        if speed:
+            command += ["--speed", str(speed)]
+        start = time.perf_counter()
+        done = subprocess.run(
+            command,
+            cwd=workdir / "project",
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        elapsed = time.perf_counter() - start
+        if not result.exists():
+            print(f"The replay failed:\n{done.stderr}")
+            return 1
+        with open(result, encoding="utf-8") as f:
+            replay = json.load(f)
+    finally:
+        if keep:
+            print(f"Replay copy kept in {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    recorded = steps + ([end] if end else [])
+    replayed = replay["steps"] + [replay["end"]]
+    print(
+        f"Replayed {len(replay['steps'])} of {len(steps)} prompts in {elapsed:.2f} s "
+        f"(latency in ms, from an answer to the next prompt)\n"
+    )
+    for line in latency_table(recorded, replayed):
+        print(line)
+
+    differences = 0
+    diverged = None
+    for number, (before, after) in enumerate(zip(recorded, replayed), 1):
+        if before["screen"] != after["screen"]:
+            diverged = number
+            break
+        recorded_output = normalize(before["output"], header.get("root"))
+        replayed_output = normalize(after["output"], replay.get("root"))
+        if recorded_output == replayed_output:
+            continue
+        differences += 1
+        if differences <= diffs:
+            diff = list(
+                difflib.unified_diff(
+                    recorded_output.splitlines(),
+                    replayed_output.splitlines(),
+                    f"recorded step {number} ({before['screen'] or 'exit'})",
+                    "replayed",
+                    lineterm="",
+                    n=1,
+                )
+            )
+            print()
+            print("\n".join(diff[:DIFF_LINES]))
+            if len(diff) > DIFF_LINES:
+                print(f"... {len(diff) - DIFF_LINES} more lines")
+
+    print()
+    if replay["error"]:
+        print(f"The replay stopped: {replay['error']}")
+    if diverged:
+        print(
+            f"The replay left the recorded path at step {diverged}: "
+            f"{recorded[diverged - 1]['screen'] or 'the exit'} was recorded, "
+            f"{replayed[diverged - 1]['screen'] or 'the exit'} was replayed."
+        )
+    elif len(replayed) != len(recorded):
+        print(f"{len(recorded)} steps were recorded, {len(replayed)} replayed.")
+    print(f"{differences} step(s) with different output.")
+    same = not (
+        replay["error"] or diverged or differences or len(replayed) != len(recorded)
+    )
+    return 0 if same else 1
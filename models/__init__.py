@@ -1,6 +1,9 @@
 from .club import ChessClub
 from .club_manager import ClubManager
+from .head_to_head import HeadToHeadIndex
+from .history import PairingHistory
 from .player import Player
+from .player_stats import PlayerStatsIndex
 from .tournament import Tournament
 from .round import Round
 from .match import Match
@@ -8,8 +11,11 @@ from .tournament_manager import TournamentManager
 
 __all__ = [
     "Player",
+    "PlayerStatsIndex",
     "ChessClub",
     "ClubManager",
+    "HeadToHeadIndex",
+    "PairingHistory",
     "Tournament",
     "Round",
     "Match",
@@ -0,0 +1,283 @@
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Optional
+
+import instrumentation
+
+from .files import file_version
+from .tournament import Tournament
+from .tournament_manager import iter_tournaments
+
+# The project's tournament archive, used when no other folder is given.
+TOURNAMENTS = Path(__file__).resolve().parents[1] / "data" / "tournaments"
+
+
+def tournament_key(tournament: Tournament) -> str:
+    """
+    Gets the key identifying a tournament in the indexes.
+
+    The file name is used because it does not change when a tournament is renamed.
+
+    Args:
+        tournament (Tournament): The tournament.
+
+    Returns:
+        str: The tournament's key.
+    """
+    return tournament.filepath.name if tournament.filepath else tournament.name
+
+
+def index_folder(tournaments_folder: Path) -> Path:
+    """
+    Gets the folder holding the indexes of a tournament archive.
+
+    Each archive has its own indexes, next to it ("stats" beside "tournaments"),
+    so that the indexes of different archives are never mixed.
+
+    Args:
+        tournaments_folder (Path): Folder holding the tournament archive.
+
+    Returns:
+        Path: The indexes' folder.
+    """
+    return tournaments_folder.resolve().parent / "stats"
+
+
+class ArchiveIndex:
+    """
+    Base class of the indexes built over a whole tournament archive.
+
+    An index is a folder holding one JSON file per tournament, named after it:
+    that tournament's part of the index. Updating a tournament rewrites its own
+    part only, so saving results costs as much as the tournament, not the
+    archive. A loaded index is kept in memory and handed out again by `load`;
+    when other processes change the folder, only the parts they rewrote are
+    read again.
+
+    Subclasses set NAME and FORMAT, and implement `build` and `merge`.
+
+    Attributes:
+        folder (Path): The index's folder.
+        tournaments_folder (Path): Folder holding the tournament archive.
+        parts (dict[str, dict]): Each tournament's part, by tournament key.
+    """
+
+    # Name of the index's folder.
+    NAME = ""
+    # Version of the parts' layout; parts in another layout are rebuilt.
+    FORMAT = 1
+
+    # Loaded indexes by folder.
+    _loaded: dict[Path, "ArchiveIndex"] = {}
+
+    def __init__(self, folder: Path, tournaments_folder: Path) -> None:
+        """
+        Initialize an empty index.
+
+        Args:
+            folder (Path): The index's folder.
+            tournaments_folder (Path): Folder holding the tournament archive.
+        """
+        self.folder = folder
+        self.tournaments_folder = tournaments_folder
+        self.parts: dict[str, dict] = {}
+        self._versions: dict[str, tuple[int, int]] = {}
+        self._folder_version: Optional[tuple[int, int]] = None
+
+    @classmethod
+    def load(cls, tournaments_folder: Optional[Path] = None) -> "ArchiveIndex":
+        """
+        Load the index of an archive, building it from the archive if missing.
+
+        Args:
+            tournaments_folder (Optional[Path]): Folder holding the tournament
+                archive (the project's by default).
+
+        Returns:
+            ArchiveIndex: The index, up to date with its folder.
+        """
+        tournaments_folder = tournaments_folder or TOURNAMENTS
+        folder = index_folder(tournaments_folder) / cls.NAME
+        index = cls._loaded.get(folder)
+        if index is None:
+            index = cls(folder, tournaments_folder)
+            if not folder.exists():
+                index.rebuild()
+            cls._loaded[folder] = index
+        index.refresh()
+        return index
+
+    def build(self, tournament: Tournament) -> dict:
+        """
+        Builds a tournament's part of the index.
+
+        Args:
+            tournament (Tournament): The tournament.
+
+        Returns:
+            dict: Its part (empty if it adds nothing to the index).
+        """
+        raise NotImplementedError
+
+    def merge(self, key: str, old: dict, new: dict) -> None:
+        """
+        Swaps a tournament's old part for its new one in what the index combines.
+
+        Args:
+            key (str): The tournament's key.
+            old (dict): The part being replaced (empty if there was none).
+            new (dict): The new part (empty if it is removed).
+        """
+        raise NotImplementedError
+
+    def replace(self, key: str, part: Optional[dict]) -> None:
+        """
+        Replaces a tournament's part in the index held in memory.
+
+        Args:
+            key (str): The tournament's key.
+            part (Optional[dict]): Its new part, or None to remove it.
+        """
+        old = self.parts.pop(key, None) or {}
+        if part:
+            self.parts[key] = part
+        self.merge(key, old, part or {})
+
+    def refresh(self) -> None:
+        """Reads the parts changed on disk since they were last read or written."""
+        version = file_version(self.folder)
+        if version is None or version == self._folder_version:
+            return
+        found = set()
+        for filepath in sorted(self.folder.glob("*.json")):
+            key = filepath.name
+            part_version = file_version(filepath)
+            if part_version is None:
+                continue
+            found.add(key)
+            if self._versions.get(key) == part_version:
+                continue
+            try:
+                with open(filepath, "r") as f:
+                    data = json.load(f)
+                part = data["part"] if data.get("format") == self.FORMAT else None
+            except FileNotFoundError:
+                found.discard(key)
+                continue
+            except (json.JSONDecodeError, KeyError, AttributeError):
+                part = None
+            if part is None:
+                print(filepath, "is an invalid index file. Rebuilding it.")
+                self._reindex(key)
+            else:
+                self.replace(key, part)
+                self._versions[key] = part_version
+        for key in set(self.parts) - found:
+            self.replace(key, None)
+            self._versions.pop(key, None)
+        self._folder_version = version
+
+    def _reindex(self, key: str) -> None:
+        filepath = self.tournaments_folder / key
+        try:
+            with open(filepath, "r") as f:
+                tournament = Tournament.from_dict(json.load(f), filepath)
+        except (OSError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+            self.replace(key, None)
+            self._remove(key)
+            return
+        self.update(tournament)
+
+    def update(self, tournament: Tournament, save: bool = True) -> None:
+        """
+        Replaces a tournament's part of the index.
+
+        Args:
+            tournament (Tournament): The tournament whose results changed.
+            save (bool): Whether to write its part to disk afterwards.
+        """
+        key = tournament_key(tournament)
+        part = self.build(tournament)
+        self.replace(key, part or None)
+        if save:
+            self._save(key)
+
+    def rebuild(self) -> None:
+        """
+        Builds the whole index with one streaming pass over the tournament archive.
+
+        The parts are written to a temporary folder renamed into place once
+        complete, so an interrupted rebuild is started over next time.
+        """
+        for key in list(self.parts):
+            self.replace(key, None)
+        self._versions = {}
+        if self.tournaments_folder.exists():
+            for tournament in iter_tournaments(self.tournaments_folder):
+                self.update(tournament, save=False)
+
+        final, self.folder = self.folder, self.folder.with_name(
+            f"{self.folder.name}.{os.getpid()}.tmp"
+        )
+        try:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            for key in self.parts:
+                self._save(key)
+            os.replace(self.folder, final)
+        except OSError:
+            if not final.exists():
+                raise
+            # Another process built it first: its parts are read instead.
+            shutil.rmtree(self.folder, ignore_errors=True)
+            self.folder = final
+            self._versions = {}
+            self._folder_version = None
+            return
+        finally:
+            self.folder = final
+        self._versions = {key: file_version(final / key) for key in self.parts}
+        self._folder_version = file_version(final)
+
+    def _save(self, key: str) -> None:
+        """
+        Writes a tournament's part to its file, or removes the file if it has none.
+
+        The part is written to a temporary file, flushed to disk, and then
+        renamed over the part's, so a failed save leaves the previous part in place.
+
+        Args:
+            key (str): The tournament's key.
+        """
+        part = self.parts.get(key)
+        if part is None:
+            self._remove(key)
+            return
+        filepath = self.folder / key
+        self.folder.mkdir(parents=True, exist_ok=True)
+        before = file_version(self.folder)
+        partial = filepath.with_suffix(f".{os.getpid()}.tmp")
+        with instrumentation.saving(filepath, "index"):
+            with open(partial, "w") as f:
+                json.dump({"format": self.FORMAT, "part": part}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(partial, filepath)
+        self._versions[key] = file_version(filepath)
+        self._wrote(before)
+
+    def _remove(self, key: str) -> None:
+        before = file_version(self.folder)
+        try:
+            os.remove(self.folder / key)
+        except FileNotFoundError:
+            pass
+        self._versions.pop(key, None)
+        self._wrote(before)
+
+    def _wrote(self, before: Optional[tuple[int, int]]) -> None:
+        # The folder is known to be up to date only if nobody else changed it
+        # since it was last read; otherwise the next load reads what changed.
+        if before == self._folder_version:
+            self._folder_version = file_version(self.folder)
@@ -1,5 +1,7 @@
 import json
 
+import instrumentation
+
 from .player import Player
 
 
@@ -36,7 +38,9 @@ class ChessClub:
     def save(self):
         """Serializes the players and saves the club info to the JSON file"""
 
-        with open(self.filepath, "w") as fp:
+        with instrumentation.saving(self.filepath, "club"), open(
+            self.filepath, "w"
+        ) as fp:
             json.dump(
                 {"name": self.name, "players": [p.serialize() for p in self.players]},
                 fp,
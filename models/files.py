@@ -0,0 +1,60 @@
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+# Seconds a lock is waited for before it is taken to be left by a crashed
+# program: files are only locked while they are being replaced.
+LOCK_TIMEOUT = 5.0
+
+
+def file_version(filepath: Path) -> Optional[tuple[int, int]]:
+    """
+    Gets the version of a file or folder: its modification time and size.
+
+    Args:
+        filepath (Path): Path to the file or folder.
+
+    Returns:
+        Optional[tuple[int, int]]: The version, or None if there is nothing there.
+    """
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+@contextmanager
+def locked(filepath: Path, timeout: float = LOCK_TIMEOUT) -> Iterator[None]:
+    """
+    Holds the lock of a file, shared by every thread and process saving it.
+
+    The lock is a file created next to it ("<name>.lock"), which works the same
+    on every platform.
+
+    Args:
+        filepath (Path): The file.
+        timeout (float): Seconds after which a lock still held is broken.
+    """
+    lockpath = filepath.with_name(filepath.name + ".lock")
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(lockpath, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            if time.monotonic() < deadline:
+                time.sleep(0.005)
+                continue
+            try:
+                os.remove(lockpath)
+            except FileNotFoundError:
+                pass
+            deadline = time.monotonic() + timeout
+    try:
+        yield
+    finally:
+        os.close(fd)
+        os.remove(lockpath)
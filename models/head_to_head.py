@@ -0,0 +1,137 @@
+from pathlib import Path
+
+from .archive_index import ArchiveIndex
+from .match import PLAYER1, PLAYER2, DRAW
+from .tournament import Tournament
+
+
+def pair_key(chess_id_a: str, chess_id_b: str) -> str:
+    """
+    Builds the key of an unordered pair of chess IDs.
+
+    Args:
+        chess_id_a (str): The first chess ID.
+        chess_id_b (str): The second chess ID.
+
+    Returns:
+        str: The same key whichever order the IDs are given in.
+    """
+    return "|".join(sorted((chess_id_a, chess_id_b)))
+
+
+class HeadToHeadIndex(ArchiveIndex):
+    """
+    Persistent index of every game played between each pair of players.
+
+    Each tournament's part is its games by unordered chess ID pair. In memory,
+    games are combined by pair, then by the file name of the tournament they
+    were played in, so a head-to-head lookup is a single dictionary access,
+    and a tournament can be re-indexed without touching the others.
+
+    Attributes:
+        pairs (dict[str, dict[str, list[dict]]]): Games by pair key and
+            tournament file name, each with 'tournament', 'round', 'players'
+            and 'result' (winner chess ID or "draw").
+        parts (dict[str, dict[str, list[dict]]]): Games by tournament file
+            name and pair key.
+    """
+
+    NAME = "head_to_head"
+
+    def __init__(self, folder: Path, tournaments_folder: Path) -> None:
+        """
+        Initialize an empty index.
+
+        Args:
+            folder (Path): The index's folder.
+            tournaments_folder (Path): Folder holding the tournament archive.
+        """
+        super().__init__(folder, tournaments_folder)
+        self.pairs: dict[str, dict[str, list[dict]]] = {}
+
+    def build(self, tournament: Tournament) -> dict[str, list[dict]]:
+        """
+        Lists one tournament's completed games by pair key.
+
+        Args:
+            tournament (Tournament): The tournament to index.
+
+        Returns:
+            dict[str, list[dict]]: Games by pair key for this tournament only.
+        """
+        games: dict[str, list[dict]] = {}
+        for rnd in tournament.rounds:
+            for match in rnd.matches:
+                if not match.completed or match.is_bye:
+                    continue
+                p1 = match._get_chess_id(match.player1)
+                p2 = match._get_chess_id(match.player2)
+                if match.winner == PLAYER1:
+                    result = p1
+                elif match.winner == PLAYER2:
+                    result = p2
+                else:
+                    result = DRAW
+                games.setdefault(pair_key(p1, p2), []).append(
+                    {
+                        "tournament": tournament.name,
+                        "round": rnd.round_number,
+                        "players": [p1, p2],
+                        "result": result,
+                    }
+                )
+        return games
+
+    def merge(
+        self, key: str, old: dict[str, list[dict]], new: dict[str, list[dict]]
+    ) -> None:
+        """
+        Swaps a tournament's old games for its new ones in the pairs.
+
+        Args:
+            key (str): The tournament's key.
+            old (dict[str, list[dict]]): Its previous games by pair key.
+            new (dict[str, list[dict]]): Its new games by pair key.
+        """
+        for pair in old:
+            by_tournament = self.pairs.get(pair, {})
+            by_tournament.pop(key, None)
+            if not by_tournament:
+                self.pairs.pop(pair, None)
+        for pair, pair_games in new.items():
+            self.pairs.setdefault(pair, {})[key] = pair_games
+
+    def games(self, chess_id_a: str, chess_id_b: str) -> list[dict]:
+        """
+        Gets every game played between two players.
+
+        Args:
+            chess_id_a (str): The first chess ID.
+            chess_id_b (str): The second chess ID.
+
+        Returns:
+            list[dict]: The games, in archive order.
+        """
+        by_tournament = self.pairs.get(pair_key(chess_id_a, chess_id_b), {})
+        return [game for games in by_tournament.values() for game in games]
+
+    def record(self, chess_id_a: str, chess_id_b: str) -> tuple[int, int, int]:
+        """
+        Summarizes the head-to-head record from the first player's point of view.
+
+        Args:
+            chess_id_a (str): The first chess ID.
+            chess_id_b (str): The second chess ID.
+
+        Returns:
+            tuple[int, int, int]: Wins, draws, and losses of the first player.
+        """
+        wins = draws = losses = 0
+        for game in self.games(chess_id_a, chess_id_b):
+            if game["result"] == chess_id_a:
+                wins += 1
+            elif game["result"] == DRAW:
+                draws += 1
+            else:
+                losses += 1
+        return wins, draws, losses
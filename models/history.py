@@ -0,0 +1,143 @@
+from typing import Iterable, List
+
+from .match import Match
+from .round import Round
+
+
+WHITE = "W"
+BLACK = "B"
+
+
+class PairingHistory:
+    """
+    Pairing history of every registrant in a tournament, indexed by registration position.
+
+    Each registrant's opponents are kept as an integer bitset (bit j is set once
+    they have played registrant j), so a rematch check is a shift and a mask
+    instead of a scan over every round. Colours (player1 plays white) and byes
+    are kept per registrant as well.
+
+    Attributes:
+        positions (dict[str, int]): Registrant position by chess ID.
+        opponents (List[int]): Opponent bitset by position.
+        colours (List[str]): Colours played by position, one "W"/"B" per game.
+        byes (List[int]): Number of byes received by position.
+    """
+
+    def __init__(self, players: Iterable[dict]) -> None:
+        """
+        Initialize an empty history for the given registrants.
+
+        Args:
+            players (Iterable[dict]): Tournament registrants, in registration order.
+        """
+        self.positions: dict[str, int] = {}
+        self.opponents: List[int] = []
+        self.colours: List[str] = []
+        self.byes: List[int] = []
+        for player in players:
+            self.position(player["chess_id"])
+
+    @classmethod
+    def from_rounds(
+        cls, players: Iterable[dict], rounds: Iterable[Round]
+    ) -> "PairingHistory":
+        """
+        Builds the history of a tournament from its registrants and rounds.
+
+        Args:
+            players (Iterable[dict]): Tournament registrants, in registration order.
+            rounds (Iterable[Round]): Rounds played (or in progress) so far.
+
+        Returns:
+            PairingHistory: The tournament's history.
+        """
+        history = cls(players)
+        for rnd in rounds:
+            history.record_round(rnd)
+        return history
+
+    def position(self, chess_id: str) -> int:
+        """
+        Gets a registrant's position, adding late registrants at the end.
+
+        Args:
+            chess_id (str): The registrant's chess ID.
+
+        Returns:
+            int: The registrant's position.
+        """
+        pos = self.positions.get(chess_id)
+        if pos is None:
+            pos = self.positions[chess_id] = len(self.opponents)
+            self.opponents.append(0)
+            self.colours.append("")
+            self.byes.append(0)
+        return pos
+
+    def record_match(self, match: Match) -> None:
+        """
+        Records the pairing and colours of one match.
+
+        Args:
+            match (Match): The match to record.
+        """
+        if match.is_bye:
+            self.record_bye(match._get_chess_id(match.player1))
+            return
+
+        white = self.position(match._get_chess_id(match.player1))
+        black = self.position(match._get_chess_id(match.player2))
+        self.opponents[white] |= 1 << black
+        self.opponents[black] |= 1 << white
+        self.colours[white] += WHITE
+        self.colours[black] += BLACK
+
+    def record_bye(self, chess_id: str) -> None:
+        """
+        Records a bye for one registrant.
+
+        Args:
+            chess_id (str): The registrant's chess ID.
+        """
+        self.byes[self.position(chess_id)] += 1
+
+    def record_round(self, rnd: Round) -> None:
+        """
+        Records every match (and bye) of a round.
+
+        Args:
+            rnd (Round): The round to record.
+        """
+        for match in rnd.matches:
+            self.record_match(match)
+
+    def have_played(self, chess_id_a: str, chess_id_b: str) -> bool:
+        """
+        Checks whether two registrants have already been paired together.
+
+        Args:
+            chess_id_a (str): The first chess ID.
+            chess_id_b (str): The second chess ID.
+
+        Returns:
+            bool: True if they have already met.
+        """
+        pos_a = self.positions.get(chess_id_a)
+        pos_b = self.positions.get(chess_id_b)
+        if pos_a is None or pos_b is None:
+            return False
+        return bool(self.opponents[pos_a] >> pos_b & 1)
+
+    def colour_balance(self, chess_id: str) -> int:
+        """
+        Gets how many more games a registrant has played as white than as black.
+
+        Args:
+            chess_id (str): The registrant's chess ID.
+
+        Returns:
+            int: Number of white games minus number of black games.
+        """
+        colours = self.colours[self.position(chess_id)]
+        return colours.count(WHITE) - colours.count(BLACK)
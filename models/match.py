@@ -7,6 +7,10 @@ from .player import Player
 PLAYER1 = "player1"
 PLAYER2 = "player2"
 DRAW = "draw"
+BYE = "bye"
+
+# Points awarded to a player who receives a bye.
+BYE_POINTS = 1.0
 
 
 @dataclass
@@ -17,15 +21,18 @@ class Match:
     Supports both full Player objects and minimal tournament registrant dictionaries
     (with 'name', 'chess_id', and 'club_name').
 
+    A bye is a match without a second registrant: it is created completed,
+    with "bye" as its result, and scores BYE_POINTS for player1.
+
     Attributes:
         player1 (Player | dict): The first registrant.
-        player2 (Player | dict): The second registrant.
-        winner (Optional[str]): "player1", "player2", "draw", or None.
+        player2 (Player | dict | None): The second registrant, or None for a bye.
+        winner (Optional[str]): "player1", "player2", "draw", "bye", or None.
         completed (bool): True if the match has been completed.
     """
 
     player1: Player | dict
-    player2: Player | dict
+    player2: Player | dict | None
     winner: Optional[str] = None
     completed: bool = False
 
@@ -65,6 +72,29 @@ class Match:
         """
         return player.club_name if hasattr(player, "club_name") else player["club_name"]
 
+    @classmethod
+    def bye(cls, player: Player | dict) -> "Match":
+        """
+        Creates a bye for a registrant who has no opponent this round.
+
+        Args:
+            player (Player | dict): The registrant receiving the bye.
+
+        Returns:
+            Match: A completed bye.
+        """
+        return cls(player1=player, player2=None, winner=BYE, completed=True)
+
+    @property
+    def is_bye(self) -> bool:
+        """
+        Check if the match is a bye.
+
+        Returns:
+            bool: True if there is no second registrant.
+        """
+        return self.player2 is None
+
     def is_draw(self) -> bool:
         """
         Check if the match ended in a draw.
@@ -82,10 +112,13 @@ class Match:
             player (Player | dict): The registrant to evaluate.
 
         Returns:
-            float: 1.0 for a win, 0.5 for a draw, 0.0 for a loss or if incomplete.
+            float: 1.0 for a win, 0.5 for a draw, BYE_POINTS for a bye,
+            0.0 for a loss or if incomplete.
         """
         if not self.completed:
             return 0.0
+        if self.winner == BYE:
+            return BYE_POINTS
         if self.winner == DRAW:
             return 0.5
         if self.winner == PLAYER1 and self._get_chess_id(player) == self._get_chess_id(
@@ -106,8 +139,10 @@ class Match:
             winner (str): One of "player1", "player2", or "draw".
 
         Raises:
-            ValueError: If the winner argument is not valid.
+            ValueError: If the winner argument is not valid, or the match is a bye.
         """
+        if self.is_bye:
+            raise ValueError("A bye has no result to enter.")
         if winner not in {PLAYER1, PLAYER2, DRAW}:
             raise ValueError("Winner must be 'player1', 'player2', or 'draw'.")
         self.winner = winner
@@ -119,10 +154,20 @@ class Match:
 
         Returns:
             dict: Dictionary with:
-                - 'players': List of player chess IDs
+                - 'players': List of player chess IDs (a single one for a bye)
                 - 'winner': Chess ID of the winner, or None for a draw
                 - 'completed': Whether the match has been completed
+                - 'bye': True, for a bye only
         """
+        if self.is_bye:
+            player_id = self._get_chess_id(self.player1)
+            return {
+                "players": [player_id],
+                "winner": player_id,
+                "completed": True,
+                "bye": True,
+            }
+
         if self.winner == DRAW:
             winner_id = None
         elif self.winner == PLAYER1:
@@ -153,6 +198,9 @@ class Match:
         Returns:
             Match: Reconstructed match instance.
         """
+        if data.get("bye"):
+            return cls.bye(players_by_id[data["players"][0]])
+
         player1_id, player2_id = data["players"]
         player1 = players_by_id[player1_id]
         player2 = players_by_id[player2_id]
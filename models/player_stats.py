@@ -0,0 +1,148 @@
+import heapq
+from pathlib import Path
+
+from .archive_index import ArchiveIndex
+from .match import PLAYER1, PLAYER2, DRAW
+from .tournament import Tournament
+
+
+STAT_FIELDS = ("games", "wins", "draws", "losses", "points", "tournaments")
+
+
+def empty_stats() -> dict:
+    """
+    Builds a zeroed statistics record.
+
+    Returns:
+        dict: A record with every field in STAT_FIELDS set to zero.
+    """
+    stats = {field: 0 for field in STAT_FIELDS}
+    stats["points"] = 0.0
+    return stats
+
+
+class PlayerStatsIndex(ArchiveIndex):
+    """
+    Persistent lifetime statistics for every player, keyed by chess ID.
+
+    Each tournament's part is its own contribution to the statistics. The
+    lifetime totals are kept in memory: updating a tournament subtracts its
+    previous contribution and adds the new one, so only that tournament's
+    matches are walked and only its part is written.
+
+    Attributes:
+        totals (dict[str, dict]): Lifetime statistics by chess ID.
+        parts (dict[str, dict[str, dict]]): Per-tournament statistics, keyed
+            by tournament file name and then by chess ID.
+    """
+
+    NAME = "player_stats"
+
+    def __init__(self, folder: Path, tournaments_folder: Path) -> None:
+        """
+        Initialize an empty index.
+
+        Args:
+            folder (Path): The index's folder.
+            tournaments_folder (Path): Folder holding the tournament archive.
+        """
+        super().__init__(folder, tournaments_folder)
+        self.totals: dict[str, dict] = {}
+
+    def build(self, tournament: Tournament) -> dict[str, dict]:
+        """
+        Counts one tournament's statistics for every player who has been paired in it.
+
+        Args:
+            tournament (Tournament): The tournament to count.
+
+        Returns:
+            dict[str, dict]: Statistics by chess ID for this tournament only.
+        """
+        stats: dict[str, dict] = {}
+        for rnd in tournament.rounds:
+            for match in rnd.matches:
+                for side, player in (
+                    (PLAYER1, match.player1),
+                    (PLAYER2, match.player2),
+                ):
+                    if player is None:
+                        continue
+                    cid = match._get_chess_id(player)
+                    if cid not in stats:
+                        stats[cid] = empty_stats()
+                        stats[cid]["name"] = match._get_name(player)
+                        stats[cid]["tournaments"] = 1
+                    if not match.completed:
+                        continue
+                    record = stats[cid]
+                    record["points"] += match.get_points(player)
+                    if match.is_bye:
+                        # A bye scores points but is not a game played.
+                        continue
+                    record["games"] += 1
+                    if match.winner == DRAW:
+                        record["draws"] += 1
+                    elif match.winner == side:
+                        record["wins"] += 1
+                    else:
+                        record["losses"] += 1
+        return stats
+
+    def merge(self, key: str, old: dict[str, dict], new: dict[str, dict]) -> None:
+        """
+        Swaps a tournament's old contribution for its new one in the totals.
+
+        Args:
+            key (str): The tournament's key.
+            old (dict[str, dict]): Its previous statistics by chess ID.
+            new (dict[str, dict]): Its new statistics by chess ID.
+        """
+        self._apply(old, -1)
+        self._apply(new, 1)
+
+    def _apply(self, stats: dict[str, dict], sign: int) -> None:
+        """
+        Adds (sign=1) or subtracts (sign=-1) a tournament's statistics from the totals.
+
+        Args:
+            stats (dict[str, dict]): Statistics by chess ID for one tournament.
+            sign (int): 1 to add, -1 to subtract.
+        """
+        for cid, record in stats.items():
+            total = self.totals.setdefault(cid, empty_stats())
+            for field in STAT_FIELDS:
+                total[field] += sign * record[field]
+            if sign > 0:
+                total["name"] = record.get("name", total.get("name", cid))
+            elif total["tournaments"] <= 0:
+                del self.totals[cid]
+
+    def get(self, chess_id: str) -> dict:
+        """
+        Gets a player's lifetime statistics.
+
+        Args:
+            chess_id (str): The player's chess ID.
+
+        Returns:
+            dict: The player's statistics (all zero if they have never played).
+        """
+        return self.totals.get(chess_id, empty_stats())
+
+    def top(self, k: int = 10, key: str = "points") -> list[tuple[str, dict]]:
+        """
+        Gets the k best players for one statistic.
+
+        Args:
+            k (int): Number of players to return.
+            key (str): Statistic to rank by (one of STAT_FIELDS).
+
+        Returns:
+            list[tuple[str, dict]]: (chess ID, statistics) pairs, best first.
+        """
+        if key not in STAT_FIELDS:
+            raise ValueError(f"Unknown statistic: {key}")
+        return heapq.nlargest(
+            k, self.totals.items(), key=lambda item: (item[1][key], item[1]["games"])
+        )
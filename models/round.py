@@ -81,6 +81,9 @@ class Round:
         """
         matches = []
         for data in match_data_list:
+            if data.get("bye"):
+                matches.append(Match.bye(registrants_by_id[data["players"][0]]))
+                continue
             p1_id, p2_id = data["players"]
             match = Match(
                 player1=registrants_by_id[p1_id],
@@ -4,12 +4,33 @@ from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
 import json
+import os
+import random
 
+import instrumentation
+
+from .files import file_version, locked
+from .history import PairingHistory
 from .match import Match
 from .round import Round
 from .player import Player
 
 
+class TournamentChanged(Exception):
+    """
+    Raised when saving a tournament whose file was changed since it was loaded.
+
+    Attributes:
+        filepath (Path): The tournament's file.
+    """
+
+    def __init__(self, filepath: Path) -> None:
+        self.filepath = filepath
+        super().__init__(
+            f"{filepath.name} was changed by another program since it was opened."
+        )
+
+
 @dataclass
 class Tournament:
     """
@@ -21,12 +42,19 @@ class Tournament:
         end_date (datetime): When the tournament ends.
         venue (str): The location of the tournament.
         players (List[dict[str, str]]): List of tournament registrants,
-            each with 'name', 'chess_id', and 'club_name'.
+            each with 'name', 'chess_id', and 'club_name' (plus 'withdrawn'
+            once they have withdrawn from the tournament).
         rounds (List[Round]): List of rounds in the tournament.
         current_round_index (int): Index of the active round (-1 if none started).
         num_rounds (int): Total number of rounds planned.
         filepath (Optional[Path]): Path to the tournament's JSON file.
         is_complete (bool): True if the tournament has concluded.
+        seed (Optional[int]): Seed of every pairing's randomness, so that any
+            round can be regenerated (a random one is drawn if not given).
+        history (PairingHistory): Opponent, colour, and bye history of every
+            registrant, built from the rounds and kept up to date by add_round.
+        version (Optional[tuple[int, int]]): Version of the file this state was
+            loaded from or last saved to (None if not known).
     """
 
     name: str
@@ -39,6 +67,42 @@ class Tournament:
     num_rounds: int = 4
     filepath: Optional[Path] = None
     is_complete: bool = False
+    seed: Optional[int] = None
+    history: PairingHistory = field(init=False, repr=False, compare=False)
+    version: Optional[tuple[int, int]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        """Draws a seed if needed and builds the pairing history from the rounds."""
+        if self.seed is None:
+            self.seed = random.randrange(2**32)
+        self.history = PairingHistory.from_rounds(self.players, self.rounds)
+
+    def rng_for_round(self, round_number: int) -> random.Random:
+        """
+        Gets the source of randomness for pairing one round.
+
+        Each round gets its own generator derived from the tournament seed, so
+        pairing a round does not depend on what was drawn for earlier ones.
+
+        Args:
+            round_number (int): The round being paired (1 for the first round).
+
+        Returns:
+            random.Random: A generator seeded for that round.
+        """
+        return random.Random(f"{self.seed}:{round_number}")
+
+    def add_round(self, rnd: Round) -> None:
+        """
+        Appends a new round and records its pairings in the history.
+
+        Args:
+            rnd (Round): The round to add.
+        """
+        self.rounds.append(rnd)
+        self.history.record_round(rnd)
 
     @staticmethod
     def tournament_registrant(player: Player) -> dict[str, str]:
@@ -81,10 +145,46 @@ class Tournament:
         for rnd in self.rounds:
             for match in rnd.matches:
                 for player in [match.player1, match.player2]:
+                    if player is None:
+                        continue
                     cid = match._get_chess_id(player)
                     scores[cid] += match.get_points(player)
         return scores
 
+    @property
+    def active_players(self) -> List[dict[str, str]]:
+        """
+        Lists the registrants who have not withdrawn and can still be paired.
+
+        Returns:
+            List[dict[str, str]]: The active registrants.
+        """
+        return [p for p in self.players if not p.get("withdrawn")]
+
+    def withdraw(self, chess_id: str) -> dict[str, str]:
+        """
+        Withdraws a registrant: they keep their results but are no longer paired.
+
+        Args:
+            chess_id (str): The registrant's chess ID.
+
+        Returns:
+            dict[str, str]: The withdrawn registrant.
+
+        Raises:
+            ValueError: If no registrant has this chess ID, or if they have
+                already withdrawn.
+        """
+        for player in self.players:
+            if player["chess_id"] == chess_id:
+                if player.get("withdrawn"):
+                    raise ValueError(
+                        f"{player['name']} has already withdrawn from {self.name}."
+                    )
+                player["withdrawn"] = True
+                return player
+        raise ValueError(f"{chess_id} is not registered in {self.name}.")
+
     @property
     def is_overdue(self) -> bool:
         """
@@ -130,6 +230,7 @@ class Tournament:
             "current_round_index": self.current_round_index,
             "num_rounds": self.num_rounds,
             "is_complete": self.is_complete,
+            "seed": self.seed,
         }
 
     @classmethod
@@ -170,13 +271,65 @@ class Tournament:
             num_rounds=data.get("num_rounds", 4),
             filepath=filepath,
             is_complete=data.get("is_complete", False),
+            seed=data.get("seed"),
         )
 
+    @classmethod
+    def load(cls, filepath: Path) -> Tournament:
+        """
+        Loads a tournament from its JSON file, remembering which version of it was read.
+
+        Args:
+            filepath (Path): Path to the tournament's JSON file.
+
+        Returns:
+            Tournament: A Tournament instance.
+        """
+        version = file_version(filepath)
+        with open(filepath, "r") as f:
+            tournament = cls.from_dict(json.load(f), filepath)
+        tournament.version = version
+        return tournament
+
+    def snapshot(self) -> Tournament:
+        """
+        Copies the tournament, sharing no state with it.
+
+        Used to pair on another thread while this tournament keeps changing.
+
+        Returns:
+            Tournament: An independent copy, with its own pairing history.
+        """
+        data = self.to_dict()
+        data["players"] = [dict(p) for p in self.players]
+        copy = Tournament.from_dict(data, self.filepath)
+        copy.version = self.version
+        return copy
+
     def save(self) -> None:
         """
         Save the current tournament state to its JSON file.
+
+        The state is written to a temporary file, flushed to disk, and then
+        renamed over the tournament's, so readers never see a half-written
+        file and a crash leaves either the old or the new state.
+
+        Another program (e.g. the API server, or the menus) may save the same
+        file: under the file's lock, a state loaded from a version that is no
+        longer on disk is refused rather than written over the other's changes.
+
+        Raises:
+            TournamentChanged: If the file changed since this state was loaded.
         """
         if not self.filepath:
             raise ValueError("No filepath provided for saving.")
-        with open(self.filepath, "w") as f:
-            json.dump(self.to_dict(), f, default=str, indent=2)
+        partial = self.filepath.with_suffix(f".{os.getpid()}.tmp")
+        with locked(self.filepath), instrumentation.saving(self.filepath):
+            if self.version is not None and file_version(self.filepath) != self.version:
+                raise TournamentChanged(self.filepath)
+            with open(partial, "w") as f:
+                json.dump(self.to_dict(), f, default=str, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(partial, self.filepath)
+            self.version = file_version(self.filepath)
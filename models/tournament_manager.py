@@ -2,11 +2,48 @@ import json
 from datetime import datetime
 from pathlib import Path
 import re
-from typing import Optional
+import time
+from typing import Callable, Iterator, Optional
+
+import instrumentation
 
 from .tournament import Tournament
 
 
+def iter_tournaments(
+    datadir: Path, warn: Callable[[str], None] = print
+) -> Iterator[Tournament]:
+    """
+    Stream tournaments from a folder of JSON files, one file at a time.
+
+    Only the tournament currently being yielded is held in memory, which keeps
+    a pass over the whole archive cheap regardless of how many events it holds.
+    Each load is counted in the metrics, when they are collected.
+
+    Args:
+        datadir (Path): Folder containing tournament JSON files.
+        warn (Callable[[str], None]): Receives a message for each file that
+            cannot be loaded (printed by default).
+
+    Yields:
+        Tournament: Each valid tournament found in the folder.
+    """
+    for filepath in sorted(datadir.iterdir()):
+        if filepath.is_file() and filepath.suffix == ".json":
+            metrics = instrumentation.metrics()
+            start = time.perf_counter()
+            try:
+                tournament = Tournament.load(filepath)
+            except json.JSONDecodeError:
+                warn(f"{filepath} is an invalid JSON file.")
+            except (KeyError, TypeError, ValueError):
+                warn(f"{filepath} is not a valid tournament file.")
+            else:
+                if metrics is not None:
+                    metrics.loaded(time.perf_counter() - start)
+                yield tournament
+
+
 class TournamentManager:
     """
     Manages loading, creating, and storing tournaments from disk.
@@ -27,14 +64,7 @@ class TournamentManager:
         if not datadir.exists():
             datadir.mkdir(parents=True, exist_ok=True)
 
-        for filepath in datadir.iterdir():
-            if filepath.is_file() and filepath.suffix == ".json":
-                try:
-                    with open(filepath, "r") as f:
-                        data = json.load(f)
-                        self.tournaments.append(Tournament.from_dict(data, filepath))
-                except json.JSONDecodeError:
-                    print(filepath, "is an invalid JSON file.")
+        self.tournaments.extend(iter_tournaments(datadir))
 
     def _safe_filename(self, name: str) -> str:
         """
@@ -0,0 +1,183 @@
+"""
+Replays tournaments from their seed and recorded results.
+
+Every round is paired again with the same commands the application uses, on a
+copy of the tournament holding only the rounds before it, and the pairing is
+compared with the stored one (boards, colours and bye). Players who withdrew
+are treated as active in every round they were paired in.
+
+Rounds are paired without the time-limited search (see AdvanceRoundCmd), whose
+result depends on how far it gets in its budget, so every replay gives the same
+pairing. When that pairing has a rematch, the stored round was handed to the
+search and cannot be reproduced: it is reported as such, not as a mismatch
+(unless the search kept the matching engine's pairing, which is then checked).
+Rounds stored before tournaments had a seed are reported as mismatches.
+
+Usage: python replay.py [tournament.json ...] (defaults to data/tournaments)
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from commands import AdvanceRoundCmd, StartTournamentCmd
+from models import Match, Tournament
+from models.tournament_manager import iter_tournaments
+
+
+Board = Tuple[str, Optional[str]]
+
+
+def boards(matches: List[Match]) -> List[Board]:
+    """
+    Summarizes matches as (white, black) chess IDs, black being None for a bye.
+
+    Args:
+        matches (List[Match]): The matches of a round.
+
+    Returns:
+        List[Board]: One entry per board, in board order.
+    """
+    return [
+        (
+            m._get_chess_id(m.player1),
+            None if m.is_bye else m._get_chess_id(m.player2),
+        )
+        for m in matches
+    ]
+
+
+def replay(tournament: Tournament) -> List[dict]:
+    """
+    Regenerates every round of a tournament and checks it against the stored one.
+
+    Args:
+        tournament (Tournament): The tournament to replay (left unchanged).
+
+    Returns:
+        List[dict]: One report per round, with the round number, whether the
+        pairing matched, whether it went to the search, the first differing
+        board (if any) and the seconds taken.
+    """
+    players = [dict(p) for p in tournament.players]
+    copy = Tournament(
+        name=tournament.name,
+        start_date=tournament.start_date,
+        end_date=tournament.end_date,
+        venue=tournament.venue,
+        players=players,
+        num_rounds=tournament.num_rounds,
+        seed=tournament.seed,
+    )
+    withdrawn = {p["chess_id"] for p in tournament.players if p.get("withdrawn")}
+
+    reports = []
+    for index, stored in enumerate(tournament.rounds):
+        expected = boards(stored.matches)
+        paired = {cid for board in expected for cid in board if cid}
+        for player in players:
+            cid = player["chess_id"]
+            player["withdrawn"] = cid in withdrawn and cid not in paired
+
+        start = time.perf_counter()
+        if index == 0:
+            matches = StartTournamentCmd(copy).random_match_assignment()
+        else:
+            command = AdvanceRoundCmd(copy, search_budget=None)
+            matches = command.generate_match_pairings()
+        seconds = time.perf_counter() - start
+
+        actual = boards(matches)
+        searched = any(
+            black and copy.history.have_played(white, black) for white, black in actual
+        )
+        mismatch = next(
+            (
+                board
+                for board, (want, got) in enumerate(zip(expected, actual), 1)
+                if want != got
+            ),
+            None,
+        )
+        if mismatch is None and len(expected) != len(actual):
+            mismatch = min(len(expected), len(actual)) + 1
+        reports.append(
+            {
+                "round": stored.round_number,
+                "matches": mismatch is None,
+                "searched": searched,
+                "first_mismatch": mismatch,
+                "seconds": seconds,
+            }
+        )
+
+        # Later rounds are checked against the recorded pairing and results.
+        copy.add_round(stored)
+        copy.current_round_index = index
+
+    return reports
+
+
+def load(path: Path) -> Tournament:
+    """
+    Loads one tournament file.
+
+    Args:
+        path (Path): Path to the tournament's JSON file.
+
+    Returns:
+        Tournament: The tournament.
+    """
+    with open(path) as f:
+        return Tournament.from_dict(json.load(f), filepath=path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Replays the given tournaments (or the whole archive) and prints a report.
+
+    Args:
+        argv (Optional[List[str]]): Command-line arguments.
+
+    Returns:
+        int: 0 if every reproducible round was reproduced, 1 otherwise.
+    """
+    parser = argparse.ArgumentParser(
+        description="Regenerate tournament pairings from their seed and results."
+    )
+    parser.add_argument("files", nargs="*", type=Path, help="tournament JSON files")
+    args = parser.parse_args(argv)
+
+    if args.files:
+        tournaments = (load(path) for path in args.files)
+    else:
+        datadir = Path(__file__).resolve().parent / "data" / "tournaments"
+        tournaments = iter_tournaments(datadir)
+
+    ok = True
+    total = 0.0
+    for tournament in tournaments:
+        print(f"{tournament.name} (seed {tournament.seed})")
+        for report in replay(tournament):
+            total += report["seconds"]
+            if report["matches"]:
+                status = "ok"
+            elif report["searched"]:
+                status = "paired by the pairing search, not reproducible"
+            else:
+                status = f"MISMATCH from board {report['first_mismatch']}"
+                ok = False
+            print(
+                f"  Round {report['round']}: {status} "
+                f"({report['seconds'] * 1000:.1f} ms)"
+            )
+
+    print(f"Pairing time: {total:.3f} s")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,34 @@
-from .app_main import AppMainMenu
-from .clubs import ClubCreate, ClubView
-from .edit_tournament import EditTournamentView
-from .main_menu import MainMenu
-from .manage_tournament import (
-    TournamentView,
-    advance_round,
-    tournament_report,
-    start_tournament,
-)
-from .match import update_result
-from .register_player import PlayerRegistrationView
-from .players import PlayerEdit, PlayerView
-from .tournaments_main import TournamentsMainView, CreateTournament
+"""
+Screens of the application.
 
+This package is the registry the main loop routes through: a screen is
+imported from its module the first time it is used, so only the screens a
+session visits are ever loaded.
+"""
+
+import importlib
+
+# Exported name -> (module, attribute of the module).
+_SCREENS = {
+    "AppMainMenu": (".app_main", "AppMainMenu"),
+    "ClubCreate": (".clubs", "ClubCreate"),
+    "ClubView": (".clubs", "ClubView"),
+    "CreateTournament": (".tournaments_main", "CreateTournament"),
+    "EditTournamentView": (".edit_tournament", "EditTournamentView"),
+    "LeaderboardView": (".leaderboard", "LeaderboardView"),
+    "MainMenu": (".main_menu", "MainMenu"),
+    "PlayerEdit": (".players", "PlayerEdit"),
+    "PlayerView": (".players", "PlayerView"),
+    "PlayerRegistrationView": (".register_player", "PlayerRegistrationView"),
+    "TournamentsMainView": (".tournaments_main", "TournamentsMainView"),
+    "TournamentView": (".manage_tournament", "TournamentView"),
+    "start_tournament": (".manage_tournament", "start_tournament"),
+    "advance_round": (".manage_tournament", "advance_round"),
+    "tournament_report": (".manage_tournament", "tournament_report"),
+    "register_player_confirm": (".register_player", "run"),
+    "ScreenBuffer": (".rendering", "ScreenBuffer"),
+    "update_result": (".match", "update_result"),
+}
 
 __all__ = [
     "AppMainMenu",
@@ -20,6 +36,7 @@ __all__ = [
     "ClubView",
     "CreateTournament",
     "EditTournamentView",
+    "LeaderboardView",
     "MainMenu",
     "PlayerEdit",
     "PlayerView",
@@ -29,5 +46,32 @@ __all__ = [
     "start_tournament",
     "advance_round",
     "tournament_report",
+    "register_player_confirm",
+    "ScreenBuffer",
     "update_result",
 ]
+
+
+def __getattr__(name: str):
+    """
+    Imports an exported screen on first access.
+
+    Args:
+        name (str): The attribute looked up on the package.
+
+    Returns:
+        The screen class, function or module, cached on the package.
+
+    Raises:
+        AttributeError: If the name is not exported.
+    """
+    if name not in _SCREENS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _SCREENS[name]
+    value = getattr(importlib.import_module(module_name, __name__), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,7 +1,9 @@
-import re
+import sys
 from abc import ABC, abstractmethod
 from datetime import datetime
 
+from .rendering import ScreenBuffer
+
 
 class BaseScreen(ABC):
     """Abstract class for screen interaction"""
@@ -56,6 +58,8 @@ class BaseScreen(ABC):
 
     def input_regexp(self, regexp, error_message, **kwargs):
         """Utility function to get a string matching a regular expression"""
+        import re  # Only needed by a few forms: kept off the start-up path.
+
         while True:
             value = self.input_string(**kwargs)
             if re.match(regexp, value):
@@ -122,7 +126,23 @@ class BaseScreen(ABC):
                 )
 
     def run(self):
-        """Main method to 'run' the screen - displays a message and gets a command"""
+        """
+        Main method to 'run' the screen - displays a message and gets a command.
+
+        The screen is composed in a ScreenBuffer and written when it first waits
+        for input. The application installs one for the whole session, so that
+        consecutive screens are redrawn in place; otherwise one is used for
+        this screen only.
+        """
+        if isinstance(sys.stdout, ScreenBuffer):
+            sys.stdout.begin_frame()
+            return self._run()
+
+        with ScreenBuffer(sys.stdout, redraw=False) as buffer:
+            buffer.begin_frame()
+            return self._run()
+
+    def _run(self):
         message = getattr(self, "display", None)
 
         if message and callable(message):
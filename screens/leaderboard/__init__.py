@@ -0,0 +1 @@
+from .view import LeaderboardView  # noqa: F401
@@ -0,0 +1,69 @@
+from commands import NoopCmd
+from models import PlayerStatsIndex
+from models.player_stats import STAT_FIELDS
+
+from ..base_screen import BaseScreen
+
+
+class LeaderboardView(BaseScreen):
+    """
+    Screen displaying the lifetime leaderboard across all tournaments.
+
+    Players are ranked by one lifetime statistic (points by default),
+    and only the top entries are retrieved from the statistics index.
+    """
+
+    def __init__(self, key: str = "points", limit: int = 10) -> None:
+        """
+        Initialize the leaderboard.
+
+        Args:
+            key (str): The statistic to rank players by.
+            limit (int): Number of players to show.
+        """
+        self.key = key
+        self.limit = limit
+        self.index = PlayerStatsIndex.load()
+
+    def display(self) -> None:
+        """Displays the top players for the selected statistic."""
+        print(f"\n🏆 Lifetime Leaderboard - Top {self.limit} by {self.key} 🏆\n")
+
+        top = self.index.top(self.limit, self.key)
+        if not top:
+            print("No results recorded yet.")
+
+        for i, (cid, stats) in enumerate(top, 1):
+            print(
+                f"{i}. {stats.get('name', cid)} ({cid}) | {stats['points']} points, "
+                f"{stats['games']} games (W {stats['wins']} / D {stats['draws']} / "
+                f"L {stats['losses']}), {stats['tournaments']} tournaments"
+            )
+
+    def display_menu(self) -> NoopCmd:
+        """
+        Prompts the user to re-rank the leaderboard or go back.
+
+        Returns:
+            NoopCmd: The next command to execute.
+        """
+        print("\nPlease select your action from the options below:")
+        print("# - Enter a number to change how many players are shown")
+        print(f"S - Rank by another statistic ({', '.join(STAT_FIELDS)})")
+        print("T - Return to the tournaments main menu")
+
+        choice = self.input_string("Choice").strip().upper()
+
+        if choice.isdigit() and int(choice) > 0:
+            return NoopCmd("leaderboard", key=self.key, limit=int(choice))
+        if choice == "S":
+            key = self.input_string("Statistic", default=self.key).strip().lower()
+            if key in STAT_FIELDS:
+                return NoopCmd("leaderboard", key=key, limit=self.limit)
+            print(f"‼️ Unknown statistic: {key}")
+        elif choice == "T":
+            return NoopCmd("tournaments-main")
+        else:
+            print("‼️ Invalid input. Please choose a valid option.")
+
+        return NoopCmd("leaderboard", key=self.key, limit=self.limit)
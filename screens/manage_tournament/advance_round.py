@@ -24,7 +24,7 @@ def run(tournament: Tournament) -> Context:
         Context: Resulting context from AdvanceRoundCmd, or back to view if canceled.
     """
     if confirm_round_advance():
-        return AdvanceRoundCmd(tournament).execute()
+        return AdvanceRoundCmd(tournament)()
     else:
         print("‼️ Round advancement canceled.")
         return Context("tournament-view", tournament=tournament)
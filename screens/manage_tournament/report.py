@@ -12,4 +12,4 @@ def run(tournament: Tournament) -> Context:
     Returns:
         Context: Returns to the tournament view.
     """
-    return TournamentReportCmd(tournament).execute()
+    return TournamentReportCmd(tournament)()
@@ -12,4 +12,4 @@ def run(tournament: Tournament) -> Context:
     Returns:
         Context: Redirect to tournament-view with updated state.
     """
-    return StartTournamentCmd(tournament).execute()
+    return StartTournamentCmd(tournament)()
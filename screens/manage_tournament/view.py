@@ -1,6 +1,7 @@
-from commands import NoopCmd
+from commands import NoopCmd, WithdrawPlayerCmd
 from models import Tournament
-from models.match import PLAYER1, PLAYER2, DRAW
+from models.match import PLAYER1, PLAYER2, DRAW, BYE_POINTS
+from screens.match.enter_results import run as enter_match_results_screen
 from screens.match.update_result import run as update_match_result_screen
 
 from ..base_screen import BaseScreen
@@ -48,7 +49,8 @@ class TournamentView(BaseScreen):
             cid = p["chess_id"]
             club = p["club_name"]
             pts = scores.get(cid, 0.0)
-            print(f"{i}. {name} ({cid}) from {club} | Tournament Points: {pts}")
+            status = " (withdrawn)" if p.get("withdrawn") else ""
+            print(f"{i}. {name} ({cid}) from {club}{status} | Tournament Points: {pts}")
 
     def display_current_matches(self) -> None:
         """Displays match pairings and results for the current round."""
@@ -63,6 +65,11 @@ class TournamentView(BaseScreen):
 
         for i, match in enumerate(rnd.matches, 1):
             p1 = match._get_name(match.player1)
+
+            if match.is_bye:
+                print(f"{i}. {p1} has a bye ({BYE_POINTS} point)\n")
+                continue
+
             p2 = match._get_name(match.player2)
 
             if match.winner == DRAW:
@@ -92,6 +99,26 @@ class TournamentView(BaseScreen):
             print(f"\nRound {round_num} of {self.tournament.num_rounds}")
             self.display_current_matches()
 
+    def withdraw_player(self) -> NoopCmd | WithdrawPlayerCmd:
+        """
+        Prompts for a registrant to withdraw from the following rounds.
+
+        Returns:
+            NoopCmd | WithdrawPlayerCmd: The withdrawal, or back to the view if canceled.
+        """
+        active = self.tournament.active_players
+        for i, p in enumerate(active, 1):
+            print(f"{i}. {p['name']} ({p['chess_id']}) - {p['club_name']}")
+
+        selection = self.input_string(
+            "#️⃣ Enter number to withdraw, or press Enter to cancel"
+        ).strip()
+        if selection.isdigit() and 0 <= int(selection) - 1 < len(active):
+            return WithdrawPlayerCmd(
+                self.tournament, active[int(selection) - 1]["chess_id"]
+            )
+        return NoopCmd("tournament-view", tournament=self.tournament)
+
     def display_menu(self) -> NoopCmd:
         """
         Displays a context-sensitive action menu and returns a NoopCmd for the next screen.
@@ -121,12 +148,25 @@ class TournamentView(BaseScreen):
 
         else:
             print("# - Enter the number of a match to enter or update result")
+            print(
+                "Q - Quick entry: several results on one line (e.g. 1:1 2:d NG39713:w)"
+            )
             print(f"A - Advance {self.tournament.name} to the next round")
+            print("W - Withdraw a player from the following rounds")
             print("R - Generate a tournament report")
             print("T - Return to the tournaments main menu")
             print("B - Return to the program main menu")
 
-        choice = self.input_string("Choice").strip().upper()
+        entry = self.input_string("Choice").strip()
+        choice = entry.upper()
+
+        in_progress = (
+            self.tournament.current_round_index >= 0 and not self.tournament.is_complete
+        )
+        if in_progress and (choice == "Q" or ":" in choice):
+            # Results typed straight at this prompt are entered without asking again.
+            enter_match_results_screen(self.tournament, "" if choice == "Q" else entry)
+            return NoopCmd("tournament-view", tournament=self.tournament)
 
         if choice.isdigit():
             match_index = int(choice) - 1
@@ -143,6 +183,8 @@ class TournamentView(BaseScreen):
             return NoopCmd("tournament-report", tournament=self.tournament)
         if choice == "A" and not self.tournament.is_complete:
             return NoopCmd("advance-round", tournament=self.tournament)
+        if choice == "W" and in_progress:
+            return self.withdraw_player()
         if choice == "T":
             return NoopCmd("tournaments-main")
         if choice == "B":
@@ -0,0 +1,51 @@
+from commands import MatchResultsCmd, Context
+from commands.match_results import parse_results
+from models import Tournament
+
+
+def run(tournament: Tournament, line: str = "") -> Context:
+    """
+    Enters results for several matches of the current round from one line.
+
+    Entries look like "1:1 2:d 3:2 NG39713:w": a match number and its result,
+    or a Chess ID and that player's result. All of them are applied with one
+    command and one save.
+
+    Args:
+        tournament (Tournament): The active tournament instance.
+        line (str): Entries already typed; prompts for them if empty.
+
+    Returns:
+        Context: Updated tournament context after the results are applied.
+
+    User Options:
+        #:1, #:2, #:d - Player 1 wins, player 2 wins, or draw on match #
+        ChessID:w, ChessID:l, ChessID:d - The player won, lost, or drew
+    """
+    current_index = tournament.current_round_index
+
+    if current_index < 0 or current_index >= len(tournament.rounds):
+        print("‼️ No active round to update.")
+        return Context("tournament-view", tournament=tournament)
+
+    rnd = tournament.rounds[current_index]
+
+    while True:
+        if not line:
+            line = input(
+                "Results (e.g. 1:1 2:d 3:2 NG39713:w), or press Enter to cancel: "
+            ).strip()
+            if not line:
+                return Context("tournament-view", tournament=tournament)
+        try:
+            results = parse_results([line], rnd)
+        except ValueError as e:
+            message = str(e).removeprefix("Line 1: ")
+            print(f"‼️ {message[:1].upper()}{message[1:]}")
+            line = ""
+            continue
+
+        context = MatchResultsCmd(tournament, results)()
+        left = sum(not match.completed for match in rnd.matches)
+        print(f"✅ {len(results)} results entered, {left} matches still to play.")
+        return context
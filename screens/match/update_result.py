@@ -31,6 +31,10 @@ def run(tournament: Tournament, match_index: int) -> Context:
         return Context("tournament-view", tournament=tournament)
 
     match = matches[match_index]
+    if match.is_bye:
+        print("‼️ This board is a bye: there is no result to enter.")
+        return Context("tournament-view", tournament=tournament)
+
     p1 = match._get_name(match.player1)
     p2 = match._get_name(match.player2)
 
@@ -41,6 +45,6 @@ def run(tournament: Tournament, match_index: int) -> Context:
             .lower()
         )
         if result in {"1", "2", "d"}:
-            return MatchResultsCmd(tournament, {match_index: result}).execute()
+            return MatchResultsCmd(tournament, {match_index: result})()
         else:
             print("‼️ Invalid input. Please enter 1, 2, or d.")
@@ -1,4 +1,5 @@
 from commands import NoopCmd
+from models import HeadToHeadIndex, PlayerStatsIndex
 
 from ..base_screen import BaseScreen
 
@@ -9,6 +10,7 @@ class PlayerView(BaseScreen):
     def __init__(self, club, player=None):
         self.club = club
         self.player = player
+        self.stats = PlayerStatsIndex.load()
 
     def display(self):
         print("##", self.club.name)
@@ -17,11 +19,41 @@ class PlayerView(BaseScreen):
         print("Chess ID:", self.player.chess_id)
         print("Birthdate:", self.player.birthday)
 
+        stats = self.stats.get(self.player.chess_id)
+        print(
+            f"Lifetime: {stats['tournaments']} tournaments, {stats['games']} games "
+            f"(W {stats['wins']} / D {stats['draws']} / L {stats['losses']}), "
+            f"{stats['points']} points"
+        )
+
+    def display_head_to_head(self, opponent_id):
+        """Displays the player's record and games against another player"""
+        index = HeadToHeadIndex.load()
+        games = index.games(self.player.chess_id, opponent_id)
+        if not games:
+            print(f"No games found between {self.player.chess_id} and {opponent_id}.")
+            return
+
+        wins, draws, losses = index.record(self.player.chess_id, opponent_id)
+        print(f"Head-to-head vs {opponent_id}: W {wins} / D {draws} / L {losses}")
+        for game in games:
+            if game["result"] == self.player.chess_id:
+                result = "Win"
+            elif game["result"] == opponent_id:
+                result = "Loss"
+            else:
+                result = "Draw"
+            print(f"- {game['tournament']}, Round {game['round']}: {result}")
+
     def display_menu(self):
         while True:
             print("Type 'E' to edit the player, or 'B' to go back to club view.")
+            print("Type 'H' to see the head-to-head record against another player.")
             action = self.input_string()
             if action.upper() == "B":
                 return NoopCmd("club-view", club=self.club)
             elif action.upper() == "E":
                 return NoopCmd("player-edit", club=self.club, player=self.player)
+            elif action.upper() == "H":
+                opponent_id = self.input_chess_id(prompt="Opponent Chess ID")
+                self.display_head_to_head(opponent_id)
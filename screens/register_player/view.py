@@ -15,11 +15,10 @@ class PlayerRegistrationView(BaseScreen):
     by direct selection, search, or navigating to the club management screen.
     """
 
-    def __init__(self, tournament: Tournament):
+    def __init__(self, tournament: Tournament, club_dir: Path = Path("data/clubs")):
         self.tournament = tournament
         self.players: list[dict[str, str]] = []
 
-        club_dir = Path("data/clubs")
         for club_file in club_dir.glob("*.json"):
             try:
                 with open(club_file, "r") as f:
@@ -31,6 +30,22 @@ class PlayerRegistrationView(BaseScreen):
             except (json.JSONDecodeError, FileNotFoundError):
                 print(f"‼️ Failed to load club file: {club_file}")
 
+    def search_players(self, query: str) -> list[dict[str, str]]:
+        """
+        Finds club members whose chess ID or name contains the query.
+
+        Args:
+            query (str): Lowercase part of a chess ID or name.
+
+        Returns:
+            list[dict[str, str]]: The matching members, in club order.
+        """
+        return [
+            p
+            for p in self.players
+            if query in p["chess_id"].lower() or query in p["name"].lower()
+        ]
+
     def display_players(self) -> None:
         print("\n♟️ Registration Page ♟️\n")
         print("Available players:")
@@ -113,11 +128,7 @@ class PlayerRegistrationView(BaseScreen):
                     if not query:
                         break
 
-                    results = [
-                        p
-                        for p in self.players
-                        if query in p["chess_id"].lower() or query in p["name"].lower()
-                    ]
+                    results = self.search_players(query)
 
                     if not results:
                         input(
@@ -0,0 +1,192 @@
+import io
+import os
+import sys
+
+HOME = "\x1b[H"
+CLEAR_SCREEN = "\x1b[2J"
+CLEAR_LINE = "\x1b[K"
+CLEAR_BELOW = "\x1b[J"
+
+
+def supports_redraw(stream: io.TextIOBase) -> bool:
+    """
+    Checks whether a stream is a terminal that understands cursor movement.
+
+    Args:
+        stream (io.TextIOBase): The output stream.
+
+    Returns:
+        bool: True for an interactive terminal other than a "dumb" one.
+    """
+    try:
+        interactive = stream.isatty()
+    except (AttributeError, ValueError):
+        return False
+    return interactive and os.environ.get("TERM", "") not in ("", "dumb")
+
+
+def display_width(line: str) -> int:
+    """
+    Estimates the number of terminal columns a line takes.
+
+    Wide characters (emoji, CJK) count as two columns and variation selectors
+    and combining marks as none. The estimate only decides whether a line may
+    wrap, so it errs on the wide side.
+
+    Args:
+        line (str): The line, without its newline.
+
+    Returns:
+        int: The estimated width.
+    """
+    width = 0
+    for char in line:
+        code = ord(char)
+        if 0xFE00 <= code <= 0xFE0F or 0x0300 <= code <= 0x036F or code == 0x200D:
+            continue
+        width += 2 if code >= 0x1100 else 1
+    return width
+
+
+class ScreenBuffer:
+    """
+    Standard output replacement that composes each screen into one buffer.
+
+    Everything printed is held until the program waits for input (or the
+    buffer is closed), then written with a single call. A screen's frame is
+    what is printed from the start of its `run` to its first prompt, including
+    messages printed since the previous prompt.
+
+    On a terminal that supports it, each frame is drawn from the top of the
+    window, and only the lines that differ from the previous frame are
+    rewritten; frames taller than the window, or with lines that may wrap,
+    are written in full.
+
+    Attributes:
+        stream (io.TextIOBase): The real output stream.
+        redraw (bool): Whether frames are drawn in place, changed lines only.
+        transcript (Callable[[str], None] | None): Given everything written,
+            as printed (without cursor movements), at each flush.
+    """
+
+    def __init__(
+        self,
+        stream: io.TextIOBase | None = None,
+        redraw: bool | None = None,
+        transcript=None,
+    ) -> None:
+        """
+        Initialize the buffer.
+
+        Args:
+            stream (io.TextIOBase | None): Output stream (default: the process's standard output).
+            redraw (bool | None): Draw frames in place (default: if the stream supports it).
+            transcript (Callable[[str], None] | None): Receives the printed text at each flush.
+        """
+        self.stream = stream or sys.__stdout__
+        self.redraw = supports_redraw(self.stream) if redraw is None else redraw
+        self.transcript = transcript
+        self._parts: list[str] = []
+        self._frame_started = False
+        self._previous: list[str] | None = None
+        self._rows_below = 0
+        self._saved: io.TextIOBase | None = None
+
+    # Text stream interface used by print() and input().
+
+    def write(self, text: str) -> int:
+        self._parts.append(text)
+        return len(text)
+
+    def writelines(self, lines) -> None:
+        self._parts.extend(lines)
+
+    def fileno(self) -> int:
+        return self.stream.fileno()
+
+    def isatty(self) -> bool:
+        return self.stream.isatty()
+
+    @property
+    def encoding(self) -> str:
+        return getattr(self.stream, "encoding", "utf-8")
+
+    def flush(self) -> None:
+        """Writes out everything composed since the last flush, in one write."""
+        text = "".join(self._parts)
+        self._parts.clear()
+        if self.transcript is not None and text:
+            self.transcript(text)
+
+        if self._frame_started:
+            self._frame_started = False
+            text = self.compose(text)
+        else:
+            # Output after a frame's first prompt: replies, errors, prompts again.
+            self._rows_below += text.count("\n")
+        # The reader's answer and Enter may follow any flush.
+        self._rows_below += 1
+
+        if text:
+            self.stream.write(text)
+        self.stream.flush()
+
+    # Frames.
+
+    def begin_frame(self) -> None:
+        """Marks the output pending from now to the next flush as a new frame."""
+        self._frame_started = True
+
+    def _size(self) -> os.terminal_size:
+        try:
+            return os.get_terminal_size(self.stream.fileno())
+        except (AttributeError, OSError, ValueError):
+            return os.terminal_size((80, 24))
+
+    def compose(self, text: str) -> str:
+        """
+        Turns a frame into the text to write: itself, or only its changed lines.
+
+        Args:
+            text (str): The frame, as printed.
+
+        Returns:
+            str: What to write to the stream.
+        """
+        if not self.redraw:
+            return text
+
+        columns, rows = self._size()
+        lines = text.split("\n")
+        previous, self._previous = self._previous, None
+        rows_below, self._rows_below = self._rows_below, 0
+
+        if len(lines) >= rows or any(display_width(line) >= columns for line in lines):
+            # It would scroll: positions in it cannot be addressed next time.
+            return HOME + CLEAR_SCREEN + text
+        self._previous = lines
+
+        if previous is None or len(previous) + rows_below >= rows:
+            return HOME + CLEAR_SCREEN + text
+
+        out = []
+        last = len(lines) - 1
+        for row, line in enumerate(lines):
+            if row == last or row >= len(previous) or previous[row] != line:
+                out.append(f"\x1b[{row + 1};1H{line}{CLEAR_LINE}")
+        # The cursor ends after the last line; clear what the last frame left below.
+        out.append(CLEAR_BELOW)
+        return "".join(out)
+
+    # Installation as standard output.
+
+    def __enter__(self) -> "ScreenBuffer":
+        self._saved = sys.stdout
+        sys.stdout = self
+        return self
+
+    def __exit__(self, *exc) -> None:
+        try:
+            self.flush()
+        finally:
+            sys.stdout = self._saved
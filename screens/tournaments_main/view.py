@@ -10,7 +10,7 @@ class TournamentsMainView(BaseScreen):
     """
 
     def __init__(self) -> None:
-        context = TournamentListCmd().execute()
+        context = TournamentListCmd()()
         self.tournaments: list[Tournament] = context.kwargs.get("tournaments", [])
 
     def display(self) -> None:
@@ -48,6 +48,7 @@ class TournamentsMainView(BaseScreen):
         Options:
             Select a tournament.
             Create a new tournament.
+            View the lifetime leaderboard.
             Return to program menu.
 
         Returns:
@@ -57,6 +58,7 @@ class TournamentsMainView(BaseScreen):
         print()
         print("# - Enter the number of a tournament to view/manage it")
         print("N - Create a new tournament")
+        print("L - View the lifetime leaderboard")
         print("B - Return to program main menu")
 
         while True:
@@ -68,6 +70,9 @@ class TournamentsMainView(BaseScreen):
             if choice == "N":
                 return NoopCmd("tournament-create")
 
+            if choice == "L":
+                return NoopCmd("leaderboard")
+
             if choice.isdigit():
                 index = int(choice) - 1
                 if 0 <= index < len(self.tournaments):
@@ -75,5 +80,5 @@ class TournamentsMainView(BaseScreen):
                     return NoopCmd("tournament-view", tournament=selected)
 
             print(
-                "‼️ Invalid input. Please enter a valid number (e.g. 1, 2, 3...), N, or B."
+                "‼️ Invalid input. Please enter a valid number (e.g. 1, 2, 3...), N, L, or B."
             )
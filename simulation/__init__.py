@@ -0,0 +1,21 @@
+"""
+What-if analyses of tournaments in progress.
+
+Run ``python -m simulation`` to simulate the rest of a tournament.
+"""
+
+from .monte_carlo import Tables, play_out, simulate
+from .results import EloModel, FixedOdds, ResultModel
+from .state import TournamentState, decode, encode
+
+__all__ = [
+    "decode",
+    "EloModel",
+    "encode",
+    "FixedOdds",
+    "play_out",
+    "ResultModel",
+    "simulate",
+    "Tables",
+    "TournamentState",
+]
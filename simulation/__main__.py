@@ -0,0 +1,54 @@
+"""
+Simulates the rest of a tournament and prints each player's chances.
+
+Usage: python -m simulation data/tournaments/my-open.json [--runs 5000] [--workers N]
+       [--white 0.4] [--draw 0.2] [--ratings ratings.json]
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from models import Tournament
+
+from .monte_carlo import print_tables, simulate
+from .results import EloModel, FixedOdds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Simulate the rest of a tournament many times."
+    )
+    parser.add_argument("file", type=Path, help="tournament JSON file")
+    parser.add_argument("--runs", type=int, default=5000, help="number of simulations")
+    parser.add_argument("--workers", type=int, help="worker processes")
+    parser.add_argument("--batch", type=int, default=50, help="simulations per task")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument(
+        "--white", type=float, default=0.4, help="probability that white wins"
+    )
+    parser.add_argument("--draw", type=float, default=0.2, help="probability of a draw")
+    parser.add_argument(
+        "--ratings",
+        type=Path,
+        help="JSON file of ratings by chess ID (Elo odds instead of fixed odds)",
+    )
+    args = parser.parse_args()
+
+    with open(args.file) as f:
+        tournament = Tournament.from_dict(json.load(f), filepath=args.file)
+    if args.ratings:
+        with open(args.ratings) as f:
+            model = EloModel(json.load(f), draw=args.draw)
+    else:
+        model = FixedOdds(args.white, args.draw)
+
+    names = {p["chess_id"]: p["name"] for p in tournament.players}
+    step = max(args.runs // 10, 1)
+    reported = 0
+    for tables in simulate(
+        tournament, args.runs, model, args.workers, args.batch, args.seed
+    ):
+        if tables.runs - reported >= step or tables.runs == args.runs:
+            reported = tables.runs
+            print_tables(tables, names)
@@ -0,0 +1,239 @@
+"""
+Monte Carlo simulation of the rest of a tournament.
+
+The tournament is encoded once and sent to every worker process. Each run
+plays the unfinished games and remaining rounds with the application's own
+pairing commands and a result model, and the workers send back small partial
+tables that are merged as they finish.
+"""
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, List, Optional
+
+from commands import AdvanceRoundCmd, StartTournamentCmd
+from models import Round, Tournament
+
+from .results import FixedOdds, ResultModel
+from .state import TournamentState, decode, encode
+
+
+class Tables:
+    """
+    Aggregate outcome counts over a number of simulated runs.
+
+    Lists are indexed like TournamentState.chess_ids.
+
+    Attributes:
+        chess_ids (tuple): Chess IDs of the registrants.
+        runs (int): Number of runs counted.
+        wins (List[int]): Runs finished first, by registrant.
+        top3 (List[int]): Runs finished in the top three, by registrant.
+        points (List[float]): Points summed over all runs, by registrant.
+        rematches (int): Rematches paired over all runs.
+        runs_with_rematch (int): Runs in which at least one rematch was paired.
+    """
+
+    def __init__(self, chess_ids: tuple) -> None:
+        """
+        Initialize empty tables.
+
+        Args:
+            chess_ids (tuple): Chess IDs of the registrants.
+        """
+        self.chess_ids = chess_ids
+        self.runs = 0
+        self.wins = [0] * len(chess_ids)
+        self.top3 = [0] * len(chess_ids)
+        self.points = [0.0] * len(chess_ids)
+        self.rematches = 0
+        self.runs_with_rematch = 0
+
+    def merge(self, other: "Tables") -> None:
+        """
+        Adds another set of tables (over the same registrants) to this one.
+
+        Args:
+            other (Tables): Tables from another batch of runs.
+        """
+        self.runs += other.runs
+        for mine, theirs in (
+            (self.wins, other.wins),
+            (self.top3, other.top3),
+            (self.points, other.points),
+        ):
+            for i, value in enumerate(theirs):
+                mine[i] += value
+        self.rematches += other.rematches
+        self.runs_with_rematch += other.runs_with_rematch
+
+    def probabilities(self) -> List[dict]:
+        """
+        Gets each registrant's chances, most likely winner first.
+
+        Returns:
+            List[dict]: One row per registrant with chess_id, win, top3 and
+            expected_points.
+        """
+        runs = self.runs or 1
+        rows = [
+            {
+                "chess_id": cid,
+                "win": self.wins[i] / runs,
+                "top3": self.top3[i] / runs,
+                "expected_points": self.points[i] / runs,
+            }
+            for i, cid in enumerate(self.chess_ids)
+        ]
+        rows.sort(key=lambda row: (row["win"], row["top3"]), reverse=True)
+        return rows
+
+
+def play_out(tournament: Tournament, model: ResultModel, rng: random.Random) -> int:
+    """
+    Plays every unfinished game and remaining round of an in-memory tournament.
+
+    Rounds are paired by StartTournamentCmd and AdvanceRoundCmd, without the
+    time-limited rematch search.
+
+    Args:
+        tournament (Tournament): The tournament to finish (modified in place).
+        model (ResultModel): Decides the result of each game.
+        rng (random.Random): Source of randomness for results.
+
+    Returns:
+        int: Number of rematches paired.
+    """
+    rematches = 0
+    index = tournament.current_round_index
+    while True:
+        if index >= 0:
+            for match in tournament.rounds[index].matches:
+                if not match.completed:
+                    white = match._get_chess_id(match.player1)
+                    black = match._get_chess_id(match.player2)
+                    match.update_result(model.result(white, black, rng))
+            tournament.rounds[index].is_complete = True
+
+        if index + 1 >= tournament.num_rounds:
+            break
+
+        if index < 0:
+            matches = StartTournamentCmd(tournament).random_match_assignment()
+        else:
+            matches = AdvanceRoundCmd(tournament, None).generate_match_pairings()
+            history = tournament.history
+            rematches += sum(
+                history.have_played(
+                    m._get_chess_id(m.player1), m._get_chess_id(m.player2)
+                )
+                for m in matches
+                if not m.is_bye
+            )
+        index += 1
+        tournament.add_round(Round(round_number=index + 1, matches=matches))
+        tournament.current_round_index = index
+
+    tournament.is_complete = True
+    return rematches
+
+
+_state: Optional[TournamentState] = None
+_model: Optional[ResultModel] = None
+
+
+def _init_worker(state: TournamentState, model: ResultModel) -> None:
+    global _state, _model
+    _state, _model = state, model
+
+
+def _run_batch(first: int, count: int, seed: int) -> Tables:
+    """Runs `count` simulations in a worker, numbered from `first`."""
+    tables = Tables(_state.chess_ids)
+    for run in range(first, first + count):
+        run_seed = seed * 1_000_003 + run
+        rng = random.Random(run_seed)
+        tournament = decode(_state, run_seed)
+
+        rematches = play_out(tournament, _model, rng)
+        tables.rematches += rematches
+        tables.runs_with_rematch += rematches > 0
+
+        # Equal scores are ranked at random, as the pairing engine does.
+        scores = tournament.player_scores()
+        ranking = sorted(
+            range(len(_state.chess_ids)),
+            key=lambda i: (-scores[_state.chess_ids[i]], rng.random()),
+        )
+        tables.wins[ranking[0]] += 1
+        for i in ranking[:3]:
+            tables.top3[i] += 1
+        for i, cid in enumerate(_state.chess_ids):
+            tables.points[i] += scores[cid]
+        tables.runs += 1
+    return tables
+
+
+def simulate(
+    tournament: Tournament,
+    runs: int,
+    model: Optional[ResultModel] = None,
+    workers: Optional[int] = None,
+    batch: int = 50,
+    seed: int = 0,
+) -> Iterator[Tables]:
+    """
+    Simulates the rest of a tournament many times across worker processes.
+
+    Args:
+        tournament (Tournament): The tournament as it stands (left unchanged).
+        runs (int): Number of simulations.
+        model (Optional[ResultModel]): Result model (even odds with 20% draws by default).
+        workers (Optional[int]): Number of worker processes (defaults to the CPU count).
+        batch (int): Simulations per task sent to a worker.
+        seed (int): Seed of the simulations; the same seed gives the same tables.
+
+    Yields:
+        Tables: The tables over every run finished so far, after each batch.
+    """
+    state = encode(tournament)
+    model = model or FixedOdds()
+    tables = Tables(state.chess_ids)
+
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count() or 1,
+        initializer=_init_worker,
+        initargs=(state, model),
+    ) as executor:
+        futures = [
+            executor.submit(_run_batch, first, min(batch, runs - first), seed)
+            for first in range(0, runs, batch)
+        ]
+        for future in as_completed(futures):
+            tables.merge(future.result())
+            yield tables
+
+
+def print_tables(tables: Tables, names: dict[str, str], limit: int = 20) -> None:
+    """
+    Prints the probability table and rematch frequency.
+
+    Args:
+        tables (Tables): The tables to print.
+        names (dict[str, str]): Player names by chess ID.
+        limit (int): Number of players to list.
+    """
+    print(f"\n{tables.runs} simulated runs")
+    print(f"{'Player':<30} {'Win':>7} {'Top 3':>7} {'Exp. pts':>9}")
+    for row in tables.probabilities()[:limit]:
+        name = f"{names.get(row['chess_id'], row['chess_id'])} ({row['chess_id']})"
+        print(
+            f"{name:<30} {row['win']:>7.1%} {row['top3']:>7.1%} "
+            f"{row['expected_points']:>9.2f}"
+        )
+    runs = tables.runs or 1
+    print(
+        f"Rematches: {tables.rematches / runs:.3f} per run, "
+        f"in {tables.runs_with_rematch / runs:.1%} of runs"
+    )
@@ -0,0 +1,107 @@
+import random
+from abc import ABCMeta, abstractmethod
+from typing import Optional
+
+from models.match import PLAYER1, PLAYER2, DRAW
+
+
+class ResultModel(metaclass=ABCMeta):
+    """
+    Decides the result of a simulated game.
+
+    Models are sent to worker processes, so subclasses must be picklable
+    (plain attributes only).
+    """
+
+    @abstractmethod
+    def result(self, white: str, black: str, rng: random.Random) -> str:
+        """
+        Draws the result of one game.
+
+        Args:
+            white (str): Chess ID of the player with white.
+            black (str): Chess ID of the player with black.
+            rng (random.Random): Source of randomness of the simulation run.
+
+        Returns:
+            str: "player1" (white wins), "player2" (black wins) or "draw".
+        """
+
+
+class FixedOdds(ResultModel):
+    """
+    Every game has the same odds, whoever plays it.
+
+    Attributes:
+        white (float): Probability that white wins.
+        draw (float): Probability of a draw (black wins otherwise).
+    """
+
+    def __init__(self, white: float = 0.4, draw: float = 0.2) -> None:
+        """
+        Initialize the model.
+
+        Args:
+            white (float): Probability that white wins.
+            draw (float): Probability of a draw.
+
+        Raises:
+            ValueError: If the probabilities are negative or add up to more than 1.
+        """
+        if white < 0 or draw < 0 or white + draw > 1:
+            raise ValueError("Result probabilities must be between 0 and 1.")
+        self.white = white
+        self.draw = draw
+
+    def result(self, white: str, black: str, rng: random.Random) -> str:
+        roll = rng.random()
+        if roll < self.white:
+            return PLAYER1
+        if roll < self.white + self.draw:
+            return DRAW
+        return PLAYER2
+
+
+class EloModel(ResultModel):
+    """
+    Odds follow the Elo expected score of the two players' ratings.
+
+    A fixed share of the expected score is turned into draws, and the rest is
+    split into wins for either side.
+
+    Attributes:
+        ratings (dict[str, float]): Rating by chess ID.
+        default (float): Rating of players missing from `ratings`.
+        draw (float): Probability of a draw between equally rated players.
+    """
+
+    def __init__(
+        self,
+        ratings: Optional[dict[str, float]] = None,
+        default: float = 1500.0,
+        draw: float = 0.2,
+    ) -> None:
+        """
+        Initialize the model.
+
+        Args:
+            ratings (Optional[dict[str, float]]): Rating by chess ID.
+            default (float): Rating of players missing from `ratings`.
+            draw (float): Probability of a draw between equally rated players.
+        """
+        self.ratings = ratings or {}
+        self.default = default
+        self.draw = draw
+
+    def result(self, white: str, black: str, rng: random.Random) -> str:
+        diff = self.ratings.get(black, self.default) - self.ratings.get(
+            white, self.default
+        )
+        expected = 1 / (1 + 10 ** (diff / 400))
+        draw = self.draw * 2 * min(expected, 1 - expected)
+        roll = rng.random()
+        if roll < expected - draw / 2:
+            return PLAYER1
+        if roll < expected + draw / 2:
+            return DRAW
+        return PLAYER2
@@ -0,0 +1,129 @@
+from array import array
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Tuple
+
+from models import Match, Round, Tournament
+from models.match import PLAYER1, PLAYER2, DRAW
+
+
+# Result codes of an encoded board.
+PENDING, WHITE_WINS, BLACK_WINS, DRAWN, BYE_CODE = range(5)
+NO_PLAYER = -1
+
+RESULT_CODES = {None: PENDING, PLAYER1: WHITE_WINS, PLAYER2: BLACK_WINS, DRAW: DRAWN}
+RESULTS = {code: result for result, code in RESULT_CODES.items()}
+
+
+@dataclass(frozen=True)
+class TournamentState:
+    """
+    Compact, picklable snapshot of a tournament's pairings and results.
+
+    Registrants are numbered by registration order, and each round is a flat
+    array of (white, black, result) integer triples, black being NO_PLAYER for
+    a bye. The snapshot is sent once to each worker process and decoded there.
+
+    Attributes:
+        chess_ids (Tuple[str, ...]): Chess IDs in registration order.
+        withdrawn (bytes): 1 for each registrant who has withdrawn, else 0.
+        rounds (Tuple[bytes, ...]): Encoded boards of each round played so far.
+        current_round_index (int): Index of the active round (-1 if none started).
+        num_rounds (int): Total number of rounds planned.
+    """
+
+    chess_ids: Tuple[str, ...]
+    withdrawn: bytes
+    rounds: Tuple[bytes, ...]
+    current_round_index: int
+    num_rounds: int
+
+
+def encode(tournament: Tournament) -> TournamentState:
+    """
+    Encodes a tournament as a compact snapshot.
+
+    Args:
+        tournament (Tournament): The tournament to encode.
+
+    Returns:
+        TournamentState: The snapshot.
+    """
+    chess_ids = tuple(p["chess_id"] for p in tournament.players)
+    number = {cid: i for i, cid in enumerate(chess_ids)}
+
+    rounds = []
+    for rnd in tournament.rounds:
+        boards = array("i")
+        for match in rnd.matches:
+            white = number[match._get_chess_id(match.player1)]
+            if match.is_bye:
+                boards.extend((white, NO_PLAYER, BYE_CODE))
+            else:
+                black = number[match._get_chess_id(match.player2)]
+                result = RESULT_CODES[match.winner if match.completed else None]
+                boards.extend((white, black, result))
+        rounds.append(boards.tobytes())
+
+    return TournamentState(
+        chess_ids=chess_ids,
+        withdrawn=bytes(bool(p.get("withdrawn")) for p in tournament.players),
+        rounds=tuple(rounds),
+        current_round_index=tournament.current_round_index,
+        num_rounds=tournament.num_rounds,
+    )
+
+
+def decode(state: TournamentState, seed: int) -> Tournament:
+    """
+    Rebuilds an in-memory (unsaved) tournament from a snapshot.
+
+    Registrant names and clubs are not part of the snapshot: the chess ID
+    stands in for both.
+
+    Args:
+        state (TournamentState): The snapshot.
+        seed (int): Pairing seed of the rebuilt tournament.
+
+    Returns:
+        Tournament: A tournament that can be played further without touching disk.
+    """
+    players = [
+        {"name": cid, "chess_id": cid, "club_name": ""} for cid in state.chess_ids
+    ]
+    for player, withdrawn in zip(players, state.withdrawn):
+        if withdrawn:
+            player["withdrawn"] = True
+
+    rounds = []
+    for number, data in enumerate(state.rounds, 1):
+        boards = array("i")
+        boards.frombytes(data)
+        matches = []
+        for white, black, result in zip(boards[0::3], boards[1::3], boards[2::3]):
+            if result == BYE_CODE:
+                matches.append(Match.bye(players[white]))
+                continue
+            match = Match(player1=players[white], player2=players[black])
+            if result != PENDING:
+                match.update_result(RESULTS[result])
+            matches.append(match)
+        rounds.append(
+            Round(
+                round_number=number,
+                matches=matches,
+                is_complete=all(m.completed for m in matches),
+            )
+        )
+
+    return Tournament(
+        name="Simulation",
+        start_date=datetime.min,
+        end_date=datetime.min,
+        venue="",
+        players=players,
+        rounds=rounds,
+        current_round_index=state.current_round_index,
+        num_rounds=state.num_rounds,
+        seed=seed,
+    )
@@ -0,0 +1,27 @@
+import json
+
+import cli
+
+
+def write_tournament(folder, players):
+    filepath = folder / "solo.json"
+    data = {
+        "name": "Solo Open",
+        "start_date": "2026-01-10T00:00:00",
+        "end_date": "2026-01-11T00:00:00",
+        "venue": "Hall",
+        "players": players,
+        "seed": 1,
+    }
+    filepath.write_text(json.dumps(data))
+    return filepath
+
+
+def test_advance_refuses_to_start_with_fewer_than_two_players(tmp_path, capsys):
+    player = {"name": "Ann Lee", "chess_id": "AB12345", "club_name": "Rooks"}
+    filepath = write_tournament(tmp_path, [player])
+
+    assert cli.main(["advance", str(filepath)]) == 1
+
+    assert "needs at least two players" in capsys.readouterr().err
+    assert json.loads(filepath.read_text()).get("rounds", []) == []